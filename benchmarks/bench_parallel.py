@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+# Parallel parsing benchmark: pygcode.parallel.parse_file (with each number
+# of workers, eager & lazy) vs. the serial pygcode.reader.iter_lines, on a
+# synthetic program (see programs.py).
+#
+# Each parallel run also reports the time this (the parent) process spends
+# rebuilding Lines from the workers' records; its serial share of the work,
+# which bounds the speedup of any number of workers.
+#
+# Usage:
+#   python benchmarks/bench_parallel.py [--lines N] [--workers N ...]
+#                                       [--program NAME] [--repeat N]
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import timeit
+
+_this_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_this_path, '..', 'src'))
+
+from programs import PROGRAMS
+
+from pygcode.reader import iter_lines
+from pygcode import parallel
+
+
+def parent_seconds(filename, lazy):
+    """
+    :return: time taken to unpickle & rebuild a whole file's Lines from its
+             workers' records (ie: the parent process' share of the work)
+    """
+    data = pickle.dumps([parallel._encode_line(l) for l in iter_lines(filename)], -1)
+
+    def run():
+        for record in pickle.loads(data):
+            parallel._decode_line(record, lazy=lazy)
+    return min(timeit.repeat(run, number=1, repeat=3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pygcode parallel parsing benchmark")
+    parser.add_argument('--lines', '-l', type=int, default=200000,
+                        help="number of lines in the synthetic program")
+    parser.add_argument('--workers', '-w', type=int, action='append', default=None,
+                        help="number of worker processes (default: 1, 2, 4, ... up to the number of CPUs)")
+    parser.add_argument('--program', '-p', default='milling',
+                        choices=[n for (n, p) in PROGRAMS])
+    parser.add_argument('--repeat', '-r', type=int, default=3)
+    args = parser.parse_args()
+
+    workers_list = args.workers
+    if workers_list is None:
+        cpu_count = os.cpu_count() or 1
+        workers_list = [w for w in (1, 2, 4, 8, 16, 32, 64) if w < cpu_count] + [cpu_count]
+
+    (fd, filename) = tempfile.mkstemp(suffix='.ngc')
+    try:
+        with os.fdopen(fd, 'w') as fh:
+            for line_str in dict(PROGRAMS)[args.program](args.lines):
+                fh.write(line_str + '\n')
+        chunk_size = max(os.path.getsize(filename) // 64, 1024)  # (enough chunks for every worker)
+
+        def time_it(func):
+            return min(timeit.repeat(lambda: list(func()), number=1, repeat=args.repeat))
+
+        serial = time_it(lambda: iter_lines(filename))
+        print("cpus: %i, lines: %i" % (os.cpu_count() or 1, args.lines))
+        print("{:<8} {:>7} {:>9} {:>8} {:>12}".format('lazy', 'workers', 'time', 'speedup', 'parent share'))
+        print("{:<8} {:>7} {:>8.3f}s {:>7.2f}x {:>12}".format('serial', '-', serial, 1, '-'))
+        for lazy in (False, True):
+            share = parent_seconds(filename, lazy) / serial
+            for workers in workers_list:
+                seconds = time_it(lambda: parallel.parse_file(
+                    filename, workers=workers, chunk_size=chunk_size, lazy=lazy,
+                ))
+                print("{:<8} {:>7} {:>8.3f}s {:>7.2f}x {:>11.2f}x".format(
+                    str(lazy), workers, seconds, serial / seconds, share,
+                ))
+                sys.stdout.flush()
+    finally:
+        os.remove(filename)
+
+
+if __name__ == '__main__':
+    main()
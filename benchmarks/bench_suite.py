@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+
+# Throughput benchmarks: parsing, machine processing, transforms, and the
+# command-line scripts (end to end), run on synthetic programs (see
+# programs.py).
+#
+# Each benchmark reports the best time of --repeat runs, throughput in
+# (gcode) lines per second, and peak memory:
+#   - in-process benchmarks: peak traced python allocations (tracemalloc,
+#     measured on a separate, untimed, run) while building the stage's
+#     output (eg: parse's Lines); not measured for streaming stages, whose
+#     output is discarded as it's generated
+#   - scripts: the script process' peak resident set size (linux only)
+#
+# Usage:
+#   python benchmarks/bench_suite.py [--lines N] [--repeat N]
+#                                    [--benchmark NAME ...] [--program NAME ...]
+#                                    [--json FILE]
+#
+# Results saved with --json can be compared between commits to track
+# throughput regressions.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:  # python 2
+    tracemalloc = None
+
+_this_path = os.path.dirname(os.path.abspath(__file__))
+_src_path = os.path.join(_this_path, '..', 'src')
+_scripts_path = os.path.join(_this_path, '..', 'scripts')
+sys.path.insert(0, _src_path)
+
+from pygcode import Line, Machine
+from pygcode.gcodes import words2gcodes, GCodeArcMove, GCodeCannedCycle
+from pygcode.transform import linearize_arc, simplify_canned_cycle
+from pygcode.utils import omit_redundant_modes
+
+from programs import PROGRAMS
+
+
+class BenchMachine(Machine):
+    # extrusion (E) isn't modelled (see pygcode.testing.PROFILES)
+    ignore_invalid_modal = True
+
+
+# =================== Benchmarks ===================
+# Each benchmark is set up with a program's lines (text), and returns a
+# function to be timed (or None if it doesn't apply to the program).
+# Throughput is measured in program lines per second.
+# Functions return their stage's output (if it's kept), so memory is
+# measured while it's held.
+
+def bench_parse(lines):
+    def run():
+        return [Line(line_str) for line_str in lines]
+    return run
+
+
+def bench_words2gcodes(lines):
+    blocks = [Line(line_str).block.words for line_str in lines]
+
+    def run():
+        return [words2gcodes(words) for words in blocks]
+    return run
+
+
+def bench_process_block(lines):
+    blocks = [Line(line_str).block for line_str in lines]
+
+    def run():
+        machine = BenchMachine()
+        for block in blocks:
+            machine.process_block(block)
+        return machine
+    return run
+
+
+def _collect(lines, gcode_class):
+    # [(<gcode>, <machine state it's processed in>), ...]
+    collected = []
+    machine = BenchMachine()
+    for line_str in lines:
+        block = Line(line_str).block
+        # processed in order (eg: a plane selection before an arc on the same line)
+        for gcode in machine.block_modal_gcodes(block):
+            if isinstance(gcode, gcode_class):
+                collected.append((gcode, {
+                    'start_pos': machine.pos,
+                    'plane': machine.mode.plane_selection,
+                    'dist_mode': machine.mode.distance,
+                }))
+            machine.process_gcodes(gcode)
+    return collected
+
+
+def bench_linearize_arc(lines):
+    arcs = _collect(lines, GCodeArcMove)
+    if not arcs:
+        return None
+
+    def run():
+        for (arc, kwargs) in arcs:
+            for gcode in linearize_arc(arc, max_error=0.005, **kwargs):
+                pass
+    return run
+
+
+def bench_simplify_canned_cycle(lines):
+    cycles = _collect(lines, GCodeCannedCycle)
+    if not cycles:
+        return None
+
+    def run():
+        for (canned, kwargs) in cycles:
+            for gcode in simplify_canned_cycle(canned, **kwargs):
+                pass
+    return run
+
+
+def bench_omit_redundant_modes(lines):
+    gcodes = []
+    for line_str in lines:
+        gcodes += Line(line_str).block.gcodes
+
+    def run():
+        for gcode in omit_redundant_modes(gcodes):
+            pass
+    return run
+
+
+# (<name>, <setup function>, <streaming>)
+#   streaming stages' peak memory isn't reported (see above)
+BENCHMARKS = [
+    ('parse', bench_parse, False),
+    ('words2gcodes', bench_words2gcodes, False),
+    ('process_block', bench_process_block, False),
+    ('linearize_arc', bench_linearize_arc, True),
+    ('simplify_canned_cycle', bench_simplify_canned_cycle, True),
+    ('omit_redundant_modes', bench_omit_redundant_modes, True),
+]
+
+# Scripts (run end to end, on a file)
+#   arguments are formatted with: infile, middle (the program's middle line number)
+#   pygcode-crop can't ignore extrusion (E), so it isn't run on printing programs
+SCRIPTS = [
+    ('pygcode-norm', ['pygcode-norm', '-rmim', '-al', '-ce', '{infile}'], ()),
+    ('pygcode-crop', ['pygcode-crop', '{infile}', '{middle}:'], ('printing',)),
+]
+
+
+# =================== Measurement ===================
+
+def peak_memory(func):
+    """
+    :return: peak traced memory (in bytes) while calling func (and holding
+             what it returns), or None if tracemalloc is not available
+    """
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        result = func()  # (held while peak is read)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# Runs a script (the 2nd argument, with those following), then writes its
+# process' peak resident set size (in bytes) to the file named by the 1st
+# argument. It's read from within the process; a child process' ru_maxrss
+# includes its parent's (ie: this benchmark's) as it was forked.
+SCRIPT_RUNNER = """
+import runpy, sys
+(peak_filename, sys.argv) = (sys.argv[1], sys.argv[2:])
+try:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+finally:
+    try:
+        with open('/proc/self/status') as fh:
+            peak = [int(l.split()[1]) * 1024 for l in fh if l.startswith('VmHWM:')][0]
+    except (IOError, IndexError):
+        peak = ''
+    with open(peak_filename, 'w') as fh:
+        fh.write(str(peak))
+"""
+
+
+def run_script(argv):
+    """
+    Run command-line script (output discarded)
+    :param argv: script name, then its arguments
+    :return: peak resident set size (in bytes) of the script's process
+             (or None if not available)
+    """
+    (script, script_args) = (argv[0], argv[1:])
+    env = dict(os.environ, PYTHONPATH=_src_path)
+    (fd, peak_filename) = tempfile.mkstemp(suffix='.peak')
+    os.close(fd)
+    try:
+        with open(os.devnull, 'w') as devnull:
+            returncode = subprocess.call(
+                [sys.executable, '-c', SCRIPT_RUNNER, peak_filename,
+                 os.path.join(_scripts_path, script)] + script_args,
+                stdout=devnull, env=env,
+            )
+        if returncode:
+            raise RuntimeError("%s failed (status: %r)" % (' '.join(argv), returncode))
+        with open(peak_filename) as fh:
+            peak = fh.read()
+    finally:
+        os.remove(peak_filename)
+    return int(peak) if peak else None
+
+
+def fmt_memory(value):
+    if value is None:
+        return '-'
+    return "%.2fMB" % (value / float(1024 ** 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pygcode throughput benchmarks")
+    parser.add_argument('--lines', '-l', type=int, default=10000,
+                        help="number of lines in each synthetic program")
+    parser.add_argument('--repeat', '-r', type=int, default=3)
+    parser.add_argument('--benchmark', '-b', action='append', default=None,
+                        choices=[b[0] for b in BENCHMARKS + SCRIPTS],
+                        help="benchmark to run (default: all)")
+    parser.add_argument('--program', '-p', action='append', default=None,
+                        choices=[n for (n, p) in PROGRAMS],
+                        help="synthetic program to run on (default: all)")
+    parser.add_argument('--json', '-j', dest='json_file', default=None,
+                        help="also save results to given file (as json)")
+    args = parser.parse_args()
+
+    selected = lambda name, choices: (choices is None) or (name in choices)
+    results = []
+
+    def report(benchmark, program, line_count, seconds, memory):
+        results.append({
+            'benchmark': benchmark, 'program': program, 'lines': line_count,
+            'seconds': seconds, 'lines_per_second': line_count / seconds,
+            'peak_memory': memory,
+        })
+        print("{benchmark:<22} {program:<9} {seconds:8.3f}s {rate:>12,.0f} lines/s {memory:>9}".format(
+            benchmark=benchmark, program=program, seconds=seconds,
+            rate=line_count / seconds, memory=fmt_memory(memory),
+        ))
+        sys.stdout.flush()
+
+    print("{:<22} {:<9} {:>9} {:>20} {:>9}".format('benchmark', 'program', 'time', 'throughput', 'memory'))
+    for (program_name, program) in PROGRAMS:
+        if not selected(program_name, args.program):
+            continue
+        lines = list(program(args.lines))
+
+        # In-process
+        for (name, benchmark, streaming) in BENCHMARKS:
+            if not selected(name, args.benchmark):
+                continue
+            run = benchmark(lines)
+            if run is None:
+                continue  # nothing to benchmark in this program
+            seconds = min(timeit.repeat(run, number=1, repeat=args.repeat))
+            report(name, program_name, len(lines), seconds, None if streaming else peak_memory(run))
+
+        # Scripts
+        scripts = [
+            (n, argv) for (n, argv, excluded) in SCRIPTS
+            if selected(n, args.benchmark) and (program_name not in excluded)
+        ]
+        if scripts:
+            (fd, filename) = tempfile.mkstemp(suffix='.ngc')
+            try:
+                with os.fdopen(fd, 'w') as fh:
+                    for line_str in lines:
+                        fh.write(line_str + '\n')
+                for (name, argv) in scripts:
+                    argv = [a.format(infile=filename, middle=len(lines) // 2) for a in argv]
+                    timings = []
+                    for i in range(args.repeat):
+                        timer = timeit.default_timer()
+                        peak_rss = run_script(argv)
+                        timings.append(timeit.default_timer() - timer)
+                    report(name, program_name, len(lines), min(timings), peak_rss)
+            finally:
+                os.remove(filename)
+
+    if args.json_file:
+        with open(args.json_file, 'w') as fh:
+            json.dump({'lines': args.lines, 'results': results}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+# Micro-benchmark: pygcode.words.text2words vs. the per-word regex loop it
+# replaced (reproduced below as legacy_text2words).
+#
+# Usage:
+#   python benchmarks/bench_text2words.py [--repeat N]
+
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+_this_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_this_path, '..', 'src'))
+
+from pygcode import dialects
+from pygcode.words import Word, text2words, regex_searches
+from pygcode.exceptions import GCodeWordStrError
+
+
+def legacy_text2words(block_text, dialect=None, xy_decimals=3):
+    """text2words as it was before the compiled tokenizer"""
+    if dialect is None:
+        dialect = dialects.get_default()
+    word_map = getattr(getattr(dialects, dialect), 'WORD_MAP')
+
+    next_word = re.compile(r'^.*?(?P<letter>[%s])' % ''.join(word_map.keys()), re.IGNORECASE)
+
+    index = 0
+    while True:
+        letter_match = next_word.search(block_text[index:])
+        if letter_match:
+            letter = letter_match.group('letter').upper()
+            index += letter_match.end()
+            value = regex_searches(block_text[index:], word_map[letter])
+            if value is None:
+                raise GCodeWordStrError("word '%s' value invalid" % letter)
+            yield Word(letter, value, **{"xy_decimals": xy_decimals})
+            index += value.end()
+        else:
+            break
+
+    remainder = block_text[index:]
+    if remainder and re.search(r'\S', remainder):
+        raise GCodeWordStrError("block code remaining '%s'" % remainder)
+
+
+def load_blocks():
+    """Block text from the test-suite's gcode files (comments removed)"""
+    from pygcode.comment import split_line
+    pattern = os.path.join(_this_path, '..', 'tests', 'test-files', 'linuxcnc', '*.*')
+    blocks = []
+    for filename in sorted(glob.glob(pattern)):
+        with open(filename, 'r') as fh:
+            for line_str in fh:
+                (block_str, comment) = split_line(line_str)
+                block_str = re.sub(r'\s+', ' ', block_str.strip())
+                if '%' not in block_str:
+                    blocks.append(block_str)
+    return blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', '-r', type=int, default=5)
+    args = parser.parse_args()
+
+    blocks = load_blocks()
+    # long blocks exaggerate the O(n^2) slicing of the legacy loop
+    long_blocks = [' '.join(blocks[i:i + 20]) for i in range(0, len(blocks), 20)]
+
+    # sanity check: both implementations agree
+    for block_str in blocks + long_blocks:
+        expected = [(w.letter, w.value) for w in legacy_text2words(block_str)]
+        result = [(w.letter, w.value) for w in text2words(block_str)]
+        assert result == expected, "%r: %r != %r" % (block_str, result, expected)
+
+    for (name, sample) in [('lines', blocks), ('long blocks', long_blocks)]:
+        word_count = sum(len(list(text2words(b))) for b in sample)
+        times = {}
+        for (label, func) in [('legacy', legacy_text2words), ('compiled', text2words)]:
+            times[label] = min(timeit.repeat(
+                lambda: [list(func(b)) for b in sample],
+                number=1, repeat=args.repeat,
+            ))
+            print("{name:<12} {label:<9} {t:8.4f}s {rate:>10,.0f} words/s".format(
+                name=name, label=label, t=times[label],
+                rate=word_count / times[label],
+            ))
+        print("{name:<12} speedup   {x:.2f}x".format(name=name, x=times['legacy'] / times['compiled']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+# Synthetic gcode programs for benchmarking.
+#
+# Each program mimics a type of CAM output; they're generated by
+# pygcode.testing (with each of its PROFILES), so output is deterministic
+# for a given seed, and benchmark results are comparable between runs.
+#
+# Usage:
+#   python benchmarks/programs.py milling 100000 > milling.ngc
+
+import functools
+import os
+import sys
+
+_this_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_this_path, '..', 'src'))
+
+from pygcode.testing import generate
+
+PROGRAMS = [
+    (name, functools.partial(generate, profile=name))
+    for name in ['milling', 'laser', 'printing', 'arcs']
+]
+
+
+if __name__ == '__main__':
+    (name, line_count) = (sys.argv[1], int(sys.argv[2]))
+    for line_str in dict(PROGRAMS)[name](line_count):
+        print(line_str)
@@ -31,6 +31,9 @@ INSTALL_REQUIRES = [
     'euclid3==0.01',  # 2D and 3D vector, matrix, quaternion and geometry module.
     'six==1.16.0',  # Python 2 and 3 compatibility utilities
 ]
+EXTRAS_REQUIRE = {
+    'numpy': ['numpy'],  # toolpath arrays (pygcode.toolpath)
+}
 SCRIPTS = [
     'scripts/pygcode-norm',
     'scripts/pygcode-crop',
@@ -103,5 +106,6 @@ if __name__ == "__main__":
         classifiers=CLASSIFIERS,
         setup_requires=INSTALL_REQUIRES,
         install_requires=INSTALL_REQUIRES,
+        extras_require=EXTRAS_REQUIRE,
         scripts=SCRIPTS,
     )
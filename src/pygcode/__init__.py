@@ -30,6 +30,10 @@ __all__ = [
 
     # Line
     'Line',
+    # Reader
+    'parse_file', 'iter_lines', 'map_file', 'iter_mapped_lines',
+    # Validation
+    'validate',
     # Block
     'Block',
     # Comment
@@ -179,6 +183,12 @@ from .machine import (
 # Line
 from .line import Line
 
+# Reader
+from .reader import parse_file, iter_lines, map_file, iter_mapped_lines
+
+# Validation
+from .validation import validate
+
 # Block
 from .block import Block
 
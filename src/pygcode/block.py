@@ -1,19 +1,28 @@
 import re
-from .words import text2words
+from .words import text2words, bytes2words, get_tokenizer
 from .gcodes import words2gcodes
 from . import dialects
+from . import cache
+from . import stats
 
 
 class Block(object):
     """GCode block (effectively any gcode file line that defines any <word><value>)"""
 
-    def __init__(self, text=None, dialect=None, verify=True, xy_decimals=3):
+    # Attributes of a lazy block, set when first accessed (see __getattr__)
+    _lazy_attributes = frozenset(['_raw_text', '_text', 'words', 'gcodes', 'modal_params'])
+
+    def __init__(self, text=None, dialect=None, verify=True, xy_decimals=3, lazy=False):
         """
         Block Constructor
         :param text: gcode line content (including comments) as string
         :type text: :class:`str`
         :param verify: verify given codes (modal & non-modal are not repeated)
         :type verify: :class:`bool`
+        :param lazy: if True, text is not parsed until the block's words,
+                     gcodes, modal_params, or text are first accessed (so any
+                     parsing errors are raised then)
+        :type lazy: :class:`bool`
 
         .. note::
 
@@ -35,20 +44,124 @@ class Block(object):
 
         self._word_map = getattr(getattr(dialects, dialect), 'WORD_MAP')
 
+        if text and lazy:
+            self._defer(text, verify=verify)
+        elif text:
+            self._load(text, verify=verify)
+
+    def _load(self, text, verify=True):
+        """
+        Parse given block text (or load it from the parse cache)
+        :param text: gcode line content (including comments) as string
+        :param verify: verify given codes (modal & non-modal are not repeated)
+        """
+        parse_cache = cache.parse_cache
+        if parse_cache is None:
+            self._parse(text, verify=verify)
+        else:
+            cache_key = (Block, text, self.dialect, verify, self.xy_decimals)
+            record = parse_cache.get(cache_key)
+            if record is None:
+                self._parse(text, verify=verify)
+                parse_cache.put(cache_key, self._to_record())
+            else:
+                self._load_record(record)
+
+    def _defer(self, content, verify=True):
+        """
+        Parse given content when it's first accessed (see __getattr__)
+        :param content: block content as string, or ASCII bytes (comments removed)
+        :param verify: verify given codes (modal & non-modal are not repeated)
+        """
+        for k in self._lazy_attributes:
+            self.__dict__.pop(k, None)
+        self._lazy = (content, verify)
+
+    def _parse(self, text, verify=True):
+        """
+        Parse given block text (not cached)
+        :param text: gcode line content (including comments) as string
+        :param verify: verify given codes (modal & non-modal are not repeated)
+        """
         # clean up block string
-        if text:
-            self._raw_text = text  # unaltered block content (before alteration)
-            text = re.sub(r'(^\s+|\s+$)', '', text) # remove whitespace padding
-            text = re.sub(r'\s+', ' ', text) # remove duplicate whitespace with ' '
-            self._text = text  # cleaned up block content
+        self._raw_text = text  # unaltered block content (before alteration)
+        text = re.sub(r'(^\s+|\s+$)', '', text) # remove whitespace padding
+        text = re.sub(r'\s+', ' ', text) # remove duplicate whitespace with ' '
+        self._text = text  # cleaned up block content
 
-            # Get words from text, and group into gcodes
-            self.words = list(text2words(self._text, xy_decimals=xy_decimals))
-            (self.gcodes, self.modal_params) = words2gcodes(self.words)
+        # Get words from text, and group into gcodes
+        counters = stats.counters
+        if counters is not None:
+            return self._parse_counted(counters, text2words, self._text, verify)
+        self.words = list(text2words(self._text, xy_decimals=self.xy_decimals))
+        (self.gcodes, self.modal_params) = words2gcodes(self.words)
 
-            # Verification
-            if verify:
-                self._assert_gcodes()
+        # Verification
+        if verify:
+            self._assert_gcodes()
+
+    def _parse_bytes(self, data, verify=True):
+        """
+        Parse given block content, given as ASCII bytes (not cached)
+        :param data: bytes-like object (eg: bytes, or memoryview) with comments removed
+        :param verify: verify given codes (modal & non-modal are not repeated)
+
+        Block's text is not retained (see :attr:`text`).
+        """
+        counters = stats.counters
+        if counters is not None:
+            return self._parse_counted(counters, bytes2words, data, verify)
+        self.words = list(bytes2words(data, xy_decimals=self.xy_decimals))
+        (self.gcodes, self.modal_params) = words2gcodes(self.words)
+
+        # Verification
+        if verify:
+            self._assert_gcodes()
+
+    def _parse_counted(self, counters, tokenize, content, verify):
+        # _parse (or _parse_bytes), counting each stage (see pygcode.stats)
+        self.words = counters.call(
+            'text2words', lambda: list(tokenize(content, xy_decimals=self.xy_decimals)),
+        )
+        (self.gcodes, self.modal_params) = counters.call('words2gcodes', words2gcodes, self.words)
+        if verify:
+            counters.call('Block._assert_gcodes', self._assert_gcodes)
+
+    # Pickling (dialect's WORD_MAP is not serialized)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_word_map']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._word_map = getattr(getattr(dialects, self.dialect), 'WORD_MAP')
+
+    # Records
+    #   immutable representation of parsed words & gcodes (of builtin types,
+    #   and GCode classes); used to cache, and transfer parsed blocks
+    def _to_record(self):
+        index = dict((id(w), i) for (i, w) in enumerate(self.words))
+        return (
+            self._raw_text, self._text,
+            tuple((w.letter, w._value) for w in self.words),
+            tuple(
+                (gc.__class__, index[id(gc.word)], tuple(index[id(w)] for w in gc.params.values()))
+                for gc in self.gcodes
+            ),
+            tuple(index[id(w)] for w in self.modal_params),
+        )
+
+    def _load_record(self, record):
+        (self._raw_text, self._text, words, gcodes, modal_params) = record
+        make_word = get_tokenizer(self.dialect).make_word
+        xy_decimals = self.xy_decimals
+        self.words = [make_word(letter, value, xy_decimals) for (letter, value) in words]
+        self.gcodes = [
+            cls._from_words(self.words[i], dict((self.words[j].letter, self.words[j]) for j in params))
+            for (cls, i, params) in gcodes
+        ]
+        self.modal_params = [self.words[i] for i in modal_params]
 
     @property
     def text(self):
@@ -57,6 +170,9 @@ class Block(object):
         return str(self)
 
     def _assert_gcodes(self):
+        if len(self.gcodes) < 2:
+            return  # nothing to conflict with
+
         modal_groups = set()
         code_words = set()
 
@@ -79,7 +195,54 @@ class Block(object):
                     ]))
                 modal_groups.add(gc.modal_group)
 
+    def _iter_violations(self):
+        """
+        Iterate through this block's invalid combinations of gcodes (those
+        :meth:`_assert_gcodes` raises the first of); each conflict is reported
+        once: of a modal group's gcodes, or (for gcodes without a modal group)
+        of a repeated gcode (see :mod:`pygcode.validation`)
+        :return: generator of messages
+        """
+        def conflict_key(gc):
+            # what a gcode conflicts on: its modal group, or its word (if it has no group)
+            if gc.modal_group is None:
+                return (None, gc.word)
+            return gc.modal_group
+
+        modal_groups = set()
+        code_words = set()
+        reported = set()  # conflict keys already reported
+
+        for gc in self.gcodes:
+            # Assert all gcodes are not repeated in the same block, and
+            # all gcodes are from different modal groups
+            conflict = (gc.word in code_words) or \
+                ((gc.modal_group is not None) and (gc.modal_group in modal_groups))
+            key = conflict_key(gc)
+            if conflict and (key not in reported):
+                reported.add(key)
+                yield "%s cannot be in the same block" % ([
+                    x for x in self.gcodes
+                    if conflict_key(x) == key
+                ])
+            code_words.add(gc.word)
+            if gc.modal_group is not None:
+                modal_groups.add(gc.modal_group)
+
     def __getattr__(self, k):
+        # Lazy block; parse when content is first accessed
+        if k in self._lazy_attributes:
+            lazy = self.__dict__.pop('_lazy', None)
+            if lazy is not None:
+                (content, verify) = lazy
+                (self._raw_text, self._text) = (None, None)
+                (self.words, self.gcodes, self.modal_params) = ([], [], [])
+                if isinstance(content, bytes):
+                    self._parse_bytes(content, verify=verify)
+                else:
+                    self._load(content, verify=verify)
+                return getattr(self, k)
+
         if k in self._word_map:
             for w in self.words:
                 if w.letter == k:
@@ -0,0 +1,114 @@
+"""
+Parse Cache
+
+CAM output repeats a lot of identical lines (eg: ``G0 Z5.000``, ``M5``).
+When enabled, parsed :class:`Line <pygcode.line.Line>` and
+:class:`Block <pygcode.block.Block>` content is cached by its text, so
+repeated text skips :func:`split_line <pygcode.comment.split_line>`,
+:func:`text2words <pygcode.words.text2words>` and
+:func:`words2gcodes <pygcode.gcodes.words2gcodes>`.
+
+Parsed content is cached as an immutable record; each hit builds new
+instances from it, so a cached line may be modified like any other.
+
+For example::
+
+    from pygcode import cache, iter_lines
+
+    cache.enable_cache(maxsize=4096)
+    for line in iter_lines('part.gcode'):
+        pass
+    print(cache.cache_info())  # CacheInfo(hits=..., misses=..., maxsize=4096, currsize=...)
+    cache.disable_cache()
+
+Caching is disabled by default.
+"""
+from collections import OrderedDict, namedtuple
+
+# Default maximum number of cached records
+DEFAULT_MAXSIZE = 1024
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class ParseCache(object):
+    """Least recently used (LRU) cache of parsed records, with hit/miss counters"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """
+        :param maxsize: maximum number of records held before the least
+                        recently used are discarded
+        """
+        if maxsize < 1:
+            raise ValueError("invalid cache size: %r" % maxsize)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._records = OrderedDict()
+
+    def get(self, key):
+        """
+        Get cached record (counted as a hit, or a miss)
+        :param key: hashable key
+        :return: cached record, or None if not cached
+        """
+        record = self._records.get(key, None)
+        if record is None:
+            self.misses += 1
+        else:
+            self._records.move_to_end(key)
+            self.hits += 1
+        return record
+
+    def put(self, key, record):
+        """
+        Add record to cache (discarding the least recently used if full)
+        :param key: hashable key
+        :param record: immutable record
+        """
+        self._records[key] = record
+        if len(self._records) > self.maxsize:
+            self._records.popitem(last=False)
+
+    def clear(self):
+        """Discard all records, and reset counters"""
+        self._records.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._records))
+
+    def __len__(self):
+        return len(self._records)
+
+
+parse_cache = None  # active ParseCache instance (None if disabled)
+
+
+def enable_cache(maxsize=DEFAULT_MAXSIZE):
+    """
+    Enable caching of parsed lines & blocks (replaces any active cache)
+    :param maxsize: maximum number of cached records
+    :return: active :class:`ParseCache` instance
+    """
+    global parse_cache
+    parse_cache = ParseCache(maxsize=maxsize)
+    return parse_cache
+
+
+def disable_cache():
+    """Disable caching of parsed lines & blocks (active cache is discarded)"""
+    global parse_cache
+    parse_cache = None
+
+
+def cache_info():
+    """
+    Active cache's statistics
+    :return: :class:`CacheInfo` namedtuple, or None if caching is disabled
+    """
+    if parse_cache is None:
+        return None
+    return parse_cache.info()
@@ -65,3 +65,54 @@ def split_line(line_text):
         comment_obj = comments_class(comment_text)
 
     return (block_str, comment_obj)
+
+
+_bytes_regexes = {}  # of the form: {<comment class>: <AUTO_REGEX matching bytes>, ... }
+
+def _bytes_auto_regex(cls):
+    regex = _bytes_regexes.get(cls, None)
+    if regex is None:
+        regex = _bytes_regexes[cls] = re.compile(
+            cls.AUTO_REGEX.pattern.encode('ascii'),
+            cls.AUTO_REGEX.flags & ~re.UNICODE,
+        )
+    return regex
+
+
+def split_line_bytes(line_bytes, encoding='utf-8'):
+    """
+    Split functional block content from comments (see :meth:`split_line`)
+    :param line_bytes: line from gcode file as a bytes-like object (eg: bytes, or memoryview)
+    :param encoding: comments' encoding
+    :return: tuple of (<functional block code bytes>, CommentBase(<comment(s)>))
+
+    Only comment text is decoded; if the line has no comments, the given
+    object is returned as the block's content (it's not copied).
+    """
+    comments_class = None
+
+    # Auto-detect comment type if I can
+    comments = []
+    block_bytes = line_bytes
+    while block_bytes and (block_bytes[-1] in (10, b'\n')):  # (py3 indexes bytes as int)
+        block_bytes = block_bytes[:-1]  # to remove potential return carriage from comment body
+
+    for cls in sorted(CommentBase.__subclasses__(), key=lambda c: c.ORDER):
+        matches = list(_bytes_auto_regex(cls).finditer(block_bytes))
+        if matches:
+            block_bytes = bytes(block_bytes)
+            for match in reversed(matches):
+                # Build list of comment text
+                comments.insert(0, match.group('text').decode(encoding))  # prepend
+                # Remove comments from given block_bytes
+                block_bytes = block_bytes[:match.start()] + block_bytes[match.end():]
+            comments_class = cls
+            break
+
+    # Create comment instance if content was found
+    comment_obj = None
+    if comments_class:
+        comment_text = comments_class.MULTICOMMENT_JOINER.join(comments)
+        comment_obj = comments_class(comment_text)
+
+    return (block_bytes, comment_obj)
@@ -1,3 +1,2 @@
 DEFAULT_FLOAT_PRECISION = 3
-float_precision = 3
 fp_exception = "The float precision value should an integer value between 0 and 6."
\ No newline at end of file
@@ -28,10 +28,20 @@ def _clean_codestr(value):
     return "%g" % value
 
 
-def _clean_x_y(value):
-    val = "%." + str(config.float_precision) + "f"
-    fp_val = val % value
-    return edge_case_clean(fp_val)
+class CleanPrecision(object):
+    """
+    Value cleaning function, to a number of decimal places
+    (the precision of words' values, see :meth:`WordType.with_precision <pygcode.dialects.utils.WordType.with_precision>`)
+    """
+    def __init__(self, precision):
+        self.precision = precision
+        self._format = "%%.%if" % precision
+
+    def __call__(self, value):
+        return edge_case_clean(self._format % value)
+
+    def with_precision(self, precision):
+        return self.__class__(precision)
 
 
 def clean_float(value):
@@ -56,13 +66,13 @@ def edge_case_clean(string_clean):
 CLEAN_NONE = lambda v: v
 # CLEAN_FLOAT = lambda v: "{0:.3}".format(v)
 CLEAN_FLOAT = clean_float
-CLEAN_X_Y_FLOAT = _clean_x_y
+CLEAN_X_Y_FLOAT = CleanPrecision(config.DEFAULT_FLOAT_PRECISION)
 CLEAN_CODE = _clean_codestr
 CLEAN_OTHER = _clean_r
 CLEAN_INT = lambda v: "%d" % v
 # first parses for scientific notation, then for regular float values
 REGEX_FLOAT_SCIENTIFIC_NOTATION = re.compile(r'^[+-]?\d+(?:\.\d*(?:[eE][+-]?\d+)?)?')
-REGEX_FLOAT_INTEGER = re.compile(r'^\s*-?\d+\.?\d*|(-?\.\d+)')
+REGEX_FLOAT_INTEGER = re.compile(r'^\s*[+-]?\d+\.?\d*|\s*([+-]?\.\d+)')
 REGEX_INT = re.compile(r'^\s*-?\d+')
 REGEX_POSITIVEINT = re.compile(r'^\s*\d+')
 REGEX_CODE = re.compile(r'^\s*\d+(\.\d)?') # float, but can't be negative
@@ -1,3 +1,6 @@
+import re
+from copy import copy
+
 
 # Data Classes
 
@@ -8,3 +11,64 @@ class WordType(object):
         self.alternate_regex = alternate_regex
         self.description = description
         self.clean_value = clean_value
+        self._scanner = None
+        self._variants = None  # {<precision>: WordType, ...} (see with_precision)
+
+    @property
+    def precision(self):
+        """
+        Decimal places values are cleaned to (None if clean_value isn't
+        given a precision, see :meth:`with_precision`)
+        """
+        return getattr(self.clean_value, 'precision', None)
+
+    def with_precision(self, precision):
+        """
+        Variant of this word type, with values cleaned to the given decimal places.
+        Variants are created once (per precision) and shared; so the precision is
+        carried by each word's type, rather than a global setting.
+        :param precision: decimal places
+        :return: WordType instance (self if its values aren't cleaned to a precision)
+        """
+        if precision == self.precision or self.precision is None:
+            return self
+        if self._variants is None:
+            self._variants = {self.precision: self}
+        variant = self._variants.get(precision, None)
+        if variant is None:
+            variant = copy(self)  # (shares self._variants)
+            variant.clean_value = self.clean_value.with_precision(precision)
+            self._variants[precision] = variant
+        return variant
+
+    @property
+    def value_pattern(self):
+        """
+        Single regex pattern matching what ``value_regex`` (or, failing that,
+        ``alternate_regex``) matches; without anchors or capturing groups,
+        so it can be matched from any position, and embedded in other patterns
+        """
+        patterns = []
+        for regex in (self.value_regex, self.alternate_regex):
+            if regex is None:
+                continue
+            pattern = regex.pattern
+            if pattern.startswith('^'):
+                pattern = pattern[1:]
+            patterns.append(re.sub(r'(?<!\\)\((?!\?)', '(?:', pattern))
+        return '|'.join(patterns)
+
+    def scan(self, text, pos=0):
+        """
+        Scan a value in one pass
+        :param text: text to scan
+        :param pos: index of value's first character in text
+        :return: tuple: (<value of value_class>, <index of value's end>), or
+                 None if there's no valid value at pos
+        """
+        if self._scanner is None:
+            self._scanner = re.compile(self.value_pattern)
+        match = self._scanner.match(text, pos)
+        if match is None:
+            return None
+        return (self.value_class(match.group()), match.end())
@@ -0,0 +1,480 @@
+"""
+Run Time Estimation
+
+Estimate how long a program takes to run, and how far the tool travels, by
+processing it on a :class:`Machine <pygcode.machine.Machine>`. Moves are
+estimated as they're processed, so a program of any length is estimated in
+a single pass, with constant memory.
+
+For example::
+
+    from pygcode import iter_lines
+    from pygcode.estimate import Estimator
+
+    estimator = Estimator(
+        max_velocity={'X': 6000, 'Y': 6000, 'Z': 1500},  # units/min
+        acceleration={'X': 500, 'Y': 500, 'Z': 100},  # units/s^2
+        junction_deviation=0.02,
+    )
+    result = estimator.run(iter_lines('part.gcode'))
+    print("%.1f minutes, %.0fmm" % (result.time / 60, result.distance))
+
+Each move's speed is its feed rate (or, for a rapid move, the fastest its
+axes allow), limited by each axis' ``max_velocity``. Feed rates are
+interpreted in the machine's feed rate mode:
+
+- G94: units per minute
+- G93: inverse time; each move takes ``1 / F`` minutes
+- G95: units per revolution of the spindle (at its current S speed)
+
+Without an ``acceleration``, each move runs at that speed for its whole
+length (so the estimate is a lower bound). With an ``acceleration``, moves
+follow a trapezoidal velocity profile, planned over the next ``lookahead``
+moves (as a controller's planner would); the speed through the junction
+between 2 moves is limited by ``junction_deviation`` (as it is by Grbl, and
+similar firmware). The tool comes to a stop for a dwell (G4), a program
+pause or end (M0, M1, M2, M30, M60), and at the end of the last planned move.
+
+Distances & speeds are in the program's units (mm or inches), times are in
+seconds.
+
+.. note::
+
+    Canned drilling cycles (G73, G81 - G89) are estimated as a rapid to the
+    hole, a plunge (at the feed rate) from R to Z, and a retract; pecks
+    (G73, G83) are not modelled.
+"""
+from collections import deque, namedtuple
+from math import sqrt, atan2, pi
+
+from .gcodes import MODAL_GROUP_MAP
+from .gcodes import GCodeRapidMove, GCodeArcMove, GCodeArcMoveCW, GCodeCannedCycle, GCodeDwell
+from .gcodes import GCodeDrillingCycleDwell, GCodeBoringCycleFeedOut, GCodeBoringCycleDwellFeedOut
+from .gcodes import GCodeInverseTimeMode, GCodeUnitsPerRevolution
+from .gcodes import GCodeIncrementalDistanceMode, GCodeCannedCycleReturnToR
+from .gcodes import GCodeProgramControl
+from .gcodes import GCodeSelectXYPlane, GCodeAbsoluteDistanceMode, GCodeIncrementalArcDistanceMode
+from .line import Line
+from .block import Block
+from .machine import Machine, Position
+from .transform import _arc_linearize_method
+
+# Default maximum velocity of each axis (units/min)
+DEFAULT_MAX_VELOCITY = 5000.
+# Default junction deviation (units); see Estimator
+DEFAULT_JUNCTION_DEVIATION = 0.01
+# Default number of moves planned ahead (with an acceleration model)
+DEFAULT_LOOKAHEAD = 16
+
+# Move kinds
+(FEED, RAPID) = (0, 1)
+
+_AXIS_INDEX = Position.AXIS_INDEX
+_inf = float('inf')
+
+
+class Estimate(namedtuple('Estimate', [
+        'moves',            # number of moves
+        'feed_distance',    # distance of feed moves (G1, G2, G3, canned cycles)
+        'rapid_distance',   # distance of rapid moves (G0, canned cycles)
+        'feed_time',        # time spent on feed moves (seconds)
+        'rapid_time',       # time spent on rapid moves (seconds)
+        'dwell_time',       # time spent dwelling (seconds)
+        'unfed_moves',      # feed moves without a feed rate (eg: F0), their time is not counted
+        ])):
+    """Estimated distance travelled & time taken by a program"""
+    __slots__ = ()
+
+    @property
+    def distance(self):
+        """Total distance travelled"""
+        return self.feed_distance + self.rapid_distance
+
+    @property
+    def time(self):
+        """Total time taken (seconds)"""
+        return self.feed_time + self.rapid_time + self.dwell_time
+
+
+def _trapezoid_time(length, entry_speed, exit_speed, nominal_speed, acceleration):
+    """
+    Time taken by a move with a trapezoidal velocity profile: accelerate from
+    entry speed to nominal speed, cruise, then decelerate to exit speed (if
+    the move is too short to reach nominal speed, the profile is a triangle)
+    """
+    accel_distance = (nominal_speed ** 2 - entry_speed ** 2) / (2. * acceleration)
+    decel_distance = (nominal_speed ** 2 - exit_speed ** 2) / (2. * acceleration)
+    cruise_distance = length - accel_distance - decel_distance
+    if cruise_distance >= 0:
+        return (
+            (nominal_speed - entry_speed) / acceleration +
+            (nominal_speed - exit_speed) / acceleration +
+            cruise_distance / nominal_speed
+        )
+    peak_speed = sqrt((2. * acceleration * length + entry_speed ** 2 + exit_speed ** 2) / 2.)
+    peak_speed = max(peak_speed, entry_speed, exit_speed)
+    return (2. * peak_speed - entry_speed - exit_speed) / acceleration
+
+
+def _junction_speed(exit_direction, entry_direction, acceleration, deviation):
+    """
+    Maximum speed through the junction between 2 moves; the speed at which
+    the centripetal acceleration, around a circle tangent to both moves, and
+    deviating from the junction by the given distance, is the given
+    acceleration (Grbl's junction deviation)
+    :param exit_direction: unit vector of the first move's direction (at its end)
+    :param entry_direction: unit vector of the second move's direction (at its start)
+    """
+    cos_theta = -sum(a * b for (a, b) in zip(exit_direction, entry_direction))
+    if cos_theta > 0.999999:
+        return 0.  # reversal
+    if cos_theta < -0.999999:
+        return _inf  # straight through
+    sin_half_theta = sqrt(0.5 * (1. - cos_theta))
+    return sqrt(acceleration * deviation * sin_half_theta / (1. - sin_half_theta))
+
+
+def _unit(vector):
+    # (<unit vector>, <magnitude>)
+    magnitude = sqrt(sum(v * v for v in vector))
+    if not magnitude:
+        return (vector, 0.)
+    return ([v / magnitude for v in vector], magnitude)
+
+
+class Estimator(object):
+    """
+    Processes gcode on a machine, accumulating each move's distance & time
+    (see :mod:`pygcode.estimate` for details)
+    """
+
+    def __init__(self, machine=None, max_velocity=DEFAULT_MAX_VELOCITY, acceleration=None,
+                 junction_deviation=DEFAULT_JUNCTION_DEVIATION, lookahead=DEFAULT_LOOKAHEAD):
+        """
+        :param machine: machine to process gcode on (default: new :class:`Machine`)
+        :param max_velocity: maximum velocity of each axis (units/min), either
+                             a dict of the form: ``{<axis>: <velocity>, ...}``
+                             (for each of the machine's axes), or a single
+                             value for all axes
+        :param acceleration: maximum acceleration of each axis (units/s^2), as
+                             a dict, or single value (like max_velocity); if
+                             None, acceleration is not modelled
+        :param junction_deviation: distance (units) by which the tool path may
+                                   deviate from the junction between 2 moves;
+                                   the larger this is, the faster corners are taken
+        :param lookahead: number of moves planned ahead of the move being estimated
+        """
+        if machine is None:
+            machine = Machine()
+        self.machine = machine
+        self._axis_indexes = sorted(_AXIS_INDEX[a] for a in machine.axes)
+
+        # Axis Limits (lists indexed as Position coordinates)
+        self.max_velocity = self._axis_values(max_velocity, 1 / 60.)  # units/s
+        self.acceleration = None
+        if acceleration is not None:
+            self.acceleration = self._axis_values(acceleration)
+        self.junction_deviation = junction_deviation
+        self.lookahead = lookahead
+
+        # Totals
+        self.moves = 0
+        self.unfed_moves = 0
+        self.distance = [0., 0.]  # indexed by move kind: [FEED, RAPID]
+        self.time = [0., 0.]
+        self.dwell_time = 0.
+
+        # Planner (acceleration model)
+        #   moves planned ahead, each a list of the form:
+        #       [<kind>, <length>, <nominal speed>, <acceleration>, <max entry speed>]
+        self._planned = deque()
+        self._entry_speed = 0.  # entry speed of the first planned move
+        self._exit_direction = None  # of the last move (None when stopped)
+        self._exit_nominal_speed = 0.  # nominal speed of the last move
+
+        self._motion_group = MODAL_GROUP_MAP['motion']
+
+    def _axis_values(self, values, factor=1.):
+        # list of per axis values, indexed as Position coordinates
+        result = [_inf] * len(_AXIS_INDEX)
+        if not isinstance(values, dict):
+            values = dict((axis, values) for axis in self.machine.axes)
+        missing = set(self.machine.axes) - set(values)
+        if missing:
+            raise ValueError("no value given for axes: %s" % ', '.join(sorted(missing)))
+        for (axis, value) in values.items():
+            if value <= 0:
+                raise ValueError("invalid value for axis %s: %r" % (axis, value))
+            result[_AXIS_INDEX[axis]] = value * factor
+        return result
+
+    def _limit(self, limits, direction):
+        # fastest speed (or acceleration) in direction, given each axis' limit
+        return min(
+            limits[i] / abs(direction[i])
+            for i in self._axis_indexes if direction[i]
+        )
+
+    # Processing
+    def process_block(self, block):
+        """
+        Process block on machine, estimating its moves
+        :param block: :class:`Block <pygcode.block.Block>` instance
+        """
+        machine = self.machine
+        motion_group = self._motion_group
+
+        for gcode in machine.block_modal_gcodes(block):
+            # each move is processed on the machine as it's estimated
+            if (gcode.modal_group == motion_group) and gcode.get_param_dict(letters=machine.axes):
+                if isinstance(gcode, GCodeArcMove):
+                    self._arc(gcode)
+                elif isinstance(gcode, GCodeCannedCycle):
+                    self._canned_cycle(gcode)
+                else:
+                    start = machine.pos._coords
+                    gcode.process(machine)
+                    self._line(start, machine.pos._coords, rapid=isinstance(gcode, GCodeRapidMove))
+            else:
+                if isinstance(gcode, GCodeDwell):
+                    self.dwell_time += gcode.P or 0.
+                    self._stop()
+                elif isinstance(gcode, GCodeProgramControl):
+                    self._stop()
+                gcode.process(machine)
+
+    def run(self, lines):
+        """
+        Process lines in sequence
+        :param lines: iterable of Line, Block, or str instances
+        :return: :class:`Estimate` of everything processed (see :meth:`result`)
+        """
+        for line in lines:
+            if isinstance(line, Line):
+                block = line.block
+            elif isinstance(line, Block):
+                block = line
+            else:
+                block = Line(line).block
+            self.process_block(block)
+        return self.result()
+
+    def result(self):
+        """
+        Estimate of everything processed so far; as if the program ended
+        after the last processed move (processing may continue after this is called)
+        :return: :class:`Estimate` instance
+        """
+        time = list(self.time)
+        planned = deque(list(m) for m in self._planned)
+        entry_speed = self._entry_speed
+        while planned:
+            (kind, move_time, entry_speed) = self._pop_planned(planned, entry_speed)
+            time[kind] += move_time
+        return Estimate(
+            moves=self.moves,
+            feed_distance=self.distance[FEED],
+            rapid_distance=self.distance[RAPID],
+            feed_time=time[FEED],
+            rapid_time=time[RAPID],
+            dwell_time=self.dwell_time,
+            unfed_moves=self.unfed_moves,
+        )
+
+    # Moves
+    def _feed_speed(self, length):
+        """
+        Current feed rate, as a speed (units/s) of a move of the given length
+        (or None if no feed rate is set)
+        """
+        mode = self.machine.mode
+        feed_rate = mode.feed_rate.word.value if (mode.feed_rate is not None) else 0
+        if isinstance(mode.feed_rate_mode, GCodeInverseTimeMode):
+            speed = length * feed_rate / 60.  # move takes 1/F minutes
+        elif isinstance(mode.feed_rate_mode, GCodeUnitsPerRevolution):
+            spindle_speed = mode.spindle_speed.word.value if (mode.spindle_speed is not None) else 0
+            speed = feed_rate * spindle_speed / 60.
+        else:  # units per minute
+            speed = feed_rate / 60.
+        if speed <= 0:
+            return None
+        return speed
+
+    def _line(self, start, end, rapid=False):
+        """
+        Straight move between given positions
+        :param start: start position's coordinates (see :class:`Position <pygcode.machine.Position>`)
+        :param end: end position's coordinates
+        """
+        (direction, length) = _unit([b - a for (a, b) in zip(start, end)])
+        self._move(length, direction, direction, direction, rapid=rapid)
+
+    def _move(self, length, entry_direction, exit_direction, limit_direction, rapid=False):
+        """
+        Estimate a move
+        :param length: move's length
+        :param entry_direction: unit vector of move's direction at its start
+        :param exit_direction: unit vector of move's direction at its end
+        :param limit_direction: vector of each axis' share of the move; each
+                                axis' limits are divided by its value
+        """
+        self.moves += 1
+        kind = RAPID if rapid else FEED
+        self.distance[kind] += length
+        if not length:
+            return
+
+        max_speed = self._limit(self.max_velocity, limit_direction)
+        if rapid:
+            speed = max_speed
+        else:
+            speed = self._feed_speed(length)
+            if speed is None:
+                self.unfed_moves += 1
+                self._stop()
+                return
+            speed = min(speed, max_speed)
+
+        if self.acceleration is None:
+            self.time[kind] += length / speed
+            return
+
+        # Acceleration model: plan move
+        acceleration = self._limit(self.acceleration, limit_direction)
+        if self._exit_direction is None:
+            max_entry_speed = 0.  # from stationary
+        else:
+            max_entry_speed = min(
+                _junction_speed(self._exit_direction, entry_direction, acceleration, self.junction_deviation),
+                self._exit_nominal_speed, speed,
+            )
+        self._planned.append([kind, length, speed, acceleration, max_entry_speed])
+        self._exit_direction = exit_direction
+        self._exit_nominal_speed = speed
+
+        planned = self._planned
+        while len(planned) > self.lookahead:
+            (kind, move_time, self._entry_speed) = self._pop_planned(planned, self._entry_speed)
+            self.time[kind] += move_time
+
+    @staticmethod
+    def _pop_planned(planned, entry_speed):
+        """
+        Remove first planned move, and calculate its time; its exit speed is
+        limited by the moves planned after it (the last planned move ends stationary)
+        :param planned: deque of planned moves
+        :param entry_speed: first move's entry speed
+        :return: tuple: (<move kind>, <time>, <exit speed>)
+        """
+        (kind, length, speed, acceleration, max_entry_speed) = planned.popleft()
+
+        # Backward pass: fastest speed each planned move can enter at, and
+        # still decelerate in time for those after it
+        exit_speed = 0.
+        for (k, l, s, a, max_entry) in reversed(planned):
+            exit_speed = min(max_entry, sqrt(exit_speed * exit_speed + 2. * a * l))
+
+        # Forward: fastest exit speed, accelerating from entry speed
+        exit_speed = min(exit_speed, speed, sqrt(entry_speed * entry_speed + 2. * acceleration * length))
+        return (kind, _trapezoid_time(length, entry_speed, exit_speed, speed, acceleration), exit_speed)
+
+    def _stop(self):
+        # Tool comes to a stop (following move starts from stationary)
+        self._exit_direction = None
+
+    def _arc(self, gcode):
+        machine = self.machine
+        mode = machine.mode
+        plane = mode.plane_selection or GCodeSelectXYPlane()
+        (method, arc_start) = _arc_linearize_method(
+            arc_gcode=gcode,
+            start_pos=machine.pos,
+            plane=plane,
+            dist_mode=(mode.distance or GCodeAbsoluteDistanceMode()),
+            arc_dist_mode=(mode.arc_ijk_distance or GCodeIncrementalArcDistanceMode()),
+        )
+        gcode.process(machine)
+
+        # Arc's angle; swept by rotating about -normal (clockwise is positive)
+        axis = -plane.normal
+        radii = (method.arc_p_start - method.arc_p_center, method.arc_p_end - method.arc_p_center)
+        angle = atan2(axis.dot(radii[0].cross(radii[1])), radii[0].dot(radii[1]))
+        if isinstance(gcode, GCodeArcMoveCW):
+            angle = (angle % (2 * pi)) or (2 * pi)  # (0 is a full circle)
+        else:
+            angle = -((-angle % (2 * pi)) or (2 * pi))
+
+        # Length (of a helix)
+        helical_disp = method.helical_end - method.helical_start
+        length = sqrt((method.arc_radius * angle) ** 2 + abs(helical_disp) ** 2)
+
+        # Tangents at each end
+        (entry_direction, exit_direction) = [
+            _unit(list((axis.cross(radius) * angle + helical_disp).xyz) + [0.] * 6)[0]
+            for radius in radii
+        ]
+
+        # Limits: the arc may travel in any direction on its plane (so each
+        # axis of the plane is fully limiting), plus its helical share
+        limit_direction = [0.] * len(_AXIS_INDEX)
+        for (i, n) in enumerate(plane.normal.xyz):
+            limit_direction[i] = abs(helical_disp.xyz[i]) / length if n else 1.
+        self._move(length, entry_direction, exit_direction, limit_direction)
+
+    def _canned_cycle(self, gcode):
+        machine = self.machine
+        mode = machine.mode
+        plane = mode.plane_selection or GCodeSelectXYPlane()
+        normal = _AXIS_INDEX[plane.normal_axis]
+        incremental = isinstance(mode.distance, GCodeIncrementalDistanceMode)
+
+        pos = list(machine.pos._coords)
+        initial_level = pos[normal]
+        params = gcode.get_param_dict(letters=machine.axes)
+        retract_level = gcode.R if (gcode.R is not None) else initial_level
+        depth = params.pop(plane.normal_axis, retract_level)
+        if incremental:
+            # R is relative to the initial level, Z is relative to R
+            retract_level += initial_level
+            depth += retract_level
+        final_level = retract_level
+        if not isinstance(mode.canned_cycles_return, GCodeCannedCycleReturnToR):
+            final_level = max(initial_level, retract_level)
+        feed_out = isinstance(gcode, (GCodeBoringCycleFeedOut, GCodeBoringCycleDwellFeedOut))
+        dwell = isinstance(gcode, (GCodeDrillingCycleDwell, GCodeBoringCycleDwellFeedOut))
+
+        repeat = gcode.L if (gcode.L is not None) and (gcode.L > 0) else 1
+        for i in range(repeat):
+            # Hole's position
+            hole = list(pos)
+            for (axis, value) in params.items():
+                i_axis = _AXIS_INDEX[axis]
+                hole[i_axis] = (pos[i_axis] + value) if incremental else value
+            self._line(pos, hole, rapid=True)
+            # Plunge
+            at_r = list(hole)
+            at_r[normal] = retract_level
+            at_depth = list(hole)
+            at_depth[normal] = depth
+            self._line(hole, at_r, rapid=True)
+            self._line(at_r, at_depth)
+            if dwell:
+                self.dwell_time += gcode.P or 0.
+                self._stop()
+            # Retract
+            self._line(at_depth, at_r, rapid=not feed_out)
+            pos = list(at_r)
+            pos[normal] = final_level
+            self._line(at_r, pos, rapid=True)
+
+        gcode.process(machine)
+
+
+def estimate(lines, **kwargs):
+    """
+    Estimate the run time of the given program
+    :param lines: iterable of Line, Block, or str instances
+    :param kwargs: passed to :class:`Estimator` (eg: ``max_velocity``, ``acceleration``)
+    :return: :class:`Estimate` instance
+    """
+    return Estimator(**kwargs).run(lines)
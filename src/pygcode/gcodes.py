@@ -1,10 +1,10 @@
 import sys
-from collections import defaultdict
 from copy import copy
 import six
 
 from .utils import Vector3, Quaternion, quat2coord_system
-from .words import Word, text2words
+from .words import Word, text2words, frozen_word
+from . import stats
 
 from .exceptions import GCodeParameterError, GCodeWordStrError
 
@@ -140,7 +140,10 @@ MODAL_GROUP_MAP = {
 class GCode(object):
     # Defining Word
     word_key = None # Word instance to use in lookup
-    word_matches = None # function (secondary)
+    word_values = None # set of word_letter values to use in lookup
+    word_value_range = None # (min, max) range of word_letter values to use in lookup (inclusive)
+    word_value_any = False # if set, all words of word_letter map to this class
+    word_matches = None # function (secondary; slower, for anything not described above)
     default_word = None
     word_letter = 'G'
     word_value_configurable = False  # if set, word value can be the first parameter
@@ -182,6 +185,17 @@ class GCode(object):
         for (k, v) in params.items():
             self.add_parameter(Word(k, v))
 
+    @classmethod
+    def _from_words(cls, word, params):
+        """
+        Fast constructor for already validated words (bypasses parameter checks)
+        :param word: Word instance defining gcode
+        :param params: dict of parameter Word instances, indexed by letter
+        """
+        gcode = cls.__new__(cls)
+        gcode.__dict__.update(word=word, params=params, _whitespace_prefix=False)
+        return gcode
+
     def __repr__(self):
         param_str = ''
         if self.params:
@@ -256,6 +270,8 @@ class GCode(object):
         :param word: Word instance
         """
         assert isinstance(word, Word), "invalid parameter class: %r" % word
+        if self.__dict__.get('_frozen', False):
+            raise AttributeError("%r is frozen (see modal_copy), it can't be changed" % self)
         if word.letter not in self.param_letters:
             raise GCodeParameterError("invalid parameter for %s: %s" % (self.__class__.__name__, str(word)))
         if word.letter in self.params:
@@ -289,6 +305,8 @@ class GCode(object):
 
     def __setattr__(self, key, value):
         if key in self.param_letters:
+            if self.__dict__.get('_frozen', False):
+                raise AttributeError("%r is frozen (see modal_copy), it can't be changed" % self)
             if key in self.params:
                 self.params[key].value = value
             else:
@@ -301,12 +319,24 @@ class GCode(object):
     def description(self):
         return self.__doc__
 
-    def modal_copy(self):
-        """Copy of GCode instance containing only parameters listed in modal_param_letters"""
-        return self.__class__(self.word, *[
-            w for (l, w) in self.params.items()
+    def modal_copy(self, frozen=False):
+        """
+        Copy of GCode instance containing only parameters listed in modal_param_letters
+        :param frozen: if True, the copy's parameters (and its words' values)
+                       can't be changed; eg: a machine's mode (shared with
+                       its checkpoints, see :meth:`Machine.checkpoint <pygcode.machine.Machine.checkpoint>`)
+        """
+        if not frozen:
+            return self.__class__(self.word, *[
+                w for (l, w) in self.params.items()
+                if l in self.modal_param_letters
+            ])
+        gcode = self._from_words(frozen_word(self.word), dict(
+            (l, frozen_word(w)) for (l, w) in self.params.items()
             if l in self.modal_param_letters
-        ])
+        ))
+        gcode.__dict__['_frozen'] = True
+        return gcode
 
     def get_param_dict(self, letters=None, lc=False):
         """
@@ -338,7 +368,11 @@ class GCode(object):
         self._process_mode(machine)
 
         # GCode specific
-        self._process(machine)
+        counters = stats.counters
+        if counters is None:
+            self._process(machine)
+        else:
+            counters.call(self.__class__.__name__ + '._process', self._process, machine)
 
     def _process_mode(self, machine):
         """Set machine's state"""
@@ -362,12 +396,9 @@ class GCodeLineNumber(GCodeDefinition):
     """N: Line Number"""
     word_letter = 'N'
     word_value_configurable = True
+    word_value_any = True
     exec_order = 0
 
-    @classmethod
-    def word_matches(cls, w):
-        return w.letter == 'N'
-
     @property
     def number(self):
         return self.word.value
@@ -377,12 +408,9 @@ class GCodeProgramName(GCodeDefinition):
     """O: Program Name"""
     word_letter = 'O'
     word_value_configurable = True
+    word_value_any = True
     exec_order = 1
 
-    @classmethod
-    def word_matches(cls, w):
-        return w.letter == 'O'
-
     @property
     def name(self):
         return self.word.value
@@ -499,9 +527,7 @@ class GCodeNURBSEnd(GCodeNURBS):
 
 class GCodeStraightProbe(GCodeMotion):
     """G38.2-G38.5: Straight Probe"""
-    @classmethod
-    def word_matches(cls, w):
-        return (w.letter == 'G') and (38.2 <= w.value <= 38.5)
+    word_value_range = (38.2, 38.5)
     default_word = Word('G', 38.2)
 
 
@@ -1046,9 +1072,7 @@ class GCodeFeedRate(GCodeOtherModal):
     """F: Set Feed Rate"""
     word_letter = 'F'
     word_value_configurable = True
-    @classmethod
-    def word_matches(cls, w):
-        return w.letter == 'F'
+    word_value_any = True
     default_word = Word('F', 0)
     modal_group = MODAL_GROUP_MAP['feed_rate']
     exec_order = 40
@@ -1058,9 +1082,7 @@ class GCodeSpindleSpeed(GCodeOtherModal):
     """S: Set Spindle Speed"""
     word_letter = 'S'
     word_value_configurable = True
-    @classmethod
-    def word_matches(cls, w):
-        return w.letter == 'S'
+    word_value_any = True
     default_word = Word('S', 0)
     # Modal Group: (see description in GCodeFeedRate)
     modal_group = MODAL_GROUP_MAP['spindle_speed']
@@ -1071,9 +1093,7 @@ class GCodeSelectTool(GCodeOtherModal):
     """T: Select Tool"""
     word_letter = 'T'
     word_value_configurable = True
-    @classmethod
-    def word_matches(cls, w):
-        return w.letter == 'T'
+    word_value_any = True
     default_word = Word('T', 0)
     # Modal Group: (see description in GCodeFeedRate)
     modal_group = MODAL_GROUP_MAP['tool']
@@ -1307,18 +1327,14 @@ class GCodeSet(GCodeNonModal):
 
 class GCodeGotoPredefinedPosition(GCodeNonModal):
     """G28,G30: Goto Predefined Position (rapid movement)"""
-    @classmethod
-    def word_matches(cls, w):
-        return (w.letter == 'G') and (w.value in [28, 30])
+    word_values = set([28, 30])
     default_word = Word('G', 28)
     exec_order = 230
 
 
 class GCodeSetPredefinedPosition(GCodeNonModal):
     """G28.1,G30.1: Set Predefined Position"""  # redundancy in language there, but I'll let it slide
-    @classmethod
-    def word_matches(cls, w):
-        return (w.letter == 'G') and (w.value in [28.1, 30.1])
+    word_values = set([28.1, 30.1])
     default_word = Word('G', 28.1)
     exec_order = 230
 
@@ -1337,9 +1353,7 @@ class GCodeCoordSystemOffset(GCodeNonModal):
 
 class GCodeResetCoordSystemOffset(GCodeNonModal):
     """G92.1,G92.2: Reset Coordinate System Offset"""
-    @classmethod
-    def word_matches(cls, w):
-        return (w.letter == 'G') and (w.value in [92.1, 92.2])
+    word_values = set([92.1, 92.2])
     default_word = Word('G', 92.1)
     exec_order = 230
 
@@ -1357,9 +1371,7 @@ class GCodeUserDefined(GCodeNonModal):
     word_letter = 'M'
     # To create user g-codes, inherit from this class
     param_letters = set('PQ')
-    #@classmethod
-    #def word_matches(cls, w):
-    #    return (w.letter == 'M') and (101 <= w.value <= 199)
+    #word_value_range = (101, 199)
     #default_word = Word('M', 101)
     exec_order = 130
     modal_group = MODAL_GROUP_MAP['user_defined']
@@ -1410,27 +1422,62 @@ def _gcode_class_infostr(base_class=GCode, prefix=''):
 # ======================= GCode Word Mapping =======================
 _gcode_maps_created = False  # only set when the below values are populated
 _gcode_word_map = {} # of the form: {Word('G', 0): GCodeRapidMove, ... }
+_gcode_dispatch = {} # of the form: {'G': ({0: GCodeRapidMove, ...}, [(38.2, 38.5, GCodeStraightProbe), ...], None), ... }
 _gcode_function_list = [] # of the form: [(lambda w: w.letter == 'F', GCodeFeedRate), ... ]
 
 
 def build_maps():
-    """Populate _gcode_word_map and _gcode_function_list"""
+    """Populate _gcode_word_map, _gcode_dispatch and _gcode_function_list"""
     # Ensure Word maps / lists are clear
     global _gcode_word_map
+    global _gcode_dispatch
     global _gcode_function_list
     _gcode_word_map = {}
+    _gcode_dispatch = {}
     _gcode_function_list = []
 
+    def dispatch_for(letter):
+        # of the form: (<value map>, <value ranges>, [<letter class>])
+        if letter not in _gcode_dispatch:
+            _gcode_dispatch[letter] = ({}, [], [None])
+        return _gcode_dispatch[letter]
+
+    def map_value(letter, value, cls):
+        value_map = dispatch_for(letter)[0]
+        if value in value_map:
+            raise RuntimeError("Multiple GCode classes map to '%s%s'" % (letter, value))
+        value_map[value] = cls
+
     for cls in _subclasses(GCode):
         if cls.word_key is not None:
             # Map Word instance to g-code class
             if cls.word_key in _gcode_word_map:
                 raise RuntimeError("Multiple GCode classes map to '%s'" % str(cls.word_key))
             _gcode_word_map[cls.word_key] = cls
+            map_value(cls.word_key.letter, cls.word_key.value, cls)
+        elif cls.word_values is not None:
+            for value in cls.word_values:
+                map_value(cls.word_letter, value, cls)
+        elif cls.word_value_range is not None:
+            (low, high) = cls.word_value_range
+            dispatch_for(cls.word_letter)[1].append((low, high, cls))
+        elif cls.word_value_any:
+            letter_class = dispatch_for(cls.word_letter)[2]
+            if letter_class[0] is not None:
+                raise RuntimeError("Multiple GCode classes map to '%s'" % cls.word_letter)
+            letter_class[0] = cls
         elif cls.word_matches is not None:
             # Add to list of functions
             _gcode_function_list.append((cls.word_matches, cls))
 
+    # Verify: values mapped individually are not also in a range
+    for (letter, (value_map, value_ranges, letter_class)) in _gcode_dispatch.items():
+        for (low, high, cls) in value_ranges:
+            for value in value_map:
+                if low <= value <= high:
+                    raise RuntimeError("%s conflicts with '%s%s'" % (cls.__name__, letter, value))
+        _gcode_dispatch[letter] = (value_map, tuple(value_ranges), letter_class[0])
+
     global _gcode_maps_created
     _gcode_maps_created = True
 
@@ -1452,9 +1499,19 @@ def word_gcode_class(word, exhaustive=False):
     if (not exhaustive) and (word.letter not in 'GMFSTNO'):
         return None
 
-    # by Word Map (faster)
-    if word in _gcode_word_map:
-        return _gcode_word_map[word]
+    # by Letter, then Value (fastest)
+    dispatch = _gcode_dispatch.get(word.letter, None)
+    if dispatch is not None:
+        (value_map, value_ranges, letter_class) = dispatch
+        value = word.value
+        gcode_class = value_map.get(value, None)
+        if gcode_class is not None:
+            return gcode_class
+        for (low, high, gcode_class) in value_ranges:
+            if low <= value <= high:
+                return gcode_class
+        if letter_class is not None:
+            return letter_class
 
     # by Function List (slower, so checked last)
     for (match_function, gcode_class) in _gcode_function_list:
@@ -1478,7 +1535,6 @@ def words2gcodes(words):
     -
     """
 
-    gcodes = []
     # Lines to consider
     # Conflicts with non G|M codes (ie: S|F|T)
     #   Spindle Control:
@@ -1489,48 +1545,38 @@ def words2gcodes(words):
     #       - M6 T1
     #
     # Conclusion: words are parameters first, gcodes second
-
-    # First determine which words are GCode candidates
-    word_info_list = [
-        {
-            'index': i, # for internal referencing
-            'word': word,
-            'gcode_class': word_gcode_class(word), # if not None, word is a candidate
-            'param_to_index': None,
-        }
-        for (i, word) in enumerate(words)
-    ]
-
-    # Link parameters to candidates
-    # note: gcode candidates may be valid parameters... therefore
-    # Also eliminate candidates that are parameters for earlier gcode candidates
-    for word_info in word_info_list:
-        if word_info['gcode_class'] is None:
-            continue # not a gcode candidate, so cannot have parameters
-        # which of the words following this gcode candidate are a valid parameter
-        for param_info in word_info_list[word_info['index'] + 1:]:
-            if param_info['word'].letter in word_info['gcode_class'].param_letters:
-                param_info['param_to_index'] = word_info['index']
-                param_info['gcode_class'] = None # no longer a valid candidate
-
-    # Map parameters
-    parameter_map = defaultdict(list) # {<gcode word index>: [<parameter words>], ... }
-    for word_info in word_info_list:
-        if word_info['gcode_class']:
-            continue # will form a gcode, so must not also be a parameter
-        parameter_map[word_info['param_to_index']].append(word_info['word'])
+    #
+    # So, in a single pass: a word is a parameter of the most recent gcode
+    # (candidate) accepting its letter. If there is no such gcode, it's a
+    # gcode candidate itself, or otherwise a modal parameter.
+
+    candidates = []  # of the form: [(<gcode class>, <word>, [<parameter words>]), ... ]
+    modal_params = []
+    param_lists = {}  # of the form: {<letter>: <parameter list of most recent gcode accepting letter>, ... }
+
+    for word in words:
+        params = param_lists.get(word.letter, None)
+        if params is not None:
+            params.append(word)
+            continue
+
+        gcode_class = word_gcode_class(word)
+        if gcode_class is None:
+            modal_params.append(word)
+            continue
+
+        params = []
+        candidates.append((gcode_class, word, params))
+        for letter in gcode_class.param_letters:
+            param_lists[letter] = params
 
     # Create gcode instances
-    for word_info in word_info_list:
-        if word_info['gcode_class'] is None:
-            continue # not a gcode candidate
-        gcode = word_info['gcode_class'](
-            word_info['word'],
-            *parameter_map[word_info['index']] # gcode parameters
-        )
-        gcodes.append(gcode)
+    gcodes = [
+        gcode_class(word, *params)
+        for (gcode_class, word, params) in candidates
+    ]
 
-    return (gcodes, parameter_map[None])
+    return (gcodes, modal_params)
 
 
 def text2gcodes(text):
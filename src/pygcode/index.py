@@ -0,0 +1,212 @@
+"""
+Checkpoint Index
+
+Processing a gcode file on a :class:`Machine <pygcode.machine.Machine>` is
+sequential; the machine's state at any given line depends on every line
+before it. So resuming (or cropping) a huge file part way through means
+replaying the whole program up to that line.
+
+A checkpoint index records the machine's state (see
+:meth:`Machine.checkpoint <pygcode.machine.Machine.checkpoint>`), and the byte
+offset of the line it was taken before, every ``interval`` lines. It's stored
+in a sidecar file next to the gcode file (``<gcode file>.idx``).
+
+:func:`seek` restores the nearest checkpoint, then replays only the lines
+between it and the line being sought. Lines are processed the same way
+when building & replaying; with :meth:`Machine.run <pygcode.machine.Machine.run>`.
+
+For example::
+
+    from pygcode.index import load_index, seek
+
+    index = load_index('huge.gcode')  # built (& saved) if not already current
+    (machine, lines) = seek('huge.gcode', 3800000, index=index)
+    print(machine.pos)  # position before line 3,800,000
+    for line in lines:  # line 3,800,000 onwards
+        machine.process_block(line.block)
+
+.. note::
+
+    Index files are :mod:`pickle` data; only load index files you trust.
+"""
+import os
+import pickle
+from bisect import bisect_right
+from itertools import chain, islice
+
+from .reader import iter_raw_lines
+from .line import Line
+from .machine import Machine
+
+# Number of lines between each checkpoint
+DEFAULT_INTERVAL = 10000
+
+# Index file's path is the gcode file's, with this suffix
+INDEX_SUFFIX = '.idx'
+
+INDEX_VERSION = 1
+
+
+class CheckpointIndex(object):
+    """Machine checkpoints taken periodically while processing a gcode file"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL, size=None, mtime=None, entries=None):
+        """
+        :param interval: number of lines between each checkpoint
+        :param size: indexed file's size (in bytes)
+        :param mtime: indexed file's modification time
+        :param entries: list of tuples: (<line number>, <byte offset>, <MachineCheckpoint>)
+        """
+        self.interval = interval
+        self.size = size
+        self.mtime = mtime
+        self.entries = entries if (entries is not None) else []
+        self._line_nos = [e[0] for e in self.entries]
+
+    def append(self, line_no, offset, checkpoint):
+        """
+        Add checkpoint (lines must be appended in order)
+        :param line_no: number of the line checkpoint was taken before
+        :param offset: byte offset of that line
+        :param checkpoint: :class:`MachineCheckpoint <pygcode.machine.MachineCheckpoint>` instance
+        """
+        self.entries.append((line_no, offset, checkpoint))
+        self._line_nos.append(line_no)
+
+    def nearest(self, line_no):
+        """
+        Nearest checkpoint at, or before, the given line
+        :param line_no: line number
+        :return: tuple: (<line number>, <byte offset>, <MachineCheckpoint>)
+        """
+        i = bisect_right(self._line_nos, line_no) - 1
+        if i < 0:
+            raise ValueError("no checkpoint at, or before, line %r" % line_no)
+        return self.entries[i]
+
+    def is_current(self, path):
+        """
+        :param path: path of indexed gcode file
+        :return: True if file has not changed since it was indexed
+        """
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime) == (self.size, self.mtime)
+
+    # Sidecar File
+    def save(self, filename):
+        with open(filename, 'wb') as fh:
+            pickle.dump((
+                INDEX_VERSION, self.interval, self.size, self.mtime, self.entries,
+            ), fh, protocol=2)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as fh:
+            data = pickle.load(fh)
+        if data[0] != INDEX_VERSION:
+            raise ValueError("unsupported index version: %r" % (data[0],))
+        (interval, size, mtime, entries) = data[1:]
+        return cls(interval=interval, size=size, mtime=mtime, entries=entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return "<{class_name}: {count} checkpoints, every {interval} lines>".format(
+            class_name=self.__class__.__name__,
+            count=len(self.entries),
+            interval=self.interval,
+        )
+
+
+def index_path(path):
+    """
+    :param path: path of gcode file
+    :return: path of gcode file's index (sidecar) file
+    """
+    return path + INDEX_SUFFIX
+
+
+def build_index(path, interval=DEFAULT_INTERVAL, machine=None, encoding=None, **kwargs):
+    """
+    Process the given file, taking a machine checkpoint every ``interval`` lines
+    :param path: path of gcode file
+    :param interval: number of lines between each checkpoint
+    :param machine: machine to process lines on (default: new :class:`Machine`)
+    :param encoding: file's encoding (default: utf-8)
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>` (eg: xy_decimals)
+    :return: :class:`CheckpointIndex` instance (not saved, see :meth:`CheckpointIndex.save`)
+    """
+    if interval < 1:
+        raise ValueError("invalid checkpoint interval: %r" % interval)
+    if machine is None:
+        machine = Machine()
+
+    stat = os.stat(path)
+    index = CheckpointIndex(interval=interval, size=stat.st_size, mtime=stat.st_mtime)
+    lines = _iter_lines_from(path, 1, 0, encoding=encoding, **kwargs)
+    for line in lines:
+        # checkpoint before the first of every interval lines
+        index.append(line.line_no, line.offset, machine.checkpoint())
+        machine.run(chain([line], islice(lines, interval - 1)))
+
+    return index
+
+
+def load_index(path, interval=DEFAULT_INTERVAL, rebuild=True, **kwargs):
+    """
+    Load given gcode file's index; building (and saving) it if necessary
+    :param path: path of gcode file
+    :param interval: number of lines between each checkpoint (if built)
+    :param rebuild: if False, a missing or out of date index raises an exception
+    :param kwargs: passed to :meth:`build_index`
+    :return: :class:`CheckpointIndex` instance
+    """
+    filename = index_path(path)
+    if os.path.exists(filename):
+        index = CheckpointIndex.load(filename)
+        if index.is_current(path):
+            return index
+        if not rebuild:
+            raise ValueError("index is out of date: %s" % filename)
+    elif not rebuild:
+        raise IOError("index not found: %s" % filename)
+
+    index = build_index(path, interval=interval, **kwargs)
+    index.save(filename)
+    return index
+
+
+def _iter_lines_from(path, line_no, offset, encoding=None, **kwargs):
+    # lines of the given file, from the given line (starting at the given byte offset)
+    with open(path, 'rb') as fh:
+        fh.seek(offset)
+        for (i, raw_offset, text) in iter_raw_lines(fh, encoding=encoding):
+            yield Line(text, line_no=line_no + i - 1, offset=offset + raw_offset, **kwargs)
+
+
+def seek(path, line_no, machine=None, index=None, encoding=None, **kwargs):
+    """
+    Machine's state before the given line of a gcode file is processed
+    :param path: path of gcode file
+    :param line_no: line number (the first line is 1)
+    :param machine: machine to restore state to (default: new :class:`Machine`,
+                    must be the same type of machine the index was built with)
+    :param index: :class:`CheckpointIndex` (default: see :meth:`load_index`)
+    :param encoding: file's encoding (default: utf-8)
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>` (eg: xy_decimals)
+    :return: tuple: (<machine>, <generator of Lines from line_no, to the end of the file>)
+    """
+    if line_no < 1:
+        raise ValueError("invalid line number: %r" % line_no)
+    if index is None:
+        index = load_index(path, encoding=encoding, **kwargs)
+    if machine is None:
+        machine = Machine()
+
+    (checkpoint_line_no, offset, checkpoint) = index.nearest(line_no)
+    machine.rollback(checkpoint)
+
+    lines = _iter_lines_from(path, checkpoint_line_no, offset, encoding=encoding, **kwargs)
+    machine.run(islice(lines, line_no - checkpoint_line_no))  # replay lines since checkpoint
+    return (machine, lines)
@@ -1,36 +1,220 @@
 import re
 
-from .comment import split_line
+from .comment import split_line, split_line_bytes
 from .block import Block
+from . import cache
+from . import stats
 
 class Line(object):
 
     line_regex = re.compile(r'^(?P<block_and_comment>.*?)?(?P<macro>%.*%?)?\s*$')
+    line_regex_bytes = re.compile(line_regex.pattern.encode('ascii'))
 
-    def __init__(self, text=None, xy_decimals=3):
+    # Attributes of a lazy line, set when first accessed (see __getattr__)
+    _lazy_attributes = frozenset(['block', 'comment', 'macro'])
+
+    def __init__(self, text=None, xy_decimals=3, line_no=None, offset=None, lazy=False, verify=True):
+        """
+        Line Constructor
+        :param text: line of gcode (including comments)
+        :param xy_decimals: decimal places used to represent X & Y values
+        :param line_no: line number in source file (if known)
+        :param offset: byte offset of line's start in source file (if known)
+        :param lazy: if True, text is not parsed until the line's block,
+                     comment, or macro is first accessed (so any parsing
+                     errors are raised then); and the block's words are not
+                     parsed until they're accessed (see :class:`Block`)
+        :param verify: verify the block's gcodes (see :class:`Block`); set
+                       False to skip verification of trusted gcode, which
+                       may be verified later (see :mod:`pygcode.validation`)
+        """
         self._text = text
+        self.xy_decimals = xy_decimals
+        self.verify = verify
+
+        # Location in source file
+        self.line_no = line_no
+        self.offset = offset
+
+        if lazy and (text is not None):
+            self._lazy = True
+            return  # parsed when first accessed
 
         # Initialize
         self.block = None
         self.comment = None
         self.macro = None
-        self.xy_decimals = xy_decimals
 
-        # Split line into block text, and comments
         if text is not None:
-            match = self.line_regex.search(text)
+            self._load(text)
+
+    def _load(self, text, lazy=False):
+        """
+        Parse given line text (or load it from the parse cache)
+        :param text: line of gcode (including comments)
+        :param lazy: defer parsing the block's words (unless lines are cached)
+        """
+        parse_cache = cache.parse_cache
+        if parse_cache is None:
+            self._parse(text, lazy=lazy)
+        else:
+            cache_key = (Line, text, self.xy_decimals, self.verify)
+            record = parse_cache.get(cache_key)
+            if record is None:
+                self._parse(text)
+                parse_cache.put(cache_key, self._to_record())
+            else:
+                self._load_record(record)
+
+    def __getattr__(self, k):
+        # Lazy line; parse when block, comment, or macro is first accessed
+        if (k in self._lazy_attributes) and self.__dict__.pop('_lazy', False):
+            self.block = None
+            self.comment = None
+            self.macro = None
+            lazy_record = self.__dict__.pop('_lazy_record', None)
+            lazy_bytes = self.__dict__.pop('_lazy_bytes', None)
+            if lazy_record is not None:
+                self._load_record(lazy_record)
+            elif lazy_bytes is not None:
+                self._load_bytes(*lazy_bytes, lazy=True)
+                (data, encoding) = lazy_bytes
+                self._text = data.decode(encoding)  # (see text)
+            else:
+                self._load(self._text, lazy=True)
+            return getattr(self, k)
 
-            block_and_comment = match.group('block_and_comment')
-            self.macro = match.group('macro')
+        raise AttributeError("'{cls}' object has no attribute '{key}'".format(
+            cls=self.__class__.__name__,
+            key=k
+        ))
+
+    def _parse(self, text, lazy=False):
+        """
+        Parse given line text (not cached)
+        :param text: line of gcode (including comments)
+        :param lazy: defer parsing the block's words
+        """
+        # Split line into block text, and comments
+        match = self.line_regex.search(text)
 
+        block_and_comment = match.group('block_and_comment')
+        self.macro = match.group('macro')
+
+        counters = stats.counters
+        if counters is None:
             (block_str, comment) = split_line(block_and_comment)
-            self.block = Block(block_str, xy_decimals=self.xy_decimals)
-            if comment:
-                self.comment = comment
+        else:
+            (block_str, comment) = counters.call('split_line', split_line, block_and_comment)
+        self.block = Block(None, xy_decimals=self.xy_decimals)
+        if block_str:
+            if lazy:
+                self.block._defer(block_str, verify=self.verify)
+            else:
+                self.block._parse(block_str, verify=self.verify)  # (a line's block is cached with the line)
+        if comment:
+            self.comment = comment
+
+    @classmethod
+    def from_bytes(cls, data, xy_decimals=3, line_no=None, offset=None, encoding='utf-8', lazy=False, verify=True):
+        """
+        Line from gcode given as bytes; gcode files are ASCII, so only
+        comments are decoded (with the given encoding)
+        :param data: line of gcode as a bytes-like object (eg: bytes, or memoryview),
+                     without its line terminator
+        :param xy_decimals: decimal places used to represent X & Y values
+        :param line_no: line number in source file (if known)
+        :param offset: byte offset of line's start in source file (if known)
+        :param encoding: encoding of comments
+        :param lazy: if True, parsing is deferred (see :class:`Line`)
+        :param verify: verify the block's gcodes (see :class:`Line`)
+        :return: Line instance
+
+        No reference to data is kept; so a memoryview may be released once
+        the line is created. Line's original text is not retained (see :attr:`text`),
+        unless it's lazy (a lazy line keeps a copy of data, then its decoded
+        text once it's parsed).
+        """
+        line = cls(None, xy_decimals=xy_decimals, line_no=line_no, offset=offset, verify=verify)
+        if lazy:
+            del line.block, line.comment, line.macro
+            line._lazy = True
+            line._lazy_bytes = (bytes(data), encoding)
+        else:
+            line._load_bytes(data, encoding)
+        return line
+
+    def _load_bytes(self, data, encoding, lazy=False):
+        """
+        Parse given line content, given as bytes (or load it from the parse cache)
+        :param data: bytes-like object
+        :param encoding: encoding of comments
+        :param lazy: defer parsing the block's words (unless lines are cached)
+        """
+        parse_cache = cache.parse_cache
+        if parse_cache is None:
+            self._parse_bytes(data, encoding, lazy=lazy)
+        else:
+            data = bytes(data)
+            cache_key = (Line, data, self.xy_decimals, encoding, self.verify)
+            record = parse_cache.get(cache_key)
+            if record is None:
+                self._parse_bytes(data, encoding)
+                parse_cache.put(cache_key, self._to_record())
+            else:
+                self._load_record(record)
+
+    def _parse_bytes(self, data, encoding, lazy=False):
+        """
+        Parse given line content, given as bytes (not cached)
+        :param data: bytes-like object
+        :param encoding: encoding of comments
+        :param lazy: defer parsing the block's words (data must be bytes)
+        """
+        # Split line into block content, and comments
+        match = self.line_regex_bytes.search(data)
+
+        (start, end) = match.span('block_and_comment')
+        macro = match.group('macro')
+        if macro is not None:
+            self.macro = macro.decode(encoding)
+
+        counters = stats.counters
+        if counters is None:
+            (block_bytes, comment) = split_line_bytes(data[start:end], encoding)
+        else:
+            (block_bytes, comment) = counters.call('split_line', split_line_bytes, data[start:end], encoding)
+        self.block = Block(None, xy_decimals=self.xy_decimals)
+        if block_bytes:
+            if lazy:
+                self.block._defer(block_bytes, verify=self.verify)
+            else:
+                self.block._parse_bytes(block_bytes, verify=self.verify)
+        if comment:
+            self.comment = comment
+
+    # Records (see Block._to_record)
+    def _to_record(self):
+        comment = None
+        if self.comment is not None:
+            comment = (self.comment.__class__, self.comment.text)
+        return (self.macro, comment, self.block._to_record())
+
+    def _load_record(self, record):
+        (self.macro, comment, block_record) = record
+        if comment is not None:
+            (comment_class, comment_text) = comment
+            self.comment = comment_class(comment_text)
+        self.block = Block(None, xy_decimals=self.xy_decimals)
+        self.block._load_record(block_record)
 
     @property
     def text(self):
         if self._text is None:
+            lazy_bytes = self.__dict__.get('_lazy_bytes', None)
+            if lazy_bytes is not None:
+                (data, encoding) = lazy_bytes
+                return data.decode(encoding)
             return str(self)
         return self._text
 
@@ -1,6 +1,7 @@
 import re
 from copy import copy, deepcopy
-from collections import defaultdict
+from operator import attrgetter
+from collections import defaultdict, namedtuple
 
 from .gcodes import (
     MODAL_GROUP_MAP, GCode,
@@ -15,6 +16,7 @@ from .block import Block
 from .line import Line
 from .words import Word
 from .utils import Vector3, Quaternion
+from . import stats
 
 from .exceptions import MachineInvalidAxis, MachineInvalidState
 
@@ -33,63 +35,73 @@ UNIT_MAP = {
 
 
 class Position(object):
+    """
+    Position of a machine's axes
+
+    Values are stored in a fixed length list (indexed by :attr:`AXIS_INDEX`),
+    so arithmetic & unit conversion are simple element-wise operations.
+    Axes not defined for a position are always zero (setting them raises
+    :class:`MachineInvalidAxis <pygcode.exceptions.MachineInvalidAxis>`).
+    """
     default_axes = 'XYZABCUVW'
     default_unit = UNIT_METRIC
     POSSIBLE_AXES = set('XYZABCUVW')
+    AXIS_INDEX = dict((axis, i) for (i, axis) in enumerate('XYZABCUVW'))
+
+    __slots__ = ('axes', '_unit', '_coords')
 
     def __init__(self, axes=None, **kwargs):
-        # Set axes (note: usage in __getattr__ and __setattr__)
+        # Set axes (note: usage in axis properties)
         if axes is None:
             axes = self.__class__.default_axes
         else:
             invalid_axes = set(axes) - self.POSSIBLE_AXES
             if invalid_axes:
                 raise MachineInvalidAxis("invalid axes proposed %s" % invalid_axes)
-        self.__dict__['axes'] = set(axes) & self.POSSIBLE_AXES
+        self.axes = _frozen_axes(axes)
 
         # Unit
         self._unit = kwargs.pop('unit', self.default_unit)
 
         # Initial Values
-        self._value = defaultdict(lambda: 0.0, dict((k, 0.0) for k in self.axes))
-        self._value.update(kwargs)
+        self._coords = [0.0] * 9
+        for (k, v) in kwargs.items():
+            if k not in self.axes:
+                raise MachineInvalidAxis("'%s' axis is not defined to be set" % k)
+            self._coords[self.AXIS_INDEX[k]] = v
+
+    def _new(self, coords):
+        # new instance with the same axes & unit as self
+        obj = self.__class__.__new__(self.__class__)
+        obj.axes = self.axes
+        obj._unit = self._unit
+        obj._coords = coords
+        return obj
 
     def __copy__(self):
-        return self.__class__(axes=copy(self.axes), unit=self._unit, **self.values)
+        return self._new(self._coords[:])
+
+    # Pickling
+    #   a Machine's Position class is created per instance (see Machine.__init__),
+    #   so positions are pickled as (base class) Position instances
+    def __reduce__(self):
+        return (_unpickle_position, (self.axes, self._unit, self._coords))
 
     def update(self, **coords):
         for (k, v) in coords.items():
             setattr(self, k, v)
 
-    # Attributes Get/Set
-    def __getattr__(self, key):
-        if key in self.axes:
-            return self._value[key]
-
-        raise AttributeError("'{cls}' object has no attribute '{key}'".format(
-            cls=self.__class__.__name__,
-            key=key
-        ))
-
-    def __setattr__(self, key, value):
-        if key in self.axes:
-            self._value[key] = value
-        elif key in self.POSSIBLE_AXES:
-            raise MachineInvalidAxis("'%s' axis is not defined to be set" % key)
-        else:
-            self.__dict__[key] = value
-
     # Equality
     def __eq__(self, other):
         if self.axes ^ other.axes:
             return False
         else:
             if self._unit == other._unit:
-                return self._value == other._value
+                return self._coords == other._coords
             else:
                 x = copy(other)
                 x.unit = self._unit
-                return self._value == x._value
+                return self._coords == x._coords
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -98,30 +110,30 @@ class Position(object):
     def __add__(self, other):
         if self.axes ^ other.axes:
             raise MachineInvalidAxis("axes: %r != %r" % (self.axes, other.axes))
-        new_obj = copy(self)
-        for k in new_obj._value:
-            new_obj._value[k] += other._value[k]
-        return new_obj
+        return self._new([a + b for (a, b) in zip(self._coords, other._coords)])
 
     def __sub__(self, other):
         if other.axes - self.axes:
             raise MachineInvalidAxis("for a - b: axes in b, that are not in a: %r" % (other.axes - self.axes))
-        new_obj = copy(self)
-        for k in other._value:
-            new_obj._value[k] -= other._value[k]
-        return new_obj
+        return self._new([a - b for (a, b) in zip(self._coords, other._coords)])
+
+    def __iadd__(self, other):
+        if self.axes ^ other.axes:
+            raise MachineInvalidAxis("axes: %r != %r" % (self.axes, other.axes))
+        self._coords = [a + b for (a, b) in zip(self._coords, other._coords)]
+        return self
+
+    def __isub__(self, other):
+        if other.axes - self.axes:
+            raise MachineInvalidAxis("for a - b: axes in b, that are not in a: %r" % (other.axes - self.axes))
+        self._coords = [a - b for (a, b) in zip(self._coords, other._coords)]
+        return self
 
     def __mul__(self, scalar):
-        new_obj = copy(self)
-        for k in self._value:
-            new_obj._value[k] = self._value[k] * scalar
-        return new_obj
+        return self._new([v * scalar for v in self._coords])
 
     def __div__(self, scalar):
-        new_obj = copy(self)
-        for k in self._value:
-            new_obj._value[k] = self._value[k] / scalar
-        return new_obj
+        return self._new([v / scalar for v in self._coords])
 
     __truediv__ = __div__ # Python 3 division
 
@@ -134,8 +146,7 @@ class Position(object):
     def unit(self, value):
         if value != self._unit:
             factor = UNIT_MAP[self._unit]['conversion_factor'][value]
-            for k in [k for (k, v) in self._value.items() if v is not None]:
-                self._value[k] *= factor
+            self._coords = [v * factor for v in self._coords]
             self._unit = value
 
     # Min/Max
@@ -155,7 +166,7 @@ class Position(object):
         return cls(
             unit=p1.unit,
             **dict(
-                (k, key(getattr(p1, k), getattr(p2, k))) for k in p1.values
+                (k, key(getattr(p1, k), getattr(p2, k))) for k in p1.axes
             )
         )
 
@@ -170,15 +181,15 @@ class Position(object):
     # Words & Values
     @property
     def words(self):
-        return sorted(Word(k, self._value[k]) for k in self.axes)
+        return sorted(Word(k, self._coords[self.AXIS_INDEX[k]]) for k in self.axes)
 
     @property
     def values(self):
-        return dict(self._value)
+        return dict((k, self._coords[self.AXIS_INDEX[k]]) for k in self.axes)
 
     @property
     def vector(self):
-        return Vector3(self._value['X'], self._value['Y'], self._value['Z'])
+        return Vector3(*self._coords[:3])
 
     # String representation(s)
     def __repr__(self):
@@ -188,6 +199,50 @@ class Position(object):
         )
 
 
+def _axis_property(axis):
+    # Position.<axis> property: get/set an axis' value (if it's defined)
+    index = Position.AXIS_INDEX[axis]
+
+    def fget(self):
+        if axis in self.axes:
+            return self._coords[index]
+        raise AttributeError("'{cls}' object has no attribute '{key}'".format(
+            cls=self.__class__.__name__,
+            key=axis
+        ))
+
+    def fset(self, value):
+        if axis not in self.axes:
+            raise MachineInvalidAxis("'%s' axis is not defined to be set" % axis)
+        self._coords[index] = value
+
+    return property(fget, fset)
+
+for _axis in Position.AXIS_INDEX:
+    setattr(Position, _axis, _axis_property(_axis))
+
+
+def _unpickle_position(axes, unit, coords):
+    obj = Position.__new__(Position)
+    obj.axes = _frozen_axes(axes)
+    obj._unit = unit
+    obj._coords = coords
+    return obj
+
+
+_frozen_axes_cache = {}  # of the form: {<axes>: frozenset(<axes>), ... }
+
+def _frozen_axes(axes):
+    # frozenset of given axes, shared by all positions with the same axes
+    try:
+        return _frozen_axes_cache[axes]
+    except (KeyError, TypeError):  # TypeError: unhashable (eg: a set)
+        frozen = frozenset(axes) & Position.POSSIBLE_AXES
+        if isinstance(axes, (str, frozenset)):
+            _frozen_axes_cache[axes] = frozen
+        return frozen
+
+
 class CoordinateSystem(object):
     def __init__(self, axes=None):
         self.offset = Position(axes=axes)
@@ -311,13 +366,29 @@ class Mode(object):
         :return: dict of form: {<modal group>: <new mode GCode>, ...}
         """
         modal_gcodes = {}
-        for g in sorted(gcode_list): # sorted by execution order
+        if len(gcode_list) > 1:
+            gcode_list = sorted(gcode_list) # sorted by execution order
+        for g in gcode_list:
             if g.modal_group is not None:
-                self.modal_groups[g.modal_group] = g.modal_copy()
+                if not self._is_mode(g):
+                    self.modal_groups[g.modal_group] = g.modal_copy(frozen=True)
                 modal_gcodes[g.modal_group] = self.modal_groups[g.modal_group]
                 # assumption: no 2 gcodes are in the same modal_group
         return modal_gcodes
 
+    def _is_mode(self, gcode):
+        """
+        :param gcode: modal GCode instance
+        :return: True if gcode's modal copy would be the same as its group's current mode
+        """
+        current = self.modal_groups[gcode.modal_group]
+        if (current is None) or (current.__class__ is not gcode.__class__) or (current.word != gcode.word):
+            return False
+        return current.params == dict(
+            (l, w) for (l, w) in gcode.params.items()
+            if l in gcode.modal_param_letters
+        )
+
     def __getattr__(self, key):
         if key in MODAL_GROUP_MAP:
             return self.modal_groups[MODAL_GROUP_MAP[key]]
@@ -340,7 +411,7 @@ class Mode(object):
                     raise MachineInvalidState("invalid mode value: %r" % value)
                 if value.modal_group != MODAL_GROUP_MAP[key]:
                     raise MachineInvalidState("cannot set '%s' mode as %r, wrong group" % (key, value))
-                self.modal_groups[MODAL_GROUP_MAP[key]] = value.modal_copy()
+                self.modal_groups[MODAL_GROUP_MAP[key]] = value.modal_copy(frozen=True)
         else:
             self.__dict__[key] = value
 
@@ -362,6 +433,15 @@ class Mode(object):
         )
 
 
+# Machine Checkpoint
+#   snapshot of a machine's mode, state & position (see Machine.checkpoint)
+MachineCheckpoint = namedtuple('MachineCheckpoint', [
+    'modal_groups',  # {<modal group>: <GCode>, ...}
+    'coord_systems', 'cur_coord_sys', 'offset',  # State
+    'abs_pos', 'abs_range_min', 'abs_range_max',
+])
+
+
 class Machine(object):
     """Machine to process gcodes, enforce axis limits, keep track of time, etc"""
 
@@ -379,6 +459,7 @@ class Machine(object):
         # Position type (with default axes the same as this machine)
         units_mode = getattr(self.mode, 'units', None)
         self.Position = type('Position', (Position,), {
+            '__slots__': (),
             'default_axes': self.axes,
             'default_unit': units_mode.unit_id if units_mode else Position.default_unit,
         })
@@ -386,8 +467,13 @@ class Machine(object):
         # Absolute machine position
         self.abs_pos = self.Position()
         # Machine's motion range (min/max corners of a bounding box)
+        #   updated in place, see _update_abs_range()
         self.abs_range_min = copy(self.abs_pos)
         self.abs_range_max = copy(self.abs_pos)
+        self._range_indexes = tuple(sorted(Position.AXIS_INDEX[k] for k in self.axes))
+
+        # Modal motion gcode layouts, see modal_gcode()
+        self._modal_layouts = {}
 
     def __copy__(self):
         obj = self.__class__()
@@ -398,6 +484,57 @@ class Machine(object):
         obj.abs_range_max = copy(self.abs_range_max)
         return obj
 
+    # Checkpoints
+    def checkpoint(self):
+        """
+        Snapshot of machine's current mode, state & position
+        :return: :class:`MachineCheckpoint` instance, to restore with :meth:`rollback`
+
+        Positions are copied, but modal gcodes & coordinate systems are shared
+        with the machine: processing gcodes replaces them, they're never
+        changed in place (a mode's gcodes are frozen copies, see
+        :meth:`GCode.modal_copy <pygcode.gcodes.GCode.modal_copy>`, so they
+        can't be). So a checkpoint's cost is bounded by the number of modal
+        groups & coordinate systems; cheap enough to take every line.
+        """
+        state = self.state
+        return MachineCheckpoint(
+            modal_groups=dict(self.mode.modal_groups),
+            coord_systems=dict(state.coord_systems),
+            cur_coord_sys=state.cur_coord_sys,
+            offset=copy(state.offset),
+            abs_pos=copy(self.abs_pos),
+            abs_range_min=copy(self.abs_range_min),
+            abs_range_max=copy(self.abs_range_max),
+        )
+
+    def rollback(self, checkpoint):
+        """
+        Restore machine's mode, state & position
+        :param checkpoint: :class:`MachineCheckpoint` returned by :meth:`checkpoint`
+
+        A checkpoint may be restored any number of times; including one
+        loaded from a file (see :mod:`pygcode.index`), its positions are
+        restored as this machine's :attr:`Position` type.
+        """
+        self.mode.modal_groups.clear()
+        self.mode.modal_groups.update(checkpoint.modal_groups)
+        state = self.state
+        state.coord_systems = dict(checkpoint.coord_systems)
+        state.cur_coord_sys = checkpoint.cur_coord_sys
+        state.offset = copy(checkpoint.offset)
+        self.abs_pos = self._copy_position(checkpoint.abs_pos)
+        self.abs_range_min = self._copy_position(checkpoint.abs_range_min)
+        self.abs_range_max = self._copy_position(checkpoint.abs_range_max)
+
+    def _copy_position(self, pos):
+        # copy of given position, as this machine's Position type
+        obj = self.Position.__new__(self.Position)
+        obj.axes = pos.axes
+        obj._unit = pos._unit
+        obj._coords = pos._coords[:]
+        return obj
+
     def set_mode(self, *gcode_list):
         self.mode.set_mode(*gcode_list)  # passthrough
 
@@ -416,6 +553,25 @@ class Machine(object):
         if not modal_params:
             return None
 
+        # Cached Layout
+        #   the gcode a motion mode + modal parameters reconstruct to is
+        #   determined by the gcode's class, and parameters' letters (only
+        #   G & M words' gcode class depends on their value).
+        #   A layout is cached from its first (validated) build, and only for
+        #   gcode classes whose parameter validation is by letter alone.
+        motion = self.mode.motion
+        if motion is not None:
+            params = dict(motion.params)
+            for w in modal_params:
+                params[w.letter] = w  # override retained modal parameters
+            key = (motion.__class__, tuple(params))
+            layout = self._modal_layouts.get(key, None)
+            if layout is not None:
+                (gcode_class, letters) = layout
+                return gcode_class._from_words(motion.word, dict(
+                    (l, params[l]) for l in letters
+                ))
+
         if self.mode.motion is None:
             (modal_gcodes, unasigned_words) = ([], modal_params)
             # forces exception to be raised in next step
@@ -446,6 +602,11 @@ class Machine(object):
 
         if modal_gcodes:
             assert len(modal_gcodes) == 1, "more than 1 modal code found"
+            gcode_class = modal_gcodes[0].__class__
+            if not (unasigned_words or set('GM').intersection(params)) and \
+                    (gcode_class.__init__ is GCode.__init__) and \
+                    (gcode_class.add_parameter is GCode.add_parameter):
+                self._modal_layouts[key] = (gcode_class, tuple(modal_gcodes[0].params))
             return modal_gcodes[0]
 
         return None
@@ -488,9 +649,15 @@ class Machine(object):
         :param gcode_list: list of GCode instances
         :param modal_params: list of Word instances to be applied to current movement mode
         """
+        modal_params = kwargs.get('modal_params', [])
+        counters = stats.counters
+        if counters is not None:
+            return counters.call('Machine.process_gcodes', self._process_gcodes, gcode_list, modal_params)
+        self._process_gcodes(gcode_list, modal_params)
+
+    def _process_gcodes(self, gcode_list, modal_params):
         gcode_list = list(gcode_list) # make appendable
         # Add modal gcode to list of given gcodes
-        modal_params = kwargs.get('modal_params', [])
         if modal_params:
             modal_gcode = self.modal_gcode(modal_params)
             if modal_gcode:
@@ -517,18 +684,72 @@ class Machine(object):
         line = Line(block_str)
         self.process_block(line.block)
 
+    def run(self, lines):
+        """
+        Process lines in sequence
+        :param lines: iterable of Line, Block, or str instances
+
+        Equivalent to calling :meth:`process_block` for each line's block, but
+        faster for long programs; gcodes are processed directly (bypassing
+        :meth:`GCode.process <pygcode.gcodes.GCode.process>`'s assertions).
+        Each block is processed with :meth:`process_block` instead if this
+        machine overrides it (or :meth:`process_gcodes`), or while
+        :mod:`stats <pygcode.stats>` are enabled (so its stages are counted).
+        Gcodes overriding :meth:`GCode.process <pygcode.gcodes.GCode.process>`
+        are always processed with it.
+        """
+        exec_order = attrgetter('exec_order')
+        cls = self.__class__
+        direct = (stats.counters is None) and \
+            (cls.process_block is Machine.process_block) and \
+            (cls.process_gcodes is Machine.process_gcodes) and \
+            (cls._process_gcodes is Machine._process_gcodes)
+        gcode_process = GCode.process
+        for line in lines:
+            if isinstance(line, Line):
+                block = line.block
+            elif isinstance(line, Block):
+                block = line
+            else:
+                block = Line(line).block
+
+            if not direct:
+                self.process_block(block)
+                continue
+
+            gcodes = block.gcodes
+            if block.modal_params:
+                modal_gcode = self.modal_gcode(block.modal_params)
+                if modal_gcode:
+                    gcodes = gcodes + [modal_gcode]
+            if len(gcodes) > 1:
+                gcodes = sorted(gcodes, key=exec_order)
+
+            for gcode in gcodes:
+                if gcode.__class__.process is not gcode_process:
+                    gcode.process(self)
+                    continue
+                gcode._process_mode(self)
+                gcode._process(self)
+
     # Position conversions (considering offsets)
+    def _coord_sys_offset(self):
+        offset = getattr(self.state.coord_sys, 'offset', None)
+        if offset is None:
+            return Position(axes=self.axes)
+        return offset
+
     def abs2work(self, abs_pos):
         assert isinstance(abs_pos, Position), "bad abs_pos type"
-        coord_sys_offset = getattr(self.state.coord_sys, 'offset', Position(axes=self.axes))
-        temp_offset = self.state.offset
-        return (abs_pos - coord_sys_offset) - temp_offset
+        work_pos = abs_pos - self._coord_sys_offset()
+        work_pos -= self.state.offset  # temporary offset
+        return work_pos
 
     def work2abs(self, work_pos):
         assert isinstance(work_pos, Position), "bad work_pos type"
-        coord_sys_offset = getattr(self.state.coord_sys, 'offset', Position(axes=self.axes))
-        temp_offset = self.state.offset
-        return (work_pos + temp_offset + coord_sys_offset)
+        abs_pos = work_pos + self.state.offset  # temporary offset
+        abs_pos += self._coord_sys_offset()
+        return abs_pos
 
     @property
     def pos(self):
@@ -542,8 +763,22 @@ class Machine(object):
         self._update_abs_range(self.abs_pos)
 
     def _update_abs_range(self, pos):
-        self.abs_range_min = Position.min(pos, self.abs_range_min)
-        self.abs_range_max = Position.max(pos, self.abs_range_max)
+        # accumulate running min/max per axis, in place
+        # (equivalent to Position.min & Position.max, without creating new positions)
+        range_min = self.abs_range_min
+        range_max = self.abs_range_max
+        if pos._unit != range_min._unit:
+            pos = copy(pos)
+            pos.unit = range_min._unit
+        coords = pos._coords
+        mins = range_min._coords
+        maxs = range_max._coords
+        for i in self._range_indexes:
+            v = coords[i]
+            if v < mins[i]:
+                mins[i] = v
+            elif v > maxs[i]:
+                maxs[i] = v
 
     # =================== Machine Actions ===================
     def move_to(self, rapid=False, **coords):
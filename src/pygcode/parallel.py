@@ -0,0 +1,163 @@
+"""
+Parallel Parsing
+
+Parsing a line of gcode (into :class:`Line <pygcode.line.Line>`,
+:class:`Block <pygcode.block.Block>` and :class:`GCode <pygcode.gcodes.GCode>`
+instances) does not depend on any other line; only processing those lines with
+a :class:`Machine <pygcode.machine.Machine>` is sequential.
+
+So large files are split (at line boundaries) into chunks that are parsed by a
+pool of worker processes. Parsed lines are yielded in their original order.
+
+Workers return each chunk in a compact form (words as ``(letter, value)``
+pairs, gcodes as indexes into those words) which is rebuilt into Line
+instances without re-tokenizing; transferring the full object graph with
+:mod:`pickle` costs about as much as parsing the lines in the first place.
+
+Rebuilding each line's words & gcodes is still done by this (the parent)
+process, one line at a time; it costs about 2/3 as much as parsing the line,
+which limits the speedup of any number of workers to ~1.5x. With
+``lazy=True`` each Line is rebuilt when its block, comment, or macro is first
+accessed instead; so only lines that are used are rebuilt, by whichever
+process uses them (eg: after passing them to another pool of workers).
+
+For example::
+
+    from pygcode import Machine
+    from pygcode.parallel import parse_file
+
+    m = Machine()
+    for line in parse_file('huge.gcode', workers=8):
+        m.process_block(line.block)
+"""
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .reader import parse_file as _parse_stream
+from .line import Line
+
+# Number of bytes parsed by a worker process at a time
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB
+
+
+def chunk_ranges(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split the given file into byte ranges, each ending on a line boundary
+    :param path: path of file to split
+    :param chunk_size: approximate number of bytes in each range
+    :return: generator of (<start offset>, <end offset>) tuples
+
+    Ranges end after a ``\n`` (so never between a ``\r\n`` pair); a file
+    with only lone ``\r`` line terminators is not split.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as fh:
+        start = 0
+        while start < size:
+            # end of chunk: end of the line containing (start + chunk_size)
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                fh.seek(end)
+                fh.readline()
+                end = min(fh.tell(), size)
+            yield (start, end)
+            start = end
+
+
+def parse_chunk(path, start, end, encoding=None, **kwargs):
+    """
+    Parse lines of the given file between the given offsets
+    (the work done by each worker process)
+    :param path: path of gcode file
+    :param start: byte offset of chunk's start (must be the start of a line)
+    :param end: byte offset of chunk's end (must be the end of a line)
+    :param encoding: file's encoding (default: utf-8)
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>`
+    :return: list of Line instances (line numbers relative to the chunk's start)
+    """
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+
+    lines = list(_parse_stream(io.BytesIO(data), chunk_size=len(data) or 1, encoding=encoding, **kwargs))
+    for line in lines:
+        line.offset += start
+    return lines
+
+
+def _encode_line(line):
+    # Line -> tuple of builtin types (and class references)
+    return (line._text, line.xy_decimals, line.verify, line.line_no, line.offset, line._to_record())
+
+
+def _decode_line(record, lazy=False):
+    # tuple from _encode_line() -> Line
+    (text, xy_decimals, verify, line_no, offset, line_record) = record
+    line = Line(None, xy_decimals=xy_decimals, line_no=line_no, offset=offset, verify=verify)
+    line._text = text
+    if lazy:
+        # rebuilt when first accessed (see Line.__getattr__)
+        del line.block, line.comment, line.macro
+        line._lazy = True
+        line._lazy_record = line_record
+    else:
+        line._load_record(line_record)
+    return line
+
+
+def _parse_chunk_encoded(*args, **kwargs):
+    # worker process' task
+    return [_encode_line(line) for line in parse_chunk(*args, **kwargs)]
+
+
+def parse_file(path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None, lazy=False, **kwargs):
+    """
+    Parse the given file with a pool of worker processes
+    :param path: path of gcode file
+    :param workers: number of worker processes (default: number of CPUs)
+    :param chunk_size: approximate number of bytes parsed by a worker at a time
+    :param encoding: file's encoding (default: utf-8)
+    :param lazy: if True, each Line's block, comment & macro are rebuilt from
+                 the worker's parsed record when first accessed
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>` (eg: xy_decimals)
+    :return: generator of :class:`Line <pygcode.line.Line>` instances, in file order
+
+    Each Line's ``line_no`` and ``offset`` are the same as they would be if
+    parsed by :meth:`pygcode.reader.iter_lines`.
+
+    At most ``2 * workers`` chunks are parsed ahead of those being yielded, so
+    memory use is bounded regardless of the file's size.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    ranges = chunk_ranges(path, chunk_size=chunk_size)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()  # futures, in file order
+
+        def submit_next():
+            for (start, end) in ranges:
+                pending.append(executor.submit(
+                    _parse_chunk_encoded, path, start, end, encoding=encoding, **kwargs
+                ))
+                return True
+            return False
+
+        for i in range(workers * 2):
+            if not submit_next():
+                break
+
+        line_count = 0  # lines yielded from previous chunks
+        while pending:
+            records = pending.popleft().result()
+            submit_next()
+            for record in records:
+                line = _decode_line(record, lazy=lazy)
+                line.line_no += line_count
+                yield line
+            line_count += len(records)
@@ -0,0 +1,238 @@
+import re
+import mmap
+import warnings
+
+from .line import Line
+
+# Files are read in chunks of this many bytes (or characters, for text streams)
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+DEFAULT_ENCODING = 'utf-8'
+
+# Line terminators (as universal newlines): \n, \r\n, or a lone \r
+LINE_END_REGEX = re.compile(r'\r\n?|\n')
+BYTES_LINE_END_REGEX = re.compile(br'\r\n?|\n')
+# a lone \r terminator (if there are none, content can be split on \n alone)
+LONE_CR_REGEX = re.compile(r'\r(?!\n)')
+BYTES_LONE_CR_REGEX = re.compile(br'\r(?!\n)')
+
+
+def _iter_line_spans(data, start=0, end=None):
+    """
+    Iterate through lines of the given content
+    :param data: str, bytes, or buffer (eg: mmap.mmap) of content
+    :param start: index to start from
+    :param end: index to stop at (default: end of data)
+    :return: generator of tuples: (<line start>, <line end>, <next line's start>);
+             the last line (if it has no terminator) ends at end
+    """
+    if end is None:
+        end = len(data)
+    if isinstance(data, str):
+        (cr, lf, regex, lone_cr_regex) = ('\r', '\n', LINE_END_REGEX, LONE_CR_REGEX)
+    else:
+        (cr, lf, regex, lone_cr_regex) = (b'\r', b'\n', BYTES_LINE_END_REGEX, BYTES_LONE_CR_REGEX)
+    if lone_cr_regex.search(data, start, end) is None:
+        # \n (or \r\n) terminators only (the common case): no need for a regex
+        while start < end:
+            line_end = data.find(lf, start, end)
+            if line_end < 0:
+                break
+            if (line_end > start) and (data[line_end - 1:line_end] == cr):
+                yield (start, line_end - 1, line_end + 1)  # \r\n terminator
+            else:
+                yield (start, line_end, line_end + 1)
+            start = line_end + 1
+    else:
+        for match in regex.finditer(data, start, end):
+            yield (start, match.start(), match.end())
+            start = match.end()
+    if start < end:
+        yield (start, end, end)  # last line (no line terminator)
+
+
+def _iter_chunk_lines(fp, chunk_size):
+    """
+    Iterate through lines of given file object, read in chunks
+    :param fp: file object (binary or text)
+    :param chunk_size: maximum size of each read
+    :return: generator of lines (each including its line terminator, if any)
+
+    Lines are terminated by ``\n``, ``\r\n``, or a lone ``\r`` (as with
+    universal newlines).
+    """
+    pending = fp.read(0)  # b'' or '' (matching the stream's type)
+    if isinstance(pending, bytes):
+        (cr, lf, regex, lone_cr_regex) = (b'\r', b'\n', BYTES_LINE_END_REGEX, BYTES_LONE_CR_REGEX)
+    else:
+        (cr, lf, regex, lone_cr_regex) = ('\r', '\n', LINE_END_REGEX, LONE_CR_REGEX)
+
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        if pending:
+            chunk = pending + chunk
+        # a chunk ending in \r may be split from its \n: leave it pending
+        end = len(chunk) - 1 if chunk.endswith(cr) else len(chunk)
+        start = 0
+        if lone_cr_regex.search(chunk, 0, end) is None:
+            # \n (or \r\n) terminators only (the common case): no need for a regex
+            find = chunk.find
+            while True:
+                line_end = find(lf, start)  # (a pending \r isn't followed by \n)
+                if line_end < 0:
+                    break
+                yield chunk[start:line_end + 1]
+                start = line_end + 1
+        else:
+            for match in regex.finditer(chunk, 0, end):
+                yield chunk[start:match.end()]
+                start = match.end()
+        pending = chunk[start:]
+
+    if pending:
+        yield pending  # last line (no line terminator, or a lone \r)
+
+
+def iter_raw_lines(fp, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None):
+    """
+    Iterate through given file's lines, as text, with their location in the file
+    :param fp: file object; opened in binary mode for exact byte offsets
+    :param chunk_size: number of bytes read from fp at a time
+    :param encoding: binary file's encoding (default: utf-8)
+    :return: generator of tuples: (<line number>, <byte offset>, <line text>)
+
+    Line numbers start at 1; line text has its line terminator removed.
+
+    .. note::
+
+        For a text stream, byte offsets are calculated by encoding each line
+        with the stream's encoding; if the stream translated line endings
+        (eg: ``\\r\\n`` to ``\\n``) these offsets will not be exact.
+    """
+    if encoding is None:
+        encoding = getattr(fp, 'encoding', None) or DEFAULT_ENCODING
+
+    is_binary = isinstance(fp.read(0), bytes)
+    offset = 0
+    for (i, raw_line) in enumerate(_iter_chunk_lines(fp, chunk_size)):
+        if is_binary:
+            size = len(raw_line)
+            text = raw_line.decode(encoding)
+        else:
+            size = len(raw_line.encode(encoding))
+            text = raw_line
+        yield (i + 1, offset, text.rstrip('\r\n'))
+        offset += size
+
+
+def parse_file(fp, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None, **kwargs):
+    """
+    Parse given file object, yielding a Line for each line in the file
+    :param fp: file object (opened in binary or text mode)
+    :param chunk_size: number of bytes read from fp at a time
+    :param encoding: binary file's encoding (default: utf-8)
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>` (eg: xy_decimals)
+    :return: generator of :class:`Line <pygcode.line.Line>` instances
+
+    Memory use is independent of the file's size; only one chunk of the file,
+    and one Line is held at any time.
+    Each Line's ``line_no`` and ``offset`` locate it in the file.
+
+    For example::
+
+        import pygcode
+        with open('part.gcode', 'rb') as fh:
+            for line in pygcode.parse_file(fh):
+                print(line.line_no, line.offset, line.gcodes)
+    """
+    for (line_no, offset, text) in iter_raw_lines(fp, chunk_size=chunk_size, encoding=encoding):
+        yield Line(text, line_no=line_no, offset=offset, **kwargs)
+
+
+def iter_lines(path, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None, **kwargs):
+    """
+    Open and parse the given file, yielding a Line for each line in the file
+    (see :meth:`parse_file` for details)
+    :param path: path of gcode file
+    :return: generator of :class:`Line <pygcode.line.Line>` instances
+    """
+    with open(path, 'rb') as fh:
+        for line in parse_file(fh, chunk_size=chunk_size, encoding=encoding, **kwargs):
+            yield line
+
+
+def _iter_mapped_lines(mapped, encoding, **kwargs):
+    """
+    Parse memory mapped file content, yielding a Line for each line
+    :param mapped: mmap.mmap instance
+    :return: generator of :class:`Line <pygcode.line.Line>` instances
+    """
+    view = memoryview(mapped)
+    try:
+        for (line_no, (start, end, next_start)) in enumerate(_iter_line_spans(mapped), 1):
+            line = None
+            with view[start:end] as data:
+                try:
+                    line = Line.from_bytes(data, line_no=line_no, offset=start, encoding=encoding, **kwargs)
+                except Exception:
+                    pass  # (raised again below)
+            if line is None:
+                # parse a copy of the line to raise its exception; the first
+                # exception's traceback references slices of the map, so
+                # would keep it from being closed
+                line = Line.from_bytes(mapped[start:end], line_no=line_no, offset=start, encoding=encoding, **kwargs)
+            yield line
+    finally:
+        view.release()
+
+
+def map_file(fp, encoding=None, **kwargs):
+    """
+    Parse given file object via a memory map, yielding a Line for each line in the file
+    :param fp: file object opened in binary mode
+    :param encoding: file's encoding, only used to decode comments (default: utf-8)
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>` (eg: xy_decimals)
+    :return: generator of :class:`Line <pygcode.line.Line>` instances
+
+    Gcode is ASCII, so lines' content is tokenized as bytes, straight from
+    the mapped file (see :meth:`Line.from_bytes <pygcode.line.Line.from_bytes>`);
+    only comments are decoded.
+
+    If fp cannot be memory mapped (eg: an empty file, or a pipe like stdin),
+    lines are parsed by :meth:`parse_file` instead.
+    """
+    if encoding is None:
+        encoding = DEFAULT_ENCODING
+
+    try:
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, IOError, OSError, ValueError):
+        # io.UnsupportedOperation (no fileno) is both an OSError & a ValueError
+        for line in parse_file(fp, encoding=encoding, **kwargs):
+            yield line
+        return
+
+    try:
+        for line in _iter_mapped_lines(mapped, encoding, **kwargs):
+            yield line
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            # slices of the map are still referenced; it's unmapped once
+            # they're garbage collected
+            warnings.warn("memory mapped file not closed: views of it are still referenced", ResourceWarning)
+
+
+def iter_mapped_lines(path, encoding=None, **kwargs):
+    """
+    Open and parse the given file via a memory map, yielding a Line for each
+    line in the file (see :meth:`map_file` for details)
+    :param path: path of gcode file
+    :return: generator of :class:`Line <pygcode.line.Line>` instances
+    """
+    with open(path, 'rb') as fh:
+        for line in map_file(fh, encoding=encoding, **kwargs):
+            yield line
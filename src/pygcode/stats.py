@@ -0,0 +1,143 @@
+"""
+Stage Statistics
+
+Opt-in counters of how many times each stage of parsing & processing gcode
+is run, and how long it takes; a cheap alternative to attaching a profiler,
+to find where a given file's time goes.
+
+Stages counted:
+
+- ``split_line``: splitting a line's block content from its comments
+- ``text2words``: tokenizing a block into words
+- ``words2gcodes``: grouping words into gcodes
+- ``Block._assert_gcodes``: verifying a block's gcodes
+- ``Machine.process_gcodes``: processing a block's gcodes on a machine
+  (includes each gcode's ``_process``)
+- ``<GCode class>._process``: processing each gcode, by class
+
+For example::
+
+    from pygcode import stats, Machine, iter_lines
+
+    stats.enable()
+    machine = Machine()
+    for line in iter_lines('part.gcode'):
+        machine.process_block(line.block)
+    stats.report()  # table of stages: calls, total time, time per call
+    stats.disable()
+
+Counting is disabled by default. It can also be enabled by setting the
+``PYGCODE_STATS`` environment variable (to anything but an empty string),
+then a report is written to stderr when the program exits.
+
+While enabled, :meth:`Machine.run <pygcode.machine.Machine.run>` processes
+each block with :meth:`Machine.process_block <pygcode.machine.Machine.process_block>`
+(so its stages are counted), and lines loaded from the
+:mod:`parse cache <pygcode.cache>` skip parsing stages (so they're not counted).
+"""
+import os
+import sys
+import time
+import atexit
+from collections import defaultdict, namedtuple
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+
+StageInfo = namedtuple('StageInfo', ['calls', 'seconds'])
+
+
+class StageCounters(object):
+    """Number of calls, and total time spent, in each stage"""
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def call(self, stage, func, *args, **kwargs):
+        """
+        Call function, counting it as a stage
+        :param stage: stage name
+        :param func: function to call with remaining args
+        :return: function's return value
+        """
+        start = _timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.calls[stage] += 1
+            self.seconds[stage] += _timer() - start
+
+    def clear(self):
+        """Reset all counters"""
+        self.calls.clear()
+        self.seconds.clear()
+
+    def info(self):
+        """
+        :return: dict of the form: {<stage>: StageInfo(calls=..., seconds=...), ...}
+        """
+        return dict(
+            (stage, StageInfo(self.calls[stage], self.seconds[stage]))
+            for stage in self.calls
+        )
+
+
+# Counters of enabled stats (None while disabled)
+counters = None
+
+_collected = StageCounters()  # counters while enabled (retained when disabled)
+
+
+def enable():
+    """Start counting stages (counts continue from any previously collected)"""
+    global counters
+    counters = _collected
+
+
+def disable():
+    """Stop counting stages (collected counts are retained, see :meth:`reset`)"""
+    global counters
+    counters = None
+
+
+def is_enabled():
+    return counters is not None
+
+
+def reset():
+    """Discard all collected counts"""
+    _collected.clear()
+
+
+def get_stats():
+    """
+    Collected counts
+    :return: dict of the form: {<stage>: StageInfo(calls=..., seconds=...), ...}
+    """
+    return _collected.info()
+
+
+def report(fh=None):
+    """
+    Write collected counts as a table, slowest stage first
+    :param fh: file to write to (default: stdout)
+    """
+    if fh is None:
+        fh = sys.stdout
+    stages = sorted(get_stats().items(), key=lambda item: (-item[1].seconds, item[0]))
+    width = max([len('stage')] + [len(stage) for (stage, info) in stages])
+    fh.write("{stage:<{width}} {calls:>10} {seconds:>10} {per_call:>13}\n".format(
+        stage='stage', calls='calls', seconds='total (s)', per_call='per call (us)',
+        width=width,
+    ))
+    for (stage, info) in stages:
+        fh.write("{stage:<{width}} {calls:>10} {seconds:>10.3f} {per_call:>13.2f}\n".format(
+            stage=stage, calls=info.calls, seconds=info.seconds,
+            per_call=(info.seconds / info.calls) * 1e6, width=width,
+        ))
+
+
+if os.environ.get('PYGCODE_STATS'):
+    enable()
+    atexit.register(lambda: report(sys.stderr))
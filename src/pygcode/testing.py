@@ -0,0 +1,413 @@
+"""
+Synthetic Programs
+
+Generate large, valid, gcode programs for load testing, benchmarking, and
+fuzzing; so tests can scale their input without shipping huge files.
+
+Programs are built from this library's own :class:`GCode <pygcode.gcodes.GCode>`
+classes, and are deterministic for a given seed.
+
+For example::
+
+    from pygcode.testing import generate
+
+    with open('huge.ngc', 'w') as fh:
+        for line_str in generate(5000000, seed=1, mix={'arc_r': 5, 'comment': 0}):
+            fh.write(line_str + '\\n')
+
+Each line is one of the following (chosen at random, weighted by ``mix``,
+see :data:`DEFAULT_MIX`):
+
+=============   ===========================================================
+mix key         line content
+=============   ===========================================================
+``rapid``       rapid move (G0) to X, Y & Z
+``linear``      linear move (G1) on X & Y, some with a Z plunge
+``arc_r``       arc (G2 or G3), radius given with R
+``arc_ijk``     arc (G2 or G3), center given with I & J
+``canned``      canned drilling cycle (G81, G82, G83, or G73)
+``modal``       parameters only; another move in the current motion mode
+``comment``     comment only
+``coord_sys``   coordinate system selection (G54 - G59)
+``raster``      laser raster: G1 step along a row (on X), with power (S)
+``extrude``     3D printing: linear move (G1) on X & Y, with extrusion (E)
+``layer``       3D printing: next layer (G0 up on Z), with a comment
+``fillet``      arc (G3) identical to every other fillet (R2, quarter circle)
+``hole``        full circle (G2) identical to every other hole (I1.5)
+``helix``       full circle (G2) with I3, descending 0.5 on Z
+``zx_arc``      arc (G3) on the ZX plane (G18)
+=============   ===========================================================
+
+Programs are in millimeters (G21), absolute distance mode (G90), with
+incremental arc centers (G91.1), on the XY plane (G17); as set on the first
+line. Lines changing the motion mode away from a canned cycle are prefixed
+with G80, and lines following a ``zx_arc`` with G17.
+
+:data:`PROFILES` are mixes mimicking types of CAM output (eg: for
+benchmarks)::
+
+    lines = list(generate(100000, profile='laser'))
+"""
+import random
+from bisect import bisect
+from math import pi, sin, cos, hypot
+
+from .comment import CommentBrackets, CommentSemicolon
+from .gcodes import GCodeRapidMove, GCodeLinearMove, GCodeArcMoveCW, GCodeArcMoveCCW
+from .gcodes import GCodeDrillingCycle, GCodeDrillingCycleDwell
+from .gcodes import GCodeDrillingCyclePeck, GCodeDrillingCycleChipBreaking
+from .gcodes import GCodeCannedCycle, GCodeCancelCannedCycle
+from .gcodes import GCodeAbsoluteDistanceMode, GCodeIncrementalArcDistanceMode
+from .gcodes import GCodeUseMillimeters, GCodeSelectXYPlane, GCodeSelectZXPlane, GCodeUnitsPerMinuteMode
+from .gcodes import GCodeSelectCoordinateSystem1, GCodeSelectCoordinateSystem2
+from .gcodes import GCodeSelectCoordinateSystem3, GCodeSelectCoordinateSystem4
+from .gcodes import GCodeSelectCoordinateSystem5, GCodeSelectCoordinateSystem6
+from .gcodes import GCodeFeedRate, GCodeSpindleSpeed, GCodeStartSpindleCW
+from .words import Word
+
+# Relative frequency of each type of line (see module documentation)
+DEFAULT_MIX = {
+    'rapid': 5,
+    'linear': 40,
+    'arc_r': 10,
+    'arc_ijk': 15,
+    'canned': 3,
+    'modal': 20,
+    'comment': 5,
+    'coord_sys': 2,
+    'raster': 0,
+    'extrude': 0,
+    'layer': 0,
+    'fillet': 0,
+    'hole': 0,
+    'helix': 0,
+    'zx_arc': 0,
+}
+
+# Mixes mimicking types of CAM output (unlisted line types aren't generated)
+#   printing programs' extrusion (E) isn't modelled by Machine, so
+#   processing them needs ignore_invalid_modal
+PROFILES = {
+    # pocketing (linear & IJK arc moves), and drilled holes
+    'milling': {'rapid': 5, 'linear': 20, 'arc_ijk': 20, 'canned': 3, 'modal': 45, 'comment': 2},
+    # laser raster engraving
+    'laser': {'raster': 1},
+    # 3D printing (fused filament)
+    'printing': {'extrude': 250, 'layer': 1},
+    # arc heavy, including many identical arcs
+    'arcs': {'fillet': 30, 'hole': 20, 'arc_ijk': 25, 'helix': 10, 'zx_arc': 5, 'linear': 10},
+}
+
+CANNED_CYCLE_CLASSES = [
+    GCodeDrillingCycle, GCodeDrillingCycleDwell,
+    GCodeDrillingCyclePeck, GCodeDrillingCycleChipBreaking,
+]
+
+COORD_SYSTEM_CLASSES = [
+    GCodeSelectCoordinateSystem1, GCodeSelectCoordinateSystem2,
+    GCodeSelectCoordinateSystem3, GCodeSelectCoordinateSystem4,
+    GCodeSelectCoordinateSystem5, GCodeSelectCoordinateSystem6,
+]
+
+COMMENT_WORDS = [
+    'pocket', 'profile', 'contour', 'facing', 'drill', 'pass', 'finish',
+    'rough', 'chamfer', 'slot', 'boss', 'hole', 'outside', 'inside',
+]
+
+# Number of decimal places of generated coordinates; the same as
+# the default xy_decimals, so parsed values are those generated
+DECIMALS = 3
+
+# Laser raster rows: RASTER_ROW_STEPS steps of RASTER_STEP (on X), rows are RASTER_STEP apart (on Y)
+RASTER_STEP = 0.1
+RASTER_ROW_STEPS = 500
+
+# 3D printing
+LAYER_HEIGHT = 0.2
+EXTRUSION_RATE = 0.033  # extruded per unit of distance moved
+
+
+class ProgramGenerator(object):
+    """Generates a program's lines, tracking the position & motion mode they leave the machine in"""
+
+    def __init__(self, seed=0, mix=None, profile=None, extent=100., max_step=10., max_radius=20.):
+        """
+        :param seed: random seed (the same seed generates the same program)
+        :param mix: dict of relative frequencies, updates :data:`DEFAULT_MIX`
+                    (or the profile's mix) (eg: ``{'comment': 0}`` for no comment lines)
+        :param profile: name of a mix in :data:`PROFILES` (default: :data:`DEFAULT_MIX`)
+        :param extent: rapid moves (& canned cycles) are within +/- extent on X & Y
+        :param max_step: maximum X & Y distance of each linear move
+        :param max_radius: maximum arc radius
+        """
+        if profile is None:
+            weights = dict(DEFAULT_MIX)
+        elif profile in PROFILES:
+            weights = dict((key, 0) for key in DEFAULT_MIX)
+            weights.update(PROFILES[profile])
+        else:
+            raise ValueError("unknown profile: %r" % profile)
+        if mix:
+            unknown = set(mix) - set(DEFAULT_MIX)
+            if unknown:
+                raise ValueError("unknown mix key(s): %s" % ', '.join(sorted(unknown)))
+            weights.update(mix)
+
+        # line types, with cumulative weights (to choose from with bisect)
+        self._line_types = []
+        self._cumulative_weights = []
+        total = 0.
+        for (key, weight) in sorted(weights.items()):
+            if weight < 0:
+                raise ValueError("invalid mix weight %s: %r" % (key, weight))
+            if weight:
+                total += weight
+                self._line_types.append(key)
+                self._cumulative_weights.append(total)
+        if not total:
+            raise ValueError("mix has no line types to generate")
+
+        self.random = random.Random(seed)
+        self.extent = extent
+        self.max_step = max_step
+        self.max_radius = max_radius
+
+        # Machine State
+        self.pos = (0., 0., 0.)  # X, Y, Z
+        self.motion = None  # motion gcode class
+        self.zx_plane = False  # True if the last line selected the ZX plane
+        self.raster_row = 0
+        self.raster_steps = 0  # steps remaining in the current raster row
+        self.layer_count = 0
+        self.extruded = 0.  # extruder position (E)
+
+    # Utilities
+    def _value(self, low, high):
+        return round(self.random.uniform(low, high), DECIMALS)
+
+    def _set_motion(self, gcode):
+        # gcodes of a line setting the given motion mode
+        gcodes = []
+        if (self.motion is not None) and issubclass(self.motion, GCodeCannedCycle):
+            if not isinstance(gcode, GCodeCannedCycle):
+                gcodes.append(GCodeCancelCannedCycle())
+        self.motion = gcode.__class__
+        gcodes.append(gcode)
+        return gcodes
+
+    def _arc_params(self, radius_param, arc_class=None):
+        """
+        Random arc from the current position
+        :param radius_param: if True, arc is given by R, otherwise by I & J
+        :param arc_class: arc's direction (default: random)
+        :return: tuple: (<gcode class>, <param dict>)
+        """
+        (x, y, z) = self.pos
+        if arc_class is None:
+            arc_class = self.random.choice([GCodeArcMoveCW, GCodeArcMoveCCW])
+        radius = self._value(0.5, self.max_radius)
+        # arc's angle; not close to a half circle, where rounding may place
+        # the end out of reach of the radius (R arcs are less than half a circle)
+        if radius_param:
+            angle = self.random.uniform(0.1, 0.9) * pi
+        else:
+            angle = self.random.choice([
+                self.random.uniform(0.05, 0.85),
+                self.random.uniform(1.15, 1.9),
+            ]) * pi
+        if arc_class is GCodeArcMoveCW:
+            angle = -angle
+
+        # center
+        direction = self.random.uniform(0, 2 * pi)
+        (i, j) = (round(radius * cos(direction), DECIMALS), round(radius * sin(direction), DECIMALS))
+        (cx, cy) = (x + i, y + j)
+        # end: start rotated about center
+        start_angle = direction + pi
+        end = (
+            round(cx + radius * cos(start_angle + angle), DECIMALS),
+            round(cy + radius * sin(start_angle + angle), DECIMALS),
+        )
+
+        params = {'X': end[0], 'Y': end[1]}
+        if radius_param:
+            params['R'] = radius
+        else:
+            params.update({'I': i, 'J': j})
+        self.pos = (end[0], end[1], z)
+        return (arc_class, params)
+
+    # Line Types (each returns: (<list of gcodes & words>, <comment>))
+    def rapid(self):
+        gcode = GCodeRapidMove(
+            X=self._value(-self.extent, self.extent),
+            Y=self._value(-self.extent, self.extent),
+            Z=self._value(1, 10),
+        )
+        self.pos = (gcode.X, gcode.Y, gcode.Z)
+        return (self._set_motion(gcode), None)
+
+    def _linear_params(self):
+        (x, y, z) = self.pos
+        params = {
+            'X': round(x + self._value(-self.max_step, self.max_step), DECIMALS),
+            'Y': round(y + self._value(-self.max_step, self.max_step), DECIMALS),
+        }
+        if self.random.random() < 0.1:
+            params['Z'] = z = self._value(-5, 0)  # plunge
+        self.pos = (params['X'], params['Y'], z)
+        return params
+
+    def linear(self):
+        return (self._set_motion(GCodeLinearMove(**self._linear_params())), None)
+
+    def arc_r(self):
+        (arc_class, params) = self._arc_params(radius_param=True)
+        return (self._set_motion(arc_class(**params)), None)
+
+    def arc_ijk(self):
+        (arc_class, params) = self._arc_params(radius_param=False)
+        return (self._set_motion(arc_class(**params)), None)
+
+    def _canned_params(self):
+        params = {
+            'X': self._value(-self.extent, self.extent),
+            'Y': self._value(-self.extent, self.extent),
+        }
+        self.pos = (params['X'], params['Y'], self.pos[2])
+        return params
+
+    def canned(self):
+        canned_class = self.random.choice(CANNED_CYCLE_CLASSES)
+        params = self._canned_params()
+        params.update({'Z': self._value(-10, -1), 'R': self._value(1, 3)})
+        if 'Q' in canned_class.param_letters:
+            params['Q'] = self._value(0.5, 2)
+        elif 'P' in canned_class.param_letters and (canned_class is not GCodeDrillingCycle):
+            params['P'] = self._value(0.1, 1)
+        return (self._set_motion(canned_class(**params)), None)
+
+    def modal(self):
+        if self.motion is None:
+            return self.linear()  # no motion mode to continue
+        if issubclass(self.motion, GCodeCannedCycle):
+            params = self._canned_params()  # another hole
+        elif self.motion in (GCodeArcMoveCW, GCodeArcMoveCCW):
+            (arc_class, params) = self._arc_params(
+                radius_param=(self.random.random() < 0.5), arc_class=self.motion,
+            )
+        elif self.motion is GCodeRapidMove:
+            return self.rapid()
+        else:
+            params = self._linear_params()
+        return ([Word(letter, params[letter]) for letter in sorted(params)], None)
+
+    def comment(self):
+        text = ' '.join(self.random.choice(COMMENT_WORDS) for i in range(self.random.randint(1, 4)))
+        comment_class = self.random.choice([CommentBrackets, CommentSemicolon])
+        return ([], comment_class(text))
+
+    def coord_sys(self):
+        return ([self.random.choice(COORD_SYSTEM_CLASSES)()], None)
+
+    def raster(self):
+        (x, y, z) = self.pos
+        if not self.raster_steps:
+            # next row (laser off); back & forth
+            self.raster_row += 1
+            self.raster_steps = RASTER_ROW_STEPS
+            gcode = GCodeRapidMove(
+                X=0. if (self.raster_row % 2) else round(RASTER_STEP * RASTER_ROW_STEPS, DECIMALS),
+                Y=round(RASTER_STEP * self.raster_row, DECIMALS),
+            )
+            self.pos = (gcode.X, gcode.Y, z)
+            return (self._set_motion(gcode) + [GCodeSpindleSpeed(0)], None)
+        self.raster_steps -= 1
+        step = RASTER_STEP if (self.raster_row % 2) else -RASTER_STEP
+        gcode = GCodeLinearMove(X=round(x + step, DECIMALS))
+        self.pos = (gcode.X, y, z)
+        return (self._set_motion(gcode) + [GCodeSpindleSpeed(self.random.randint(1, 1000))], None)
+
+    def extrude(self):
+        (x, y, z) = self.pos
+        (dx, dy) = (self._value(-2, 2), self._value(-2, 2))
+        gcode = GCodeLinearMove(X=round(x + dx, DECIMALS), Y=round(y + dy, DECIMALS))
+        self.extruded = round(self.extruded + (hypot(dx, dy) * EXTRUSION_RATE), DECIMALS)
+        self.pos = (gcode.X, gcode.Y, z)
+        return (self._set_motion(gcode) + [Word('E', self.extruded)], None)
+
+    def layer(self):
+        self.layer_count += 1
+        gcode = GCodeRapidMove(Z=round(LAYER_HEIGHT * self.layer_count, DECIMALS))
+        self.pos = (self.pos[0], self.pos[1], gcode.Z)
+        return (self._set_motion(gcode), CommentSemicolon('LAYER:%i' % self.layer_count))
+
+    def fillet(self):
+        (x, y, z) = self.pos
+        gcode = GCodeArcMoveCCW(X=round(x + 2, DECIMALS), Y=round(y + 2, DECIMALS), R=2.)
+        self.pos = (gcode.X, gcode.Y, z)
+        return (self._set_motion(gcode), None)
+
+    def hole(self):
+        (x, y, z) = self.pos
+        return (self._set_motion(GCodeArcMoveCW(X=x, Y=y, I=1.5, J=0.)), None)
+
+    def helix(self):
+        (x, y, z) = self.pos
+        gcode = GCodeArcMoveCW(X=x, Y=y, Z=round(z - 0.5, DECIMALS), I=3., J=0.)
+        self.pos = (x, y, gcode.Z)
+        return (self._set_motion(gcode), None)
+
+    def zx_arc(self):
+        (x, y, z) = self.pos
+        gcode = GCodeArcMoveCCW(X=round(x + 3, DECIMALS), Z=round(z + 3, DECIMALS), R=3.)
+        self.pos = (gcode.X, y, gcode.Z)
+        self.zx_plane = True
+        return ([GCodeSelectZXPlane()] + self._set_motion(gcode), None)
+
+    def header(self):
+        """First line's content: sets the machine's modes, feed & spindle speed"""
+        return ([
+            GCodeAbsoluteDistanceMode(), GCodeIncrementalArcDistanceMode(),
+            GCodeUseMillimeters(), GCodeSelectXYPlane(), GCodeUnitsPerMinuteMode(),
+            GCodeSelectCoordinateSystem1(), GCodeFeedRate(500), GCodeSpindleSpeed(10000),
+            GCodeStartSpindleCW(),
+        ], CommentBrackets('pygcode synthetic program'))
+
+    def next_line(self):
+        """
+        Generate the next line (chosen at random, as weighted by mix)
+        :return: tuple: (<list of gcodes & words>, <comment>)
+        """
+        index = bisect(self._cumulative_weights, self.random.random() * self._cumulative_weights[-1])
+        zx_plane = self.zx_plane
+        self.zx_plane = False
+        (items, comment) = getattr(self, self._line_types[index])()
+        if zx_plane and not self.zx_plane:
+            items = [GCodeSelectXYPlane()] + items  # back to the XY plane
+        return (items, comment)
+
+    def iter_lines(self, line_count):
+        """
+        Generate program as text
+        :param line_count: number of lines (including the header line)
+        :return: generator of line strings (without line endings)
+        """
+        for i in range(line_count):
+            (items, comment) = self.header() if (i == 0) else self.next_line()
+            line_str = ' '.join(str(x) for x in items)
+            if comment is not None:
+                line_str = ' '.join(s for s in (line_str, str(comment)) if s)
+            yield line_str
+
+
+def generate(line_count, seed=0, mix=None, **kwargs):
+    """
+    Generate a synthetic gcode program (see :class:`ProgramGenerator` for parameters)
+    :param line_count: number of lines
+    :param seed: random seed (the same seed generates the same program)
+    :param mix: dict of each type of line's relative frequency (see :data:`DEFAULT_MIX`)
+    :param profile: name of a mix mimicking a type of CAM output (see :data:`PROFILES`)
+    :return: generator of line strings (without line endings)
+    """
+    return ProgramGenerator(seed=seed, mix=mix, **kwargs).iter_lines(line_count)
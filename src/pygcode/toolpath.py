@@ -0,0 +1,223 @@
+"""
+Toolpath Extraction
+
+Process gcode on a :class:`Machine <pygcode.machine.Machine>`, recording each
+move as a row of columnar ``numpy`` arrays (rather than as
+:class:`Position <pygcode.machine.Position>` instances).
+
+For example::
+
+    from pygcode import iter_lines
+    from pygcode.toolpath import to_arrays
+
+    path = to_arrays(iter_lines('part.gcode'), linearize_arcs=True)
+    lengths = numpy.sqrt(
+        (path['x1'] - path['x0']) ** 2 +
+        (path['y1'] - path['y0']) ** 2 +
+        (path['z1'] - path['z0']) ** 2
+    )
+    cut_length = lengths[path['motion'] != 0].sum()
+
+Whole toolpaths can then be checked at once; for example, against a machine's
+soft limits (in absolute machine coordinates)::
+
+    from pygcode.toolpath import check_limits
+
+    for breach in check_limits(path, {'X': (0, 300), 'Z': (-50, 0)}):
+        print("line %i: %s%g (limit %g)" % tuple(breach))
+
+.. note::
+
+    requires ``numpy`` (an optional dependency: ``pip install pygcode[numpy]``)
+"""
+try:
+    import numpy
+except ImportError:  # optional dependency
+    numpy = None
+
+from .gcodes import MODAL_GROUP_MAP, GCodeRapidMove, GCodeArcMove
+from .gcodes import GCodeAbsoluteDistanceMode, GCodeIncrementalArcDistanceMode
+from .line import Line
+from .machine import Machine
+from .transform import linearize_arc_vertices, DEFAULT_LA_METHOD, DEFAULT_LA_PLANE
+
+
+# Structured array's fields, one row per move
+#   x0, y0, z0  absolute start position
+#   x1, y1, z1  absolute end position
+#   motion      motion gcode's number (eg: 0, 1, 2, 3, 81)
+#   feed        feed rate (NaN for rapid moves, or if undefined)
+#   line_no     line number move was defined on
+TOOLPATH_DTYPE = [
+    ('x0', 'f8'), ('y0', 'f8'), ('z0', 'f8'),
+    ('x1', 'f8'), ('y1', 'f8'), ('z1', 'f8'),
+    ('motion', 'f8'),
+    ('feed', 'f8'),
+    ('line_no', 'i8'),
+]
+
+# check_limits() result's fields, one row per line & breached limit
+#   line_no     line number of breaching move(s)
+#   axis        breached axis (eg: 'X')
+#   value       furthest value the line's move(s) reached beyond the limit
+#   limit       breached limit
+LIMIT_BREACH_DTYPE = [
+    ('line_no', 'i8'),
+    ('axis', 'U1'),
+    ('value', 'f8'),
+    ('limit', 'f8'),
+]
+
+
+def _xyz(position):
+    return position.vector.xyz
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("numpy is required for toolpath arrays: pip install pygcode[numpy]")
+
+
+def iter_moves(lines, machine=None, linearize_arcs=False, max_error=0.01, method_class=None):
+    """
+    Process lines on a machine, yielding each move
+    :param lines: iterable of :class:`Line <pygcode.line.Line>` instances (or str)
+    :param machine: machine to process lines on (default: new :class:`Machine`)
+    :param linearize_arcs: if True, arcs (G2, G3) are yielded as a series of linear moves
+    :param max_error: maximum distance linearized arcs can stray from the original arc
+    :param method_class: method of arc linearization (default: :class:`ArcLinearizeMid <pygcode.transform.ArcLinearizeMid>`)
+    :return: generator of (x0, y0, z0, x1, y1, z1, motion, feed, line_no) tuples
+
+    Only motion gcodes given axis coordinates are considered a move (eg: a
+    ``G1 F100`` line changes the feed rate, but is not a move).
+    """
+    if machine is None:
+        machine = Machine()
+    if method_class is None:
+        method_class = DEFAULT_LA_METHOD
+
+    motion_group = MODAL_GROUP_MAP['motion']
+    nan = float('nan')
+
+    for (i, line) in enumerate(lines):
+        if not isinstance(line, Line):
+            line = Line(line)
+        line_no = line.line_no if (line.line_no is not None) else (i + 1)
+
+        for gcode in machine.block_modal_gcodes(line.block):
+            if gcode.modal_group != motion_group or not gcode.get_param_dict(letters=machine.axes):
+                gcode.process(machine)
+                continue
+
+            motion = gcode.word.value
+            if isinstance(gcode, GCodeRapidMove) or (machine.mode.feed_rate is None):
+                feed = nan
+            else:
+                feed = machine.mode.feed_rate.word.value
+
+            if linearize_arcs and isinstance(gcode, GCodeArcMove):
+                # vertices are given in work coordinates: offset to absolute
+                vertices = linearize_arc_vertices(
+                    arc_gcode=gcode,
+                    start_pos=machine.pos,
+                    plane=(machine.mode.plane_selection or DEFAULT_LA_PLANE()),
+                    method_class=method_class,
+                    dist_mode=(machine.mode.distance or GCodeAbsoluteDistanceMode()),
+                    arc_dist_mode=(machine.mode.arc_ijk_distance or GCodeIncrementalArcDistanceMode()),
+                    max_error=max_error,
+                )
+                vertices += _xyz(machine.work2abs(machine.Position()))
+                start = _xyz(machine.abs_pos)
+                for end in map(tuple, vertices[1:].tolist()):
+                    yield start + end + (motion, feed, line_no)
+                    start = end
+                gcode.process(machine)
+                continue
+
+            start = _xyz(machine.abs_pos)
+            gcode.process(machine)
+            yield start + _xyz(machine.abs_pos) + (motion, feed, line_no)
+
+
+def to_arrays(lines, machine=None, linearize_arcs=False, max_error=0.01, method_class=None):
+    """
+    Process lines on a machine, returning each move as a row of a structured array
+    :param lines: iterable of :class:`Line <pygcode.line.Line>` instances (or str)
+    :param machine: machine to process lines on (default: new :class:`Machine`)
+    :param linearize_arcs: if True, arcs (G2, G3) are returned as a series of linear moves
+    :param max_error: maximum distance linearized arcs can stray from the original arc
+    :param method_class: method of arc linearization (default: :class:`ArcLinearizeMid <pygcode.transform.ArcLinearizeMid>`)
+    :return: :class:`numpy.ndarray` of :data:`TOOLPATH_DTYPE` (``path['x0']`` is a column)
+    """
+    _require_numpy()
+
+    return numpy.array(
+        list(iter_moves(
+            lines, machine=machine, linearize_arcs=linearize_arcs,
+            max_error=max_error, method_class=method_class,
+        )),
+        dtype=TOOLPATH_DTYPE,
+    )
+
+
+def bounds(path):
+    """
+    Bounding box of a toolpath
+    :param path: toolpath array (see :meth:`to_arrays`)
+    :return: tuple: ((<x min>, <y min>, <z min>), (<x max>, <y max>, <z max>)),
+             or None if path has no moves
+    """
+    _require_numpy()
+    if not len(path):
+        return None
+    return (
+        tuple(float(min(path[k + '0'].min(), path[k + '1'].min())) for k in 'xyz'),
+        tuple(float(max(path[k + '0'].max(), path[k + '1'].max())) for k in 'xyz'),
+    )
+
+
+def check_limits(path, soft_limits):
+    """
+    Report every line with moves outside the given axis limits
+    :param path: toolpath array (see :meth:`to_arrays`)
+    :param soft_limits: dict of axis limits, {<axis>: (<min>, <max>), ...}
+                        (eg: ``{'X': (0, 300), 'Z': (-50, None)}``, None for no limit)
+    :return: :class:`numpy.ndarray` of :data:`LIMIT_BREACH_DTYPE`, ordered by line
+             number (empty if all moves are within limits)
+
+    Moves are checked at their end points; a straight move can't pass beyond
+    a limit anywhere else (its start is the previous move's end), so arcs
+    should be linearized (see :meth:`to_arrays`) to be checked along their
+    length.
+    """
+    _require_numpy()
+
+    breaches = []
+    for (axis, (low, high)) in sorted(soft_limits.items()):
+        key = axis.lower()
+        if key not in ('x', 'y', 'z'):
+            raise ValueError("cannot check limits of '%s' axis (only X, Y & Z)" % axis)
+        values = path[key + '1']
+        for (limit, extreme, beyond) in [
+                (low, numpy.minimum, numpy.less),
+                (high, numpy.maximum, numpy.greater)]:
+            if limit is None:
+                continue
+            mask = beyond(values, limit)
+            if not mask.any():
+                continue
+            # furthest value per line (a line may have many moves)
+            line_nos = path['line_no'][mask]
+            order = numpy.argsort(line_nos, kind='stable')
+            (line_nos, first) = numpy.unique(line_nos[order], return_index=True)
+            breach = numpy.empty(len(line_nos), dtype=LIMIT_BREACH_DTYPE)
+            breach['line_no'] = line_nos
+            breach['axis'] = axis.upper()
+            breach['value'] = extreme.reduceat(values[mask][order], first)
+            breach['limit'] = limit
+            breaches.append(breach)
+
+    if not breaches:
+        return numpy.empty(0, dtype=LIMIT_BREACH_DTYPE)
+    result = numpy.concatenate(breaches)
+    return result[numpy.argsort(result['line_no'], kind='stable')]
@@ -1,11 +1,17 @@
+from collections import OrderedDict
 from math import sin, cos, tan, asin, acos, atan2, pi, sqrt, ceil
 
+try:
+    import numpy
+except ImportError:  # optional dependency
+    numpy = None
+
 from .gcodes import GCodeLinearMove, GCodeRapidMove
 from .gcodes import GCodeArcMove, GCodeArcMoveCW, GCodeArcMoveCCW
 from .gcodes import GCodePlaneSelect, GCodeSelectXYPlane, GCodeSelectYZPlane, GCodeSelectZXPlane
 from .gcodes import GCodeAbsoluteDistanceMode, GCodeIncrementalDistanceMode
 from .gcodes import GCodeAbsoluteArcDistanceMode, GCodeIncrementalArcDistanceMode
-from .gcodes import GCodeCannedCycle
+from .gcodes import GCodeCannedCycle, GCodeDwell
 from .gcodes import GCodeDrillingCyclePeck, GCodeDrillingCycleDwell, GCodeDrillingCycleChipBreaking
 from .gcodes import GCodeCannedReturnMode, GCodeCannedCycleReturnPrevLevel, GCodeCannedCycleReturnToR
 from .gcodes import _gcodes_abs2rel
@@ -17,12 +23,67 @@ from .utils import Vector3, Quaternion, plane_projection
 
 # ==================== Arcs (G2,G3) --> Linear Motion (G1) ====================
 
+# Memoized Arc Geometry
+#   an arc's wedge geometry only depends on its radius, max_error, and
+#   angle (per method class); toolpaths tend to repeat the same arcs (eg:
+#   fillets, holes), so derived values & rotation tables are memoized.
+#   Least recently used values are discarded once the memo is full.
+GEOMETRY_MEMO_MAX = 256 * 1024  # maximum number of memoized elements (ie: 2MB of float64)
+
+_geometry_memo = OrderedDict()  # of the form: {(<method class>, <name>, <args>, ...): (<value>, <size>), ... }
+_geometry_memo_size = 0  # total size of memoized values
+
+
+def _memo_size(value):
+    """
+    Number of elements in a memoized value
+    :param value: scalar, numpy array, or tuple of either
+    """
+    if isinstance(value, tuple):
+        return sum(_memo_size(v) for v in value)
+    return getattr(value, 'size', 1)  # (numpy arrays have a size, scalars are 1)
+
+
+def _memoized(key, calculate):
+    """
+    Memoized value for the given key
+    :param key: hashable key
+    :param calculate: function returning value (called if not already memoized)
+    """
+    global _geometry_memo_size
+    item = _geometry_memo.get(key, None)
+    if item is not None:
+        _geometry_memo.move_to_end(key)
+        return item[0]
+
+    value = calculate()
+    size = _memo_size(value)
+    if size <= GEOMETRY_MEMO_MAX:
+        _geometry_memo[key] = (value, size)
+        _geometry_memo_size += size
+        while _geometry_memo_size > GEOMETRY_MEMO_MAX:
+            (old_key, (old_value, old_size)) = _geometry_memo.popitem(last=False)
+            _geometry_memo_size -= old_size
+    return value
+
+
+def clear_geometry_memo():
+    """Discard all memoized arc geometry"""
+    global _geometry_memo_size
+    _geometry_memo.clear()
+    _geometry_memo_size = 0
+
+
 class ArcLinearizeMethod(object):
     # Chord Phase Offest:
     #   False : each line will span an equal portion of the arc
     #   True  : the first & last chord will span 1/2 the angular distance of all other chords
     chord_phase_offset = False
 
+    # Memoize geometry (see _geometry_memo); subclasses calculating geometry
+    # from anything other than radius, max_error & wedge_angle must disable this
+    memoize = True
+
     def __init__(self, max_error, plane_normal,
                  arc_p_start, arc_p_end, arc_p_center,
                  arc_radius, arc_angle, helical_start, helical_end):
@@ -63,11 +124,19 @@ class ArcLinearizeMethod(object):
         # (self.wedge_angle will almost always be < self.max_wedge_angle)
         raise NotImplementedError("not overridden")
 
+    def _memoized(self, name, args, calculate):
+        if not self.memoize:
+            return calculate()
+        return _memoized((self.__class__, name) + args, calculate)
+
     # Properties
     @property
     def max_wedge_angle(self):
         if self._max_wedge_angle is None:
-            self._max_wedge_angle = self.get_max_wedge_angle()
+            self._max_wedge_angle = self._memoized(
+                'max_wedge_angle', (self.arc_radius, self.max_error),
+                self.get_max_wedge_angle,
+            )
         return self._max_wedge_angle
 
     @property
@@ -92,25 +161,25 @@ class ArcLinearizeMethod(object):
     @property
     def inner_radius(self):
         if self._inner_radius is None:
-            self._inner_radius = self.get_inner_radius()
+            self._inner_radius = self._memoized(
+                'inner_radius', (self.arc_radius, self.wedge_angle),
+                self.get_inner_radius,
+            )
         return self._inner_radius
 
     @property
     def outer_radius(self):
         if self._outer_radius is None:
-            self._outer_radius = self.get_outer_radius()
+            self._outer_radius = self._memoized(
+                'outer_radius', (self.arc_radius, self.wedge_angle),
+                self.get_outer_radius,
+            )
         return self._outer_radius
 
-    # Vertex Generator
-    def iter_vertices(self):
-        """Yield absolute (<start vertex>, <end vertex>) for each line for the arc"""
-        start_vertex = self.arc_p_start - self.arc_p_center
-        outer_vertex = start_vertex.normalized() * self.outer_radius
-        d_helical = self.helical_end - self.helical_start
-
-        l_p_start = self.arc_p_center + start_vertex
-        l_start = l_p_start + self.helical_start
-
+    # Rotation Tables
+    def get_angles(self):
+        """Angle of each line's end vertex (excluding the last line, it ends at the circle's end)"""
+        angles = []
         for i in range(self.wedge_count):
             wedge_number = i + 1
             # Current angle
@@ -121,9 +190,44 @@ class ArcLinearizeMethod(object):
                 break  # stop 1 iteration short
                 # alow last arc to simply span across:
                 # <the end of the last line> -> <circle's end point>
+            angles.append(cur_angle)
+        return tuple(angles)
+
+    def get_rotations(self):
+        """Rotation (Quaternion) of the arc's start to each line's end vertex"""
+        axis = -self.plane_normal
+        return tuple(
+            Quaternion.new_rotate_axis(angle=cur_angle, axis=axis)
+            for cur_angle in self.angles
+        )
+
+    def _table_args(self):
+        # rotations are the same for arcs with the same wedges (& plane)
+        return (self.wedge_count, (self.wedge_angle if self.wedge_count else None))
+
+    @property
+    def angles(self):
+        return self._memoized('angles', self._table_args(), self.get_angles)
+
+    @property
+    def rotations(self):
+        return self._memoized(
+            'rotations', self._table_args() + (tuple(self.plane_normal.xyz),),
+            self.get_rotations,
+        )
+
+    # Vertex Generator
+    def iter_vertices(self):
+        """Yield absolute (<start vertex>, <end vertex>) for each line for the arc"""
+        start_vertex = self.arc_p_start - self.arc_p_center
+        outer_vertex = start_vertex.normalized() * self.outer_radius
+        d_helical = self.helical_end - self.helical_start
+
+        l_p_start = self.arc_p_center + start_vertex
+        l_start = l_p_start + self.helical_start
 
+        for (cur_angle, q_end) in zip(self.angles, self.rotations):
             # Next end point as projected on selected plane
-            q_end = Quaternion.new_rotate_axis(angle=cur_angle, axis=-self.plane_normal)
             l_p_end = (q_end * outer_vertex) + self.arc_p_center
             # += helical displacement (difference along plane's normal)
             helical_displacement = self.helical_start + (d_helical * (cur_angle / self.arc_angle))
@@ -137,6 +241,54 @@ class ArcLinearizeMethod(object):
         # Last line always ends at the circle's end
         yield (l_start, self.arc_p_end + self.helical_end)
 
+    def vertices(self):
+        """
+        All vertices of the linearized arc, calculated in one batch with ``numpy``
+        :return: :class:`numpy.ndarray` of shape (<number of lines> + 1, 3);
+                 the arc's start, then the end of each line (same as :meth:`iter_vertices`)
+        """
+        if numpy is None:
+            raise ImportError("numpy is required for vectorized arc linearization: pip install pygcode[numpy]")
+
+        center = numpy.array(self.arc_p_center.xyz)
+        start_vertex = numpy.array((self.arc_p_start - self.arc_p_center).xyz)
+        outer_vertex = numpy.array(((self.arc_p_start - self.arc_p_center).normalized() * self.outer_radius).xyz)
+        helical_start = numpy.array(self.helical_start.xyz)
+        d_helical = numpy.array((self.helical_end - self.helical_start).xyz)
+
+        # Rotate outer_vertex about -plane_normal (Rodrigues' rotation formula)
+        (angles, angle_cos, angle_sin) = self._memoized('angle_arrays', self._table_args(), self.get_angle_arrays)
+        axis = -numpy.array(self.plane_normal.xyz)
+        l_p_end = (
+            (outer_vertex * angle_cos) +
+            (numpy.cross(axis, outer_vertex) * angle_sin) +
+            (axis * axis.dot(outer_vertex) * (1 - angle_cos))
+        ) + center
+
+        vertices = numpy.empty((len(angles) + 2, 3))
+        vertices[0] = center + start_vertex + helical_start
+        vertices[1:-1] = l_p_end + helical_start + (d_helical * (angles / self.arc_angle)[:, None])
+        vertices[-1] = numpy.array((self.arc_p_end + self.helical_end).xyz)
+        return vertices
+
+    def get_angle_arrays(self):
+        """
+        Each line's end angle (see :meth:`get_angles`), with its cosine & sine
+        :return: tuple of (read-only) arrays: (<angles>, <cos(angles)>, <sin(angles)>),
+                 the cosine & sine arrays are columns (shape: (<count>, 1))
+        """
+        angles = numpy.arange(1, self.wedge_count + 1, dtype=float)
+        if len(angles):
+            angles *= self.wedge_angle
+            if self.chord_phase_offset:
+                angles -= self.wedge_angle / 2.
+            else:
+                angles = angles[:-1]  # last line ends at the circle's end
+        arrays = (angles, numpy.cos(angles)[:, None], numpy.sin(angles)[:, None])
+        for array in arrays:
+            array.flags.writeable = False  # shared by memoized arcs
+        return arrays
+
 
 class ArcLinearizeInside(ArcLinearizeMethod):
     """Start and end points of each line are on the original arc"""
@@ -215,23 +367,15 @@ DEFAULT_LA_PLANE = GCodeSelectXYPlane
 DEFAULT_LA_DISTMODE = GCodeAbsoluteDistanceMode
 DEFAULT_LA_ARCDISTMODE = GCodeIncrementalArcDistanceMode
 
-def linearize_arc(arc_gcode, start_pos, plane=None, method_class=None,
-                  dist_mode=None, arc_dist_mode=None,
-                  max_error=0.01, decimal_places=3):
+def _arc_linearize_method(arc_gcode, start_pos, plane=None, method_class=None,
+                          dist_mode=None, arc_dist_mode=None, max_error=0.01):
     """
-    Convert a G2,G3 arc into a series of approsimation G1 codes
-    :param arc_gcode: arc gcode to approximate (GCodeArcMove)
-    :param start_pos: current machine position (Position)
-    :param plane: machine's active plane (GCodePlaneSelect)
-    :param method_class: method of linear approximation (ArcLinearizeMethod)
-    :param dist_mode: machine's distance mode (GCodeAbsoluteDistanceMode or GCodeIncrementalDistanceMode)
-    :param arc_dist_mode: machine's arc distance mode (GCodeAbsoluteArcDistanceMode or GCodeIncrementalArcDistanceMode)
-    :param max_error: maximum distance approximation arcs can stray from original arc (float)
-    :param decimal_places: number of decimal places gocde will be rounded to, used to mitigate risks of accumulated eror when in incremental distance mode (int)
+    Arc's linearization method instance (see :meth:`linearize_arc` for parameters)
+    :return: tuple: (<ArcLinearizeMethod instance>, <arc's start Vector3>)
     """
     # set defaults
     if method_class is None:
-        method_class = DEFAULT_LA_method_class
+        method_class = DEFAULT_LA_METHOD
     if plane is None:
         plane = DEFAULT_LA_PLANE()
     if dist_mode is None:
@@ -305,7 +449,12 @@ def linearize_arc(arc_gcode, start_pos, plane=None, method_class=None,
     # vector from arc_span midpoint -> circle's centre
     radius_mid_vect = arc_span_mid.normalized().cross(plane.normal) * sqrt(arc_radius**2 - abs(arc_span_mid)**2)
 
-    if 'R' in arc_gcode.params:
+    # Full circle (IJK only; R raises above): start & end are the same point
+    full_circle = abs(arc_span) == 0
+
+    if full_circle:
+        pass  # arc_p_center is defined as per IJK params (nothing to adjust)
+    elif 'R' in arc_gcode.params:
         # R: radius magnitude specified
         if isinstance(arc_gcode, GCodeArcMoveCW) == (arc_gcode.R < 0):
             arc_p_center = arc_p_start + arc_span_mid - radius_mid_vect
@@ -331,6 +480,8 @@ def linearize_arc(arc_gcode, start_pos, plane=None, method_class=None,
         arc_angle = (a1 - a2) % (2 * pi)
     else:
         arc_angle = -((a2 - a1) % (2 * pi))
+    if full_circle:
+        arc_angle = 2 * pi if isinstance(arc_gcode, GCodeArcMoveCW) else -2 * pi
 
     # Helical interpolation
     helical_start = plane.normal * arc_start.dot(plane.normal)
@@ -356,18 +507,48 @@ def linearize_arc(arc_gcode, start_pos, plane=None, method_class=None,
         'helical_end': helical_end,
     }
     method = method_class(**method_class_params)
+    return (method, arc_start)
+
 
-    # Iterate & yield each linear line (start, end) vertices
+def linearize_arc(arc_gcode, start_pos, plane=None, method_class=None,
+                  dist_mode=None, arc_dist_mode=None,
+                  max_error=0.01, decimal_places=3, vectorized=False):
+    """
+    Convert a G2,G3 arc into a series of approsimation G1 codes
+    :param arc_gcode: arc gcode to approximate (GCodeArcMove)
+    :param start_pos: current machine position (Position)
+    :param plane: machine's active plane (GCodePlaneSelect)
+    :param method_class: method of linear approximation (ArcLinearizeMethod)
+    :param dist_mode: machine's distance mode (GCodeAbsoluteDistanceMode or GCodeIncrementalDistanceMode)
+    :param arc_dist_mode: machine's arc distance mode (GCodeAbsoluteArcDistanceMode or GCodeIncrementalArcDistanceMode)
+    :param max_error: maximum distance approximation arcs can stray from original arc (float)
+    :param decimal_places: number of decimal places gocde will be rounded to, used to mitigate risks of accumulated eror when in incremental distance mode (int)
+    :param vectorized: if True, vertices are calculated in one batch with ``numpy``
+                       (see :meth:`ArcLinearizeMethod.vertices`), much faster for arcs
+                       linearized into many lines
+    """
+    if dist_mode is None:
+        dist_mode = DEFAULT_LA_DISTMODE()
+    (method, arc_start) = _arc_linearize_method(
+        arc_gcode, start_pos, plane=plane, method_class=method_class,
+        dist_mode=dist_mode, arc_dist_mode=arc_dist_mode, max_error=max_error,
+    )
+
+    if vectorized:
+        vertices = [Vector3(*v) for v in method.vertices().tolist()]
+        line_ends = vertices[1:]
+    else:
+        line_ends = (l_end for (l_start, l_end) in method.iter_vertices())
+
+    # Iterate & yield each linear line's end vertex
     if isinstance(dist_mode, GCodeAbsoluteDistanceMode):
         # Absolute coordinates
-        for line_vertices in method.iter_vertices():
-            (l_start, l_end) = line_vertices
+        for l_end in line_ends:
             yield GCodeLinearMove(**dict(zip('XYZ', l_end.xyz)))
     else:
         # Incremental coordinates (beware cumulative errors)
         cur_pos = arc_start
-        for line_vertices in method.iter_vertices():
-            (l_start, l_end) = line_vertices
+        for l_end in line_ends:
             l_delta = l_end - cur_pos
 
             # round delta coordinates (introduces errors)
@@ -377,6 +558,21 @@ def linearize_arc(arc_gcode, start_pos, plane=None, method_class=None,
             cur_pos += l_delta # mitigate errors by also adding them the accumulated cur_pos
 
 
+def linearize_arc_vertices(arc_gcode, start_pos, plane=None, method_class=None,
+                           dist_mode=None, arc_dist_mode=None, max_error=0.01):
+    """
+    Vertices of a G2,G3 arc's linear approximation, calculated with ``numpy``
+    (see :meth:`linearize_arc` for parameters)
+    :return: :class:`numpy.ndarray` of shape (<number of lines> + 1, 3); the
+             arc's start, then each line's end, in absolute (work) coordinates
+    """
+    (method, arc_start) = _arc_linearize_method(
+        arc_gcode, start_pos, plane=plane, method_class=method_class,
+        dist_mode=dist_mode, arc_dist_mode=arc_dist_mode, max_error=max_error,
+    )
+    return method.vertices()
+
+
 # ==================== Un-Canning ====================
 
 DEFAULT_SCC_PLANE = GCodeSelectXYPlane
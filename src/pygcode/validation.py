@@ -0,0 +1,137 @@
+"""
+Validation
+
+Each :class:`Block <pygcode.block.Block>` is verified as it's parsed; an error
+is raised at the first invalid line. For trusted gcode (eg: the output of a
+known CAM post-processor), verification can be skipped while parsing::
+
+    for line in pygcode.iter_lines('part.gcode', verify=False):
+        ...
+
+and whole files validated separately, in bulk, with :meth:`validate`; which
+reports every violation in a file (rather than stopping at the first), with
+its line number. Large files are split into chunks, validated by a pool of
+worker processes (as they're parsed by :mod:`pygcode.parallel`).
+
+For example::
+
+    from pygcode import validate
+
+    for violation in validate('part.gcode', workers=4):
+        print("line %i: %s" % (violation.line_no, violation.message))
+
+.. note::
+
+    As with parsing, only the content of each line is validated; state &
+    machine specific codes must be processed by a virtual machine to be fully
+    verified.
+"""
+import os
+from collections import namedtuple
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from .exceptions import GCodeBlockFormatError, GCodeParameterError, GCodeWordStrError
+from .line import Line
+from .parallel import chunk_ranges, DEFAULT_CHUNK_SIZE
+from .reader import _iter_line_spans, DEFAULT_ENCODING
+
+# Errors raised while parsing an invalid line
+#   (any other error raised by a line is also reported as a violation,
+#   prefixed with its type)
+PARSE_ERRORS = (GCodeBlockFormatError, GCodeParameterError, GCodeWordStrError, AssertionError)
+
+
+Violation = namedtuple('Violation', ['line_no', 'offset', 'text', 'message'])
+
+
+def iter_violations(raw_lines, encoding=None, **kwargs):
+    """
+    Validate given lines, yielding all violations
+    :param raw_lines: iterable of tuples: (<line number>, <byte offset>, <line text>)
+                      (see :meth:`pygcode.reader.iter_raw_lines`); line text
+                      may be given as bytes
+    :param encoding: encoding of lines given as bytes (default: utf-8)
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>` (eg: xy_decimals)
+    :return: generator of :class:`Violation` instances
+
+    A line (given as bytes) that can't be decoded is a violation; it's
+    validated as decoded with each invalid byte replaced (by U+FFFD).
+    """
+    if encoding is None:
+        encoding = DEFAULT_ENCODING
+
+    for (line_no, offset, text) in raw_lines:
+        if isinstance(text, bytes):
+            try:
+                text = text.decode(encoding)
+            except UnicodeDecodeError as e:
+                text = text.decode(encoding, 'replace')
+                yield Violation(line_no, offset, text, "invalid %s at column %i: %s" % (
+                    e.encoding, e.start + 1, e.reason,
+                ))
+        try:
+            line = Line(text, verify=False, **kwargs)
+            messages = list(line.block._iter_violations())
+        except PARSE_ERRORS as e:
+            messages = [str(e)]
+        except Exception as e:
+            messages = ["%s: %s" % (e.__class__.__name__, e)]
+        for message in messages:
+            yield Violation(line_no, offset, text, message)
+
+
+def validate_chunk(path, start, end, encoding=None, **kwargs):
+    """
+    Validate lines of the given file between the given offsets
+    (the work done by each worker process)
+    :param path: path of gcode file
+    :param start: byte offset of chunk's start (must be the start of a line)
+    :param end: byte offset of chunk's end (must be the end of a line)
+    :param encoding: file's encoding (default: utf-8)
+    :return: tuple: (<number of lines in chunk>, <list of Violations>), with
+             line numbers relative to the chunk's start
+    """
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+
+    # lines are decoded as they're validated (see iter_violations)
+    raw_lines = [
+        (line_no, start + line_start, data[line_start:line_end])
+        for (line_no, (line_start, line_end, next_start)) in enumerate(_iter_line_spans(data), 1)
+    ]
+    violations = list(iter_violations(raw_lines, encoding=encoding, **kwargs))
+    return (len(raw_lines), violations)
+
+
+def validate(path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None, **kwargs):
+    """
+    Validate the given file, reporting all violations
+    :param path: path of gcode file
+    :param workers: number of worker processes (default: number of CPUs);
+                    if 1, the file is validated in this process
+    :param chunk_size: approximate number of bytes validated by a worker at a time
+    :param encoding: file's encoding (default: utf-8)
+    :param kwargs: passed to each :class:`Line <pygcode.line.Line>` (eg: xy_decimals)
+    :return: list of :class:`Violation` instances, in file order (empty if the file is valid)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    ranges = list(chunk_ranges(path, chunk_size=chunk_size))
+    validate_range = partial(validate_chunk, path, encoding=encoding, **kwargs)
+
+    def collect(results):
+        violations = []
+        line_count = 0  # lines in previous chunks
+        for (chunk_line_count, chunk_violations) in results:
+            violations += [v._replace(line_no=v.line_no + line_count) for v in chunk_violations]
+            line_count += chunk_line_count
+        return violations
+
+    if (workers == 1) or (len(ranges) <= 1):
+        return collect(validate_range(start, end) for (start, end) in ranges)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return collect(executor.map(validate_range, *zip(*ranges)))
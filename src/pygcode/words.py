@@ -8,6 +8,21 @@ from .utils import validate_float_precision_input
 
 
 class Word(object):
+    """
+    A single gcode word: a letter, and its value (eg: ``G1``, ``X-1.2``)
+
+    Only the letter & value are stored per instance; everything else
+    (value class, regexes, cleaning function, description) is looked up on the
+    dialect's shared :class:`WordType <pygcode.dialects.utils.WordType>`.
+
+    .. note::
+
+        Code words (eg: ``G1``, ``M3``) yielded by :func:`text2words` are
+        interned (the same instance is shared by every block using it); so
+        their value can't be changed (see :class:`FrozenWord`), a copy can be.
+    """
+    __slots__ = ('letter', '_value', '_type')
+
     def __init__(self, *args, **kwargs):
         # Parameters (listed)
         args_count = len(args)
@@ -24,23 +39,31 @@ class Word(object):
         # Parameters (keyword)
         dialect = kwargs.pop('dialect', dialects.get_default())
 
-        user_input_fp = kwargs.pop('xy_decimals', config.DEFAULT_FLOAT_PRECISION)
-        if validate_float_precision_input(user_input_fp):
-            config.float_precision = user_input_fp
-        else:
+        xy_decimals = kwargs.pop('xy_decimals', config.DEFAULT_FLOAT_PRECISION)
+        if not validate_float_precision_input(xy_decimals):
             raise ValueError(config.fp_exception)
 
         letter = letter.upper()
 
-        self._word_map = getattr(getattr(dialects, dialect), 'WORD_MAP')
-        self.value_class = self._word_map[letter].value_class
-        self.value_regex = self._word_map[letter].value_regex
-        self.alternate_regex = self._word_map[letter].alternate_regex
-        self._value_clean = self._word_map[letter].clean_value
-
+        self._type = getattr(getattr(dialects, dialect), 'WORD_MAP')[letter].with_precision(xy_decimals)
         self.letter = letter
         self.value = value
 
+    @classmethod
+    def _from_token(cls, word_type, letter, value):
+        """
+        Create word from its pre-resolved type (used by :class:`WordTokenizer`)
+        :param word_type: :class:`WordType <pygcode.dialects.utils.WordType>`
+                          for the word's letter
+        :param letter: word's letter (upper case)
+        :param value: value as it was matched in block text
+        """
+        word = cls.__new__(cls)
+        word._type = word_type
+        word.letter = letter
+        word._value = word_type.value_class(value)
+        return word
+
     def __str__(self):
         return "{letter}{value}".format(
             letter=self.letter,
@@ -79,10 +102,38 @@ class Word(object):
     def __hash__(self):
         return hash((self.letter, self.value))
 
+    # Pickling (and copying)
+    #   only (letter, value) are serialized (and precision, if not the default);
+    #   the word's type is resolved from the (default) dialect's WORD_MAP when unpickled
+    def __getstate__(self):
+        precision = self._type.precision
+        if precision is None or precision == config.DEFAULT_FLOAT_PRECISION:
+            return (self.letter, self._value)
+        return (self.letter, self._value, precision)
+
+    def __setstate__(self, state):
+        (self.letter, self._value) = state[:2]
+        self._type = get_tokenizer().word_types[self.letter]
+        if len(state) > 2:
+            self._type = self._type.with_precision(state[2])
+
+    # Word Type Properties
+    @property
+    def value_class(self):
+        return self._type.value_class
+
+    @property
+    def value_regex(self):
+        return self._type.value_regex
+
+    @property
+    def alternate_regex(self):
+        return self._type.alternate_regex
+
     @property
     def value_str(self):
         """Clean string representation, for consistent file output"""
-        return self._value_clean(self.value)
+        return self._type.clean_value(self._value)
 
     # Value Properties
     @property
@@ -94,12 +145,40 @@ class Word(object):
     def value(self, new_value):
         if isinstance(new_value, re.Match):
             new_value = new_value.group()
-        self._value = self.value_class(new_value)
+        self._value = self._type.value_class(new_value)
 
 
     @property
     def description(self):
-        return "%s: %s" % (self.letter, self._word_map[self.letter].description)
+        return "%s: %s" % (self.letter, self._type.description)
+
+
+class FrozenWord(Word):
+    """
+    Word whose value can't be changed, as it's shared; eg: interned code
+    words (shared by every block using them, see :class:`WordTokenizer`),
+    or the words of a machine's modal gcodes (shared with its checkpoints).
+    A copy (eg: ``copy.copy(word)``) is a (mutable) :class:`Word`.
+    """
+    __slots__ = ()
+
+    @Word.value.setter
+    def value(self, new_value):
+        raise AttributeError("%s is shared, so it can't be changed; copy it to change its value" % self)
+
+    def __reduce__(self):
+        # copied & pickled as a Word
+        return (Word.__new__, (Word,), self.__getstate__())
+
+
+def frozen_word(word):
+    """
+    :param word: :class:`Word` instance
+    :return: given word if it's a :class:`FrozenWord`, otherwise a frozen copy of it
+    """
+    if isinstance(word, FrozenWord):
+        return word
+    return FrozenWord._from_token(word._type, word.letter, word._value)
 
 
 def regex_searches(val, cls):
@@ -112,44 +191,250 @@ def regex_searches(val, cls):
     return parsed_value
 
 
-def text2words(block_text, dialect=None, xy_decimals=config.DEFAULT_FLOAT_PRECISION):
+class WordTokenizer(object):
     """
-    Iterate through block text yielding Word instances
-    :param block_text: text for given block with comments removed
+    Compiled word tokenizer for a single dialect.
+
+    All regular expressions are compiled once (see :meth:`get_tokenizer`);
+    block text is walked in a single pass by position, so no part of the
+    given text is copied while searching for words.
+
+    Words with a letter in :attr:`interned_letters` are interned; one
+    instance per distinct code is shared by every block it appears in.
     """
-    if dialect is None:
-        dialect = dialects.get_default()
-        if validate_float_precision_input(xy_decimals):
-            config.float_precision = xy_decimals
-        else:
-            raise ValueError(config.fp_exception)
 
-    word_map = getattr(getattr(dialects, dialect), 'WORD_MAP')
+    # Letters of words to be interned (codes, as opposed to parameters)
+    interned_letters = set('GM')
+    # Maximum number of distinct interned words (per tokenizer)
+    interned_max = 1024
+
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.word_map = getattr(getattr(dialects, dialect), 'WORD_MAP')
+
+        # a single regex scans each word (letter & value) in one pass; with a
+        # branch per distinct value pattern (see WordType.value_pattern):
+        #   ([<letters>])(<value pattern>)?|([<letters>])(<value pattern>)?|...
+        # so the letter's group is followed by its value's group, which is
+        # unmatched (None) if the letter isn't followed by a valid value
+        (self.word_regex, self.value_classes) = self._word_regex(self.word_map)
+        self.remainder_regex = re.compile(r'\S')
+
+        # per letter: WordType (see Word._from_token)
+        self.word_types = dict(self.word_map)
+        # per precision: word types, {<xy_decimals>: {<letter>: WordType, ...}, ...}
+        #   (see get_word_types)
+        self._precision_word_types = {config.DEFAULT_FLOAT_PRECISION: self.word_types}
+        # matched letter: word's letter, eg: {'x': 'X', 'X': 'X', ...}
+        self.letters = {}
+        for letter in self.word_map:
+            for l in (letter.upper(), letter.lower()):
+                self.letters[l] = letter.upper()
+        # letters of words whose value is text (lower case, numeric values are converted)
+        self.decoded_letters = set(
+            letter for (letter, word_type) in self.word_map.items()
+            if word_type.value_class not in (int, float)
+        )
 
-    next_word = re.compile(r'^.*?(?P<letter>[%s])' % ''.join(word_map.keys()), re.IGNORECASE)
+        # Bytes variants (see iter_bytes_words)
+        self.bytes_word_regex = self._bytes_regex(self.word_regex)
+        self.bytes_remainder_regex = re.compile(br'\S')
+        self.bytes_letters = dict(
+            (l.encode('ascii'), letter) for (l, letter) in self.letters.items()
+        )
 
-    index = 0
-    while True:
-        letter_match = next_word.search(block_text[index:])
-        if letter_match:
-            # Letter
-            letter = letter_match.group('letter').upper()
-            index += letter_match.end()  # propogate index to start of value
+        # interned words, of the form: {(<letter>, <value>): Word, ... }
+        self.interned = {}
+
+    def get_word_types(self, xy_decimals=config.DEFAULT_FLOAT_PRECISION):
+        """
+        Word types, with X & Y values cleaned to the given decimal places
+        :param xy_decimals: decimal places used to represent X & Y values
+        :return: dict of the form: {<letter>: WordType, ...}
+        """
+        word_types = self._precision_word_types.get(xy_decimals, None)
+        if word_types is None:
+            if not validate_float_precision_input(xy_decimals):
+                raise ValueError(config.fp_exception)
+            word_types = self._precision_word_types[xy_decimals] = dict(
+                (letter, word_type.with_precision(xy_decimals))
+                for (letter, word_type) in self.word_types.items()
+            )
+        return word_types
+
+    def make_word(self, letter, value, xy_decimals=config.DEFAULT_FLOAT_PRECISION):
+        """
+        Create (or get interned) word from the given letter & value
+        :param letter: word's letter (upper case)
+        :param value: word's value (of the letter's value class), or value text
+        :param xy_decimals: decimal places used to represent X & Y values
+        :return: :class:`Word` instance
+        """
+        word_type = self.get_word_types(xy_decimals)[letter]
+        if letter not in self.interned_letters:
+            return Word._from_token(word_type, letter, value)
+
+        value = word_type.value_class(value)
+        key = (letter, value)
+        word = self.interned.get(key, None)
+        if word is None:
+            if len(self.interned) < self.interned_max:
+                word = self.interned[key] = FrozenWord._from_token(word_type, letter, value)
+            else:
+                word = Word._from_token(word_type, letter, value)
+        return word
+
+    @staticmethod
+    def _word_regex(word_map):
+        """
+        Compile regex scanning a word of the given map in one pass
+        :param word_map: dict of the form: {<letter>: WordType, ...}
+        :return: tuple: (<regex>, <dict of the form: {<value group index>: <value class>, ...}>)
+        """
+        # letters sharing the same value pattern share a branch
+        branches = {}  # {(<value pattern>, <value class>): [<letter>, ...], ...}
+        for (letter, word_type) in sorted(word_map.items()):
+            key = (word_type.value_pattern, word_type.value_class)
+            branches.setdefault(key, []).append(letter)
+
+        patterns = []
+        value_classes = {}
+        for ((value_pattern, value_class), letters) in sorted(branches.items(), key=lambda i: i[1]):
+            patterns.append(r'([%s])(%s)?' % (
+                ''.join(l.upper() + l.lower() for l in letters),
+                value_pattern,
+            ))
+            value_classes[len(patterns) * 2] = value_class
+        return (re.compile('|'.join(patterns)), value_classes)
+
+    @staticmethod
+    def _bytes_regex(regex):
+        """Re-compile given (ASCII) regex to match bytes"""
+        if regex is None:
+            return None
+        return re.compile(regex.pattern.encode('ascii'), regex.flags & ~re.UNICODE)
+
+    def iter_words(self, block_text, xy_decimals=config.DEFAULT_FLOAT_PRECISION):
+        """
+        Iterate through block text yielding Word instances
+        :param block_text: text for given block with comments removed
+        :param xy_decimals: decimal places used to represent X & Y values
+        """
+        word_search = self.word_regex.search
+        value_classes = self.value_classes
+        letters = self.letters
+        decoded_letters = self.decoded_letters
+        word_types = self.get_word_types(xy_decimals)
+        interned_letters = self.interned_letters
+        make_word = self.make_word
+        from_token = Word._from_token
+
+        index = 0
+        while True:
+            word_match = word_search(block_text, index)
+            if word_match is None:
+                break
+
+            # Value's group (or letter's, if value is invalid)
+            group = word_match.lastindex
+            if group not in value_classes:
+                raise GCodeWordStrError("word '%s' value invalid" % letters[word_match.group(group)])
+
+            letter = letters[word_match.group(group - 1)]
+            value = word_match.group(group)
+            if letter in decoded_letters:
+                value = value.lower()
+
+            if letter in interned_letters:
+                yield make_word(letter, value)
+            else:
+                yield from_token(word_types[letter], letter, value)
+
+            index = word_match.end()  # propogate index to end of value
+
+        if self.remainder_regex.search(block_text, index):
+            raise GCodeWordStrError("block code remaining '%s'" % block_text[index:])
+
+    def iter_bytes_words(self, block_bytes, xy_decimals=config.DEFAULT_FLOAT_PRECISION):
+        """
+        Iterate through block content given as ASCII bytes, yielding Word instances
+        :param block_bytes: bytes-like object (eg: bytes, or memoryview) for
+                            given block with comments removed
+        :param xy_decimals: decimal places used to represent X & Y values
+
+        Yields the same words as :meth:`iter_words` would for the decoded
+        text; only each value's bytes are copied, and only non-numeric values
+        are decoded.
+        """
+        word_search = self.bytes_word_regex.search
+        value_classes = self.value_classes
+        letters = self.bytes_letters
+        decoded_letters = self.decoded_letters
+        word_types = self.get_word_types(xy_decimals)
+        interned_letters = self.interned_letters
+        make_word = self.make_word
+        from_token = Word._from_token
+
+        index = 0
+        while True:
+            word_match = word_search(block_bytes, index)
+            if word_match is None:
+                break
+
+            # Value's group (or letter's, if value is invalid)
+            group = word_match.lastindex
+            if group not in value_classes:
+                raise GCodeWordStrError("word '%s' value invalid" % letters[word_match.group(group)])
+
+            letter = letters[word_match.group(group - 1)]
+            value = word_match.group(group)
+            if letter in decoded_letters:
+                value = value.decode('ascii').lower()
+
+            if letter in interned_letters:
+                yield make_word(letter, value)
+            else:
+                yield from_token(word_types[letter], letter, value)
+
+            index = word_match.end()  # propogate index to end of value
+
+        if self.bytes_remainder_regex.search(block_bytes, index):
+            raise GCodeWordStrError("block code remaining '%s'" % (
+                bytes(block_bytes[index:]).decode('ascii', 'replace')
+            ))
+
+
+_tokenizers = {}  # of the form: {<dialect name>: WordTokenizer, ... }
+
+
+def get_tokenizer(dialect=None):
+    """
+    Get compiled tokenizer for the given dialect (created on first request)
+    :param dialect: name of dialect (default if None)
+    :return: :class:`WordTokenizer` instance
+    """
+    if dialect is None:
+        dialect = dialects.get_default()
+    tokenizer = _tokenizers.get(dialect, None)
+    if tokenizer is None:
+        tokenizer = _tokenizers[dialect] = WordTokenizer(dialect)
+    return tokenizer
 
-            # Value
-            value = regex_searches(block_text[index:], word_map[letter])
-            if value is None:
-                raise GCodeWordStrError("word '%s' value invalid" % letter)
 
-            yield Word(letter, value, **{"xy_decimals": xy_decimals})
+def text2words(block_text, dialect=None, xy_decimals=config.DEFAULT_FLOAT_PRECISION):
+    """
+    Iterate through block text yielding Word instances
+    :param block_text: text for given block with comments removed
+    """
+    return get_tokenizer(dialect).iter_words(block_text, xy_decimals=xy_decimals)
 
-            index += value.end()  # propogate index to end of value
-        else:
-            break
 
-    remainder = block_text[index:]
-    if remainder and re.search(r'\S', remainder):
-        raise GCodeWordStrError("block code remaining '%s'" % remainder)
+def bytes2words(block_bytes, dialect=None, xy_decimals=config.DEFAULT_FLOAT_PRECISION):
+    """
+    Iterate through block content given as ASCII bytes, yielding Word instances
+    :param block_bytes: bytes-like object for given block with comments removed
+    """
+    return get_tokenizer(dialect).iter_bytes_words(block_bytes, xy_decimals=xy_decimals)
 
 
 def str2word(word_str):
@@ -0,0 +1,227 @@
+"""
+Writer
+
+Serialize gcode to text, as ``str()`` would, but faster; for writing whole
+(normalized) files.
+
+``str()`` of a :class:`GCode <pygcode.gcodes.GCode>` formats each parameter
+through its word's dialect cleaning function, building format strings per
+value. A :class:`GCodeWriter` resolves each word type's formatting once (per
+letter), caches code words (eg: ``G01``), and writes lines to its file in
+buffered batches.
+
+For example::
+
+    import sys
+    from pygcode import iter_lines
+    from pygcode.writer import GCodeWriter
+
+    with GCodeWriter(sys.stdout) as writer:
+        writer.writelines(iter_lines('part.gcode'))
+
+Text written is identical to that of ``str()``; unless the writer is given a
+precision, in which case X & Y values are written to that many decimal places
+(rather than those each word was parsed with, see ``xy_decimals``).
+"""
+from . import config
+from .block import Block
+from .dialects import linuxcnc
+from .gcodes import GCode
+from .line import Line
+from .utils import validate_float_precision_input
+from .words import Word
+
+
+def _float_formatter(letter, fmt):
+    # formats words as the dialect's cleaning functions do (see linuxcnc.edge_case_clean):
+    # zero values are the only ones cleaned, so they're cleaned in advance
+    zeros = dict(
+        (fmt % v, linuxcnc.edge_case_clean(fmt % v))
+        for v in (0.0, -0.0, -1e-9)  # (-1e-9 is formatted as a negative zero)
+    )
+
+    def format_word(word):
+        value_str = fmt % word._value
+        return letter + zeros.get(value_str, value_str)
+    return format_word
+
+
+def _int_formatter(letter):
+    fmt = letter + "%d"
+
+    def format_word(word):
+        return fmt % word._value
+    return format_word
+
+
+def _code_formatter(letter, clean_value):
+    # code words are reused throughout a file: cached by value
+    cache = {}
+
+    def format_word(word):
+        word_str = cache.get(word._value)
+        if word_str is None:
+            word_str = cache[word._value] = letter + clean_value(word._value)
+        return word_str
+    return format_word
+
+
+def _word_formatter(letter, clean_value):
+    def format_word(word):
+        return "{}{}".format(letter, clean_value(word._value))
+    return format_word
+
+
+class GCodeWriter(object):
+    """Write gcode (lines, blocks, gcodes, words, or text) to a file, one line each"""
+
+    DEFAULT_BUFFER_LINES = 1000
+
+    def __init__(self, fp, precision=None, newline='\n', buffer_lines=DEFAULT_BUFFER_LINES):
+        """
+        :param fp: file-like object (text mode) to write to
+        :param precision: decimal places used to represent X & Y values
+                          (default: each word's own, as ``str()``)
+        :param newline: appended to each line written
+        :param buffer_lines: number of lines buffered before they're written to fp
+        """
+        if (precision is not None) and not validate_float_precision_input(precision):
+            raise ValueError(config.fp_exception)
+
+        self.fp = fp
+        self.precision = precision
+        self.newline = newline
+        self.buffer_lines = buffer_lines
+
+        self._buffer = []
+        # word formatters, precompiled per word type (ie: per letter, and precision)
+        #   {<WordType>: <function(word) returning word's string>, ...}
+        self._word_formatters = {}
+        # GCode classes serialized by GCode.__str__: {<class>: <bool>, ...}
+        self._plain_classes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    # Formatting
+    def _word_formatter(self, word):
+        word_type = word._type
+        (letter, clean_value) = (word.letter, word_type.clean_value)
+        if isinstance(clean_value, linuxcnc.CleanPrecision):
+            precision = clean_value.precision if (self.precision is None) else self.precision
+            formatter = _float_formatter(letter, "%%.%if" % precision)
+        elif clean_value is linuxcnc.CLEAN_FLOAT:
+            formatter = _float_formatter(letter, "%.3f")
+        elif clean_value is linuxcnc.CLEAN_OTHER:
+            formatter = _float_formatter(letter, "%.6f")
+        elif clean_value is linuxcnc.CLEAN_INT:
+            formatter = _int_formatter(letter)
+        elif clean_value is linuxcnc.CLEAN_CODE:
+            formatter = _code_formatter(letter, clean_value)
+        else:
+            formatter = _word_formatter(letter, clean_value)
+        self._word_formatters[word_type] = formatter
+        return formatter
+
+    def format_word(self, word):
+        """
+        :param word: :class:`Word <pygcode.words.Word>` instance
+        :return: word's string (as ``str(word)``)
+        """
+        formatter = self._word_formatters.get(word._type) or self._word_formatter(word)
+        return formatter(word)
+
+    def format_gcode(self, gcode):
+        """
+        :param gcode: :class:`GCode <pygcode.gcodes.GCode>` instance
+        :return: gcode's string (as ``str(gcode)``)
+        """
+        cls = gcode.__class__
+        plain = self._plain_classes.get(cls)
+        if plain is None:
+            plain = self._plain_classes[cls] = (cls.__str__ is GCode.__str__)
+        if not plain:
+            return str(gcode)
+
+        formatters = self._word_formatters
+        word = gcode.word
+        word_str = (formatters.get(word._type) or self._word_formatter(word))(word)
+        if gcode._whitespace_prefix:
+            word_str = ' ' * len(word_str)
+        params = gcode.params
+        if params:
+            param_strs = [word_str]
+            for k in sorted(params):
+                word = params[k]
+                param_strs.append((formatters.get(word._type) or self._word_formatter(word))(word))
+            return ' '.join(param_strs)
+        return word_str
+
+    def format_block(self, block):
+        """
+        :param block: :class:`Block <pygcode.block.Block>` instance
+        :return: block's string (as ``str(block)``)
+        """
+        return ' '.join(
+            [self.format_gcode(g) for g in block.gcodes] +
+            [self.format_word(w) for w in block.modal_params]
+        )
+
+    def format_line(self, line):
+        """
+        :param line: :class:`Line <pygcode.line.Line>` instance
+        :return: line's string (as ``str(line)``)
+        """
+        parts = []
+        block = line.block
+        if block:
+            parts.append(self.format_block(block))
+        if line.comment:
+            parts.append(str(line.comment))
+        if line.macro:
+            parts.append(str(line.macro))
+        return ' '.join(parts)
+
+    def format(self, obj):
+        """
+        :param obj: :class:`Line <pygcode.line.Line>`, :class:`Block <pygcode.block.Block>`,
+                    :class:`GCode <pygcode.gcodes.GCode>`, or :class:`Word <pygcode.words.Word>`
+                    instance (anything else is given by ``str(obj)``)
+        :return: obj's string
+        """
+        if isinstance(obj, Line):
+            return self.format_line(obj)
+        elif isinstance(obj, Block):
+            return self.format_block(obj)
+        elif isinstance(obj, GCode):
+            return self.format_gcode(obj)
+        elif isinstance(obj, Word):
+            return self.format_word(obj)
+        return str(obj)
+
+    # Writing
+    def write(self, obj):
+        """
+        Write obj as a line
+        :param obj: object to write (see :meth:`format`); a str is written as-is
+        """
+        self._buffer.append(self.format(obj) + self.newline)
+        if len(self._buffer) >= self.buffer_lines:
+            self.flush()
+
+    def writelines(self, objs):
+        """
+        Write each obj as a line
+        :param objs: iterable of objects to write (see :meth:`write`)
+        """
+        for obj in objs:
+            self.write(obj)
+
+    def flush(self):
+        """Write buffered lines to file"""
+        if self._buffer:
+            self.fp.writelines(self._buffer)
+            self._buffer = []
@@ -0,0 +1,87 @@
+import unittest
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path
+add_pygcode_to_path()
+
+# Units under test
+from pygcode import cache
+from pygcode.line import Line
+from pygcode.block import Block
+
+
+class ParseCacheTests(unittest.TestCase):
+    def test_lru(self):
+        c = cache.ParseCache(maxsize=2)
+        c.put('a', 1)
+        c.put('b', 2)
+        self.assertEqual(c.get('a'), 1)  # 'a' most recently used
+        c.put('c', 3)  # 'b' discarded
+        self.assertIsNone(c.get('b'))
+        self.assertEqual(c.get('c'), 3)
+        self.assertEqual(c.info(), cache.CacheInfo(hits=2, misses=1, maxsize=2, currsize=2))
+        c.clear()
+        self.assertEqual(c.info(), cache.CacheInfo(hits=0, misses=0, maxsize=2, currsize=0))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            cache.ParseCache(maxsize=0)
+
+
+class CachedParseTests(unittest.TestCase):
+    def setUp(self):
+        cache.enable_cache(maxsize=16)
+
+    def tearDown(self):
+        cache.disable_cache()
+
+    def test_disabled(self):
+        cache.disable_cache()
+        Line('G0 Z5')
+        self.assertIsNone(cache.cache_info())
+
+    def test_line(self):
+        text = 'N10 G1 X1.5 Y2 F300 M3 S1000 (cut)'
+        line1 = Line(text)
+        line2 = Line(text)
+        self.assertEqual(cache.cache_info()[:2], (1, 1))  # (hits, misses)
+        self.assertEqual(str(line2), str(line1))
+        self.assertEqual(line2.comment.text, 'cut')
+        self.assertEqual(line2.block.gcodes, line1.block.gcodes)
+        self.assertEqual(line2.block.modal_params, line1.block.modal_params)
+
+    def test_line_copies(self):
+        line1 = Line('G1 X1 Y2')
+        line2 = Line('G1 X1 Y2')
+        self.assertIsNot(line2.block, line1.block)
+        self.assertIsNot(line2.block.gcodes[0], line1.block.gcodes[0])
+        # modifying one line's gcode has no effect on another's
+        line2.block.gcodes[0].X = 10
+        self.assertEqual(str(line1), 'G01 X1.000 Y2.000')
+        self.assertEqual(str(Line('G1 X1 Y2')), 'G01 X1.000 Y2.000')
+
+    def test_line_xy_decimals(self):
+        Line('G1 X1.123456', xy_decimals=3)
+        line = Line('G1 X1.123456', xy_decimals=5)
+        self.assertEqual(cache.cache_info().hits, 0)
+        self.assertEqual(line.block.X.value_str, '1.12346')
+
+    def test_block(self):
+        block1 = Block('G0 Z5')
+        block2 = Block('G0 Z5')
+        self.assertEqual(cache.cache_info()[:2], (1, 1))
+        self.assertEqual(block2.gcodes, block1.gcodes)
+        self.assertEqual(block2.text, block1.text)
+
+    def test_block_invalid(self):
+        # invalid blocks raise on every construction (never cached)
+        for i in range(2):
+            with self.assertRaises(AssertionError):
+                Block('G0 G1 X1')
+        self.assertEqual(len(cache.parse_cache), 0)
+
+    def test_lru_eviction(self):
+        cache.enable_cache(maxsize=2)
+        for text in ['G0 Z5', 'M5', 'G0 Z5', 'G1 X1']:
+            Line(text)
+        self.assertEqual(cache.cache_info(), cache.CacheInfo(hits=1, misses=3, maxsize=2, currsize=2))
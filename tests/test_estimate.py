@@ -0,0 +1,109 @@
+import unittest
+from math import pi, sqrt
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path, str_lines
+add_pygcode_to_path()
+
+# Units under test
+from pygcode.estimate import Estimator, Estimate, estimate
+from pygcode.testing import generate
+
+
+class EstimateTests(unittest.TestCase):
+    def test_linear(self):
+        result = estimate(['G21 G90 F600', 'G1 X30 Y40', 'G0 X0 Y0'], max_velocity=6000)
+        self.assertEqual(result.moves, 2)
+        self.assertAlmostEqual(result.feed_distance, 50)
+        self.assertAlmostEqual(result.rapid_distance, 50)
+        self.assertAlmostEqual(result.feed_time, 5)  # 600mm/min
+        self.assertAlmostEqual(result.rapid_time, 0.4)  # 6000mm/min on X; 4800mm/min on Y
+        self.assertAlmostEqual(result.time, 5.4)
+        self.assertAlmostEqual(result.distance, 100)
+
+    def test_axis_limits(self):
+        limits = {'X': 6000, 'Y': 6000, 'Z': 600}
+        result = estimate(['G0 Z10'], max_velocity=limits)
+        self.assertAlmostEqual(result.rapid_time, 1)
+        result = estimate(['G0 X10 Z10'], max_velocity=limits)
+        self.assertAlmostEqual(result.rapid_time, 1)  # limited by Z
+        result = estimate(['G1 X10 F12000'], max_velocity=limits)
+        self.assertAlmostEqual(result.feed_time, 0.1)  # feed rate limited by X
+        with self.assertRaises(ValueError):
+            Estimator(max_velocity={'X': 6000, 'Y': 6000})  # no Z
+        with self.assertRaises(ValueError):
+            Estimator(acceleration=0)
+
+    def test_arcs(self):
+        for (plane, arc) in [
+                ('G17', 'G2 X10 Y0 I5 J0'), ('G18', 'G2 X10 Z0 I5 K0'), ('G19', 'G2 Y10 Z0 J5 K0'),
+                ('G17', 'G3 X10 Y0 R5')]:
+            result = estimate([plane + ' F600', arc])
+            self.assertAlmostEqual(result.feed_distance, 5 * pi, msg=arc)
+        for plane in ['G17', 'G18', 'G19']:
+            # three quarters of a circle, in each plane
+            arc = {'G17': 'G3 X5 Y5 I5 J0', 'G18': 'G3 Z5 X5 K5 I0', 'G19': 'G3 Y5 Z5 J5 K0'}[plane]
+            result = estimate([plane + ' F600', arc])
+            self.assertAlmostEqual(result.feed_distance, 7.5 * pi, msg=arc)
+        # helix
+        result = estimate(['G17 F600', 'G2 X10 Y0 Z3 I5 J0'])
+        self.assertAlmostEqual(result.feed_distance, sqrt((5 * pi) ** 2 + 3 ** 2))
+
+    def test_feed_rate_modes(self):
+        result = estimate(['G93 G1 X10 F2'])
+        self.assertAlmostEqual(result.feed_time, 30)  # 1/2 a minute
+        result = estimate(['G95 S1000 G1 X10 F0.1'])
+        self.assertAlmostEqual(result.feed_time, 6)  # 100mm/min
+        result = estimate(['G1 X10 F0', 'G1 X20 F600'])
+        self.assertEqual(result.unfed_moves, 1)
+        self.assertAlmostEqual(result.feed_distance, 20)
+        self.assertAlmostEqual(result.feed_time, 1)
+
+    def test_dwell(self):
+        result = estimate(['G1 X10 F600', 'G4 P2.5'])
+        self.assertAlmostEqual(result.dwell_time, 2.5)
+        self.assertAlmostEqual(result.time, 3.5)
+
+    def test_canned_cycle(self):
+        result = estimate(['G90 G17 G0 Z5', 'G81 X10 Z-2 R1 F600', 'X20', 'G80'])
+        self.assertEqual(result.moves, 1 + (5 * 2))
+        self.assertAlmostEqual(result.feed_distance, 3 * 2)  # R -> Z
+        self.assertAlmostEqual(result.rapid_distance, 5 + (10 + 4 + 3 + 4) * 2)
+
+    def test_acceleration(self):
+        # accelerate to 10mm/s over 0.5mm, then decelerate
+        result = estimate(['G1 X100 F600'], acceleration=100)
+        self.assertAlmostEqual(result.feed_time, 0.1 + 9.9 + 0.1)
+        # a collinear junction doesn't slow down
+        result = estimate(['G1 X50 F600', 'X100'], acceleration=100)
+        self.assertAlmostEqual(result.feed_time, 0.1 + 9.9 + 0.1)
+        # too short to reach feed rate
+        result = estimate(['G1 X0.5 F600'], acceleration=100)
+        self.assertAlmostEqual(result.feed_time, 2 * sqrt(0.25 / 50))
+        # corners are slower with a smaller junction deviation, stopping for a reversal
+        program = ['G1 X10 F600', 'Y10', 'X0', 'X10']
+        times = [
+            estimate(program, acceleration=100, junction_deviation=jd).feed_time
+            for jd in (1., 0.01, 0.0001)
+        ]
+        self.assertLess(times[0], times[1])
+        self.assertLess(times[1], times[2])
+        stopped = 4 * estimate(['G1 X10 F600'], acceleration=100).feed_time
+        self.assertLess(times[2], stopped)
+        self.assertLess(estimate(program).feed_time, times[0])
+
+    def test_streaming(self):
+        # results so far don't affect the final result
+        lines = list(generate(500, seed=1))
+        expected = estimate(lines, acceleration=200)
+        estimator = Estimator(acceleration=200, lookahead=4)
+        for (i, line_str) in enumerate(lines):
+            estimator.run([line_str])
+            if i % 50 == 0:
+                self.assertIsInstance(estimator.result(), Estimate)
+            self.assertLessEqual(len(estimator._planned), 4)
+        result = estimator.result()
+        self.assertEqual(result.moves, expected.moves)
+        self.assertAlmostEqual(result.distance, expected.distance)
+        # less lookahead is never faster
+        self.assertGreaterEqual(result.time, expected.time - 1e-6)
@@ -2,7 +2,9 @@ import sys
 import os
 import inspect
 import re
+import glob
 import unittest
+from collections import defaultdict
 
 # Add relative pygcode_mod to path
 from testutils import add_pygcode_to_path, str_lines
@@ -12,8 +14,13 @@ add_pygcode_to_path()
 from pygcode import gcodes
 from pygcode import words
 from pygcode import machine
+from pygcode.comment import split_line
 
-from pygcode.exceptions import GCodeWordStrError
+from pygcode.exceptions import GCodeWordStrError, GCodeParameterError
+
+# Local paths
+_this_path = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+_test_files_dir = os.path.join(_this_path, 'test-files')
 
 class GCodeWordMappingTests(unittest.TestCase):
     def test_word_map_integrity(self):
@@ -28,6 +35,43 @@ class GCodeWordMappingTests(unittest.TestCase):
                     "conflict with %s and %s" % (fn_class, key_class)
                 )
 
+    def test_dispatch(self):
+        for (word_str, expected_class) in [
+                ('G1', gcodes.GCodeLinearMove),
+                ('G38.2', gcodes.GCodeStraightProbe),
+                ('G38.5', gcodes.GCodeStraightProbe),
+                ('G28', gcodes.GCodeGotoPredefinedPosition),
+                ('G30.1', gcodes.GCodeSetPredefinedPosition),
+                ('G92.2', gcodes.GCodeResetCoordSystemOffset),
+                ('F300', gcodes.GCodeFeedRate),
+                ('S1000', gcodes.GCodeSpindleSpeed),
+                ('T01', gcodes.GCodeSelectTool),
+                ('N100', gcodes.GCodeLineNumber),
+                ('O1', gcodes.GCodeProgramName),
+                ('G38.6', None),
+                ('G29', None),
+                ('X1', None),
+            ]:
+            word = words.str2word(word_str)
+            self.assertIs(gcodes.word_gcode_class(word), expected_class, word_str)
+
+    def test_dispatch_function_list(self):
+        # classes defining word_matches (rather than word_values, etc) are
+        # still matched
+        class GCodeUserTest(gcodes.GCodeUserDefined):
+            @classmethod
+            def word_matches(cls, w):
+                return (w.letter == 'M') and (101 <= w.value <= 199)
+        try:
+            gcodes.build_maps()
+            self.assertIs(gcodes.word_gcode_class(words.Word('M', 150)), GCodeUserTest)
+            self.assertIs(gcodes.word_gcode_class(words.Word('M', 3)), gcodes.GCodeStartSpindleCW)
+        finally:
+            del GCodeUserTest
+            import gc
+            gc.collect()
+            gcodes.build_maps()
+
 class GCodeModalGroupTests(unittest.TestCase):
     def test_modal_groups(self):
         # Modal groups taken (and slightly modified) from LinuxCNC documentation:
@@ -104,6 +148,79 @@ class Words2GCodesTests(unittest.TestCase):
         #   F1500
         self.assertEqual(gcode_list[1].word, words.Word('F', 1500))
 
+    @staticmethod
+    def legacy_words2gcodes(words):
+        # words2gcodes prior to being re-written as a single pass
+        #   (rescans all following words for each gcode candidate)
+        word_info_list = [
+            {
+                'index': i,
+                'word': word,
+                'gcode_class': gcodes.word_gcode_class(word),
+                'param_to_index': None,
+            }
+            for (i, word) in enumerate(words)
+        ]
+        for word_info in word_info_list:
+            if word_info['gcode_class'] is None:
+                continue
+            for param_info in word_info_list[word_info['index'] + 1:]:
+                if param_info['word'].letter in word_info['gcode_class'].param_letters:
+                    param_info['param_to_index'] = word_info['index']
+                    param_info['gcode_class'] = None
+        parameter_map = defaultdict(list)
+        for word_info in word_info_list:
+            if word_info['gcode_class']:
+                continue
+            parameter_map[word_info['param_to_index']].append(word_info['word'])
+        gcode_list = []
+        for word_info in word_info_list:
+            if word_info['gcode_class'] is None:
+                continue
+            gcode_list.append(word_info['gcode_class'](
+                word_info['word'],
+                *parameter_map[word_info['index']]
+            ))
+        return (gcode_list, parameter_map[None])
+
+    def assertSameGrouping(self, word_list):
+        try:
+            expected = self.legacy_words2gcodes(word_list)
+        except GCodeParameterError:
+            with self.assertRaises(GCodeParameterError):
+                gcodes.words2gcodes(word_list)
+            return
+        (gcode_list, unused_words) = gcodes.words2gcodes(word_list)
+        self.assertEqual(
+            [(g.__class__, g.word, g.params) for g in gcode_list],
+            [(g.__class__, g.word, g.params) for g in expected[0]],
+            "%r" % word_list,
+        )
+        self.assertEqual(unused_words, expected[1])
+
+    def test_legacy_precedence(self):
+        for line in [
+                'G1 X1 Y2 F100', 'X1 Y2', 'M3 S2000', 'S2000 M3', 'M6 T1',
+                'G0 X1 G1 Y2',  # Y is a parameter of the most recent G1
+                'G10 L2 P1 X1 G1 Y2 F3',  # X: G10 parameter, Y: G1 parameter
+                'G4 P1 G10 L2 P2',  # duplicate P parameter
+                'G1 G2 X1', 'N10 G90 G1 X1 Z2 M3 S100 T2 F3',
+                'G38.2 Z-1 F10', 'G28 G91 Z0', 'G92.1', 'M66 P0 L3 Q5',
+                ]:
+            self.assertSameGrouping(list(words.text2words(line)))
+
+    def test_legacy_corpus(self):
+        # identical grouping for every line in the test corpus
+        for filename in sorted(glob.glob(os.path.join(_test_files_dir, '*', '*.*'))):
+            with open(filename, 'r') as fh:
+                for line_str in fh:
+                    (block_str, comment) = split_line(line_str.split('%')[0])
+                    try:
+                        word_list = list(words.text2words(block_str))
+                    except GCodeWordStrError:
+                        continue
+                    self.assertSameGrouping(word_list)
+
 
 class Text2GCodesTests(unittest.TestCase):
     def test_basic(self):
@@ -0,0 +1,103 @@
+import os
+import shutil
+import inspect
+import tempfile
+import unittest
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path
+add_pygcode_to_path()
+
+# Units under test
+from pygcode import index
+from pygcode.machine import Machine
+from pygcode.reader import iter_lines
+
+# Local paths
+_this_path = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+_test_files_dir = os.path.join(_this_path, 'test-files')
+
+
+class IndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'part.tap')
+        shutil.copy(os.path.join(_test_files_dir, 'linuxcnc', 'Star Trek.tap'), self.filename)
+        self.lines = list(iter_lines(self.filename))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def replay(self, line_no):
+        m = Machine()
+        for line in self.lines[:line_no - 1]:
+            m.process_block(line.block)
+        return m
+
+    def assert_same_state(self, m1, m2):
+        self.assertEqual(m1.pos, m2.pos)
+        self.assertEqual(str(m1.mode), str(m2.mode))
+        self.assertEqual(m1.abs_range_min, m2.abs_range_min)
+        self.assertEqual(m1.abs_range_max, m2.abs_range_max)
+
+    def test_build(self):
+        idx = index.build_index(self.filename, interval=50)
+        self.assertEqual(len(idx), (len(self.lines) + 49) // 50)
+        self.assertEqual([e[0] for e in idx.entries[:3]], [1, 51, 101])
+        for (line_no, offset, checkpoint) in idx.entries:
+            self.assertEqual(offset, self.lines[line_no - 1].offset)
+        self.assertEqual(idx.nearest(50)[0], 1)
+        self.assertEqual(idx.nearest(51)[0], 51)
+
+    def test_seek(self):
+        idx = index.build_index(self.filename, interval=50)
+        for line_no in [1, 2, 50, 51, 52, 130, len(self.lines)]:
+            (m, lines) = index.seek(self.filename, line_no, index=idx)
+            self.assert_same_state(m, self.replay(line_no))
+            lines = list(lines)
+            self.assertEqual(len(lines), len(self.lines) - line_no + 1)
+            self.assertEqual(
+                [(l.line_no, l.offset, str(l)) for l in lines[:3]],
+                [(l.line_no, l.offset, str(l)) for l in self.lines[line_no - 1:line_no + 2]],
+            )
+
+    def test_sidecar(self):
+        idx = index.load_index(self.filename, interval=100)
+        self.assertTrue(os.path.exists(index.index_path(self.filename)))
+        loaded = index.load_index(self.filename, rebuild=False)
+        self.assertEqual(loaded.interval, 100)
+        self.assertEqual(len(loaded), len(idx))
+        (m, lines) = index.seek(self.filename, 150)  # loads sidecar
+        self.assert_same_state(m, self.replay(150))
+
+    def test_sidecar_positions(self):
+        # positions restored from a loaded index are the machine's Position type
+        index.load_index(self.filename, interval=100)
+        (m, lines) = index.seek(self.filename, 101)  # (no lines replayed)
+        for pos in [m.abs_pos, m.abs_range_min, m.abs_range_max, m.pos]:
+            self.assertIs(type(pos), m.Position)
+        self.assert_same_state(m, self.replay(101))
+
+    def test_processing(self):
+        # lines are processed the same way when building & seeking
+        class CountingMachine(Machine):
+            blocks = 0
+            def process_block(self, block):
+                self.blocks += 1
+                super(CountingMachine, self).process_block(block)
+
+        m = CountingMachine()
+        idx = index.build_index(self.filename, interval=50, machine=m)
+        self.assertEqual(m.blocks, len(self.lines))
+        m = CountingMachine()
+        index.seek(self.filename, 130, machine=m, index=idx)
+        self.assertEqual(m.blocks, 130 - 101)
+
+    def test_sidecar_out_of_date(self):
+        index.load_index(self.filename)
+        with open(self.filename, 'a') as fh:
+            fh.write('G0 X0 Y0\n')
+        with self.assertRaises(ValueError):
+            index.load_index(self.filename, rebuild=False)
+        idx = index.load_index(self.filename)  # rebuilt
+        self.assertTrue(idx.is_current(self.filename))
@@ -49,3 +49,98 @@ class LineCommentTests(unittest.TestCase):
         line = Line('G02 X10.75 Y2 ; abc %something%')
         self.assertEqual(line.comment.text.strip(), 'abc')
         self.assertEqual(line.macro, '%something%')
+
+
+class LineFromBytesTests(unittest.TestCase):
+    def assert_same_line(self, text):
+        line = Line(text)
+        data = text.encode('utf-8')
+        for line_bytes in (data, memoryview(data)):
+            bytes_line = Line.from_bytes(line_bytes, line_no=3, offset=10)
+            self.assertEqual(str(bytes_line), str(line))
+            self.assertEqual(bytes_line.block.words, line.block.words)
+            self.assertEqual(bytes_line.block.gcodes, line.block.gcodes)
+            self.assertEqual(bytes_line.macro, line.macro)
+            self.assertEqual((bytes_line.line_no, bytes_line.offset), (3, 10))
+            if line.comment is None:
+                self.assertIsNone(bytes_line.comment)
+            else:
+                self.assertEqual(bytes_line.comment.__class__, line.comment.__class__)
+                self.assertEqual(bytes_line.comment.text, line.comment.text)
+
+    def test_lines(self):
+        for text in [
+                '',
+                '   ',
+                'G02 X10.75 Y47.44 I-0.11 J-1.26 F70 ; blah blah',
+                'G02 X10.75 (x coord) Y47.44 (y coord) I-0.11 J-1.26 F70 (eol)',
+                '(comment only)',
+                '%',
+                'G02 X10.75 Y2 ; abc %something%',
+                'G1  X1\tY2   ',
+                u'G0 Z5 (caf\u00e9)',  # non-ascii comment
+                ]:
+            self.assert_same_line(text)
+
+    def test_text(self):
+        line = Line.from_bytes(b'g1 x1 (cut)')
+        self.assertEqual(line.text, 'G01 X1.000 (cut)')  # original text is not retained
+
+
+class LazyLineTests(unittest.TestCase):
+    lines = [
+        '',
+        'G02 X10.75 Y47.44 I-0.11 J-1.26 F70 ; blah blah',
+        'G02 X10.75 (x coord) Y47.44 (y coord) I-0.11 J-1.26 F70 (eol)',
+        '(comment only)',
+        'G02 X10.75 Y2 ; abc %something%',
+        'G1  X1\tY2   ',
+    ]
+
+    def assert_same_line(self, lazy_line, line):
+        self.assertEqual(lazy_line.block.words, line.block.words)
+        self.assertEqual(lazy_line.block.gcodes, line.block.gcodes)
+        self.assertEqual(lazy_line.block.modal_params, line.block.modal_params)
+        self.assertEqual(lazy_line.macro, line.macro)
+        self.assertEqual(str(lazy_line.comment), str(line.comment))
+        self.assertEqual(str(lazy_line), str(line))
+
+    def test_same(self):
+        for text in self.lines:
+            self.assert_same_line(Line(text, lazy=True), Line(text))
+            self.assertEqual(Line(text, lazy=True).block.text, Line(text).block.text)
+            data = text.encode('utf-8')
+            self.assert_same_line(Line.from_bytes(memoryview(data), lazy=True), Line(text))
+
+    def test_deferred(self):
+        line = Line('G1 X1 Y2 (cut)', lazy=True, line_no=3)
+        self.assertEqual((line.text, line.line_no), ('G1 X1 Y2 (cut)', 3))
+        self.assertNotIn('block', line.__dict__)
+        self.assertEqual(line.comment.text, 'cut')
+        self.assertNotIn('words', line.block.__dict__)  # still deferred
+        self.assertEqual(line.block.X.value, 1)
+        self.assertIn('words', line.block.__dict__)
+
+        line = Line.from_bytes(b'G1 X1 (cut)', lazy=True)
+        self.assertEqual(line.text, 'G1 X1 (cut)')  # lazy lines retain their text
+        self.assertNotIn('block', line.__dict__)
+
+    def test_deferred_bytes_text(self):
+        # a lazy line's text is the same before & after it's parsed
+        text = u'g1  x1 (caf\u00e9)'
+        line = Line.from_bytes(text.encode('utf-8'), lazy=True)
+        self.assertEqual(line.text, text)
+        self.assertEqual(line.comment.text, u'caf\u00e9')
+        self.assertEqual(line.text, text)
+        self.assertNotEqual(str(line), text)
+
+    def test_errors(self):
+        line = Line('G1 X1 G2 X2', lazy=True)  # (same modal group)
+        with self.assertRaises(AssertionError):
+            line.block.gcodes
+
+    def test_unknown_attribute(self):
+        line = Line('G1 X1', lazy=True)
+        with self.assertRaises(AttributeError):
+            line.something
+        self.assertIsNotNone(line.block)
@@ -1,4 +1,5 @@
 import unittest
+from copy import copy
 
 # Add relative pygcode_mod to path
 from testutils import add_pygcode_to_path, str_lines
@@ -6,12 +7,14 @@ add_pygcode_to_path()
 
 # Units under test
 from pygcode.machine import Position, Machine
+from pygcode.machine import UNIT_METRIC, UNIT_IMPERIAL
 from pygcode.line import Line
-from pygcode.exceptions import MachineInvalidAxis
+from pygcode.exceptions import MachineInvalidAxis, MachineInvalidState, GCodeParameterError
 from pygcode.gcodes import (
     GCodeAbsoluteDistanceMode, GCodeIncrementalDistanceMode,
     GCodeAbsoluteArcDistanceMode, GCodeIncrementalArcDistanceMode,
     GCodeCannedCycleReturnPrevLevel, GCodeCannedCycleReturnToR,
+    GCode, GCodeLinearMove, GCodeArcMoveCW,
 )
 
 
@@ -36,6 +39,16 @@ class PositionTests(unittest.TestCase):
             setattr(p, axis, 0)
             self.assertEqual(getattr(p, axis), 0)
 
+    def test_undefined_axes(self):
+        # coordinates may only be given for the position's axes
+        for kwargs in [{'A': 5}, {'X': 1, 'B': 2}, {'Q': 1}]:
+            with self.assertRaises(MachineInvalidAxis):
+                Position(axes='XYZ', **kwargs)
+        p = Position(axes='XYZ', X=1)
+        with self.assertRaises(MachineInvalidAxis):
+            p.A = 5
+        self.assertEqual(p, Position(axes='XYZ', X=1))
+
     # Equality
     def test_equality(self):
         p1 = Position(axes='XYZ', X=1, Y=2)
@@ -85,6 +98,43 @@ class PositionTests(unittest.TestCase):
         p = Position(axes='XYZ', X=2, Y=10)
         self.assertEqual(p / 2, Position(axes='XYZ', X=1, Y=5))
 
+    def test_arithmetic_inplace(self):
+        p1 = Position(axes='XYZ', X=1, Y=2)
+        p2 = p1
+        p1 += Position(axes='XYZ', Y=10, Z=-20)
+        self.assertIs(p1, p2)  # modified in place
+        self.assertEqual(p1, Position(axes='XYZ', X=1, Y=12, Z=-20))
+        p1 -= Position(axes='XYZ', X=1)
+        self.assertEqual(p1, Position(axes='XYZ', Y=12, Z=-20))
+        with self.assertRaises(MachineInvalidAxis):
+            p1 += Position(axes='XYZA')
+
+    # Storage
+    def test_slots(self):
+        p = Position(axes='XYZ', X=1)
+        self.assertFalse(hasattr(p, '__dict__'))
+        with self.assertRaises(AttributeError):
+            p.A  # undefined axis
+        with self.assertRaises(MachineInvalidAxis):
+            p.A = 1
+        self.assertEqual(p.values, {'X': 1, 'Y': 0, 'Z': 0})
+
+    def test_copy(self):
+        p1 = Position(axes='XYZ', X=1)
+        p2 = copy(p1)
+        p2.X = 2
+        self.assertEqual((p1.X, p2.X), (1, 2))
+        self.assertEqual(p2.axes, p1.axes)
+
+    def test_unit_conversion(self):
+        p1 = Position(axes='XYZ', X=25.4, Y=-50.8, unit=UNIT_METRIC)
+        p2 = Position(axes='XYZ', X=1, Y=-2, unit=UNIT_IMPERIAL)
+        self.assertEqual(p1, p2)  # compared in the same unit
+        p1.unit = UNIT_IMPERIAL
+        self.assertAlmostEqual(p1.X, 1)
+        self.assertAlmostEqual(p1.Y, -2)
+        self.assertEqual(p1.unit, UNIT_IMPERIAL)
+
 
 class MachineGCodeProcessingTests(unittest.TestCase):
     def assert_processed_lines(self, line_data, machine):
@@ -229,3 +279,194 @@ class MachineGCodeProcessingTests(unittest.TestCase):
             ('g81 x10 y20 z-2 r1 l2', {'X':30, 'Y':60, 'Z':5}),
         ]
         self.assert_processed_lines(line_data, m)
+
+
+class MachineRunTests(unittest.TestCase):
+    lines = list(str_lines('''
+        G90 G17 G21 G91.1
+        G0 X1 Y2 Z3
+        G1 Z-1 F100
+        X10
+        Y10 Z-2
+        G2 X20 Y20 I5 J5
+        X30 Y10 R15
+        G92 X0 Y0
+        G0 X5
+        G81 X1 Y1 Z-3 R1
+        X2
+        Y2
+        G80
+        G91 G1 X1
+        X1
+    '''))
+
+    def assert_same_state(self, m1, m2):
+        self.assertEqual(m1.pos, m2.pos)
+        self.assertEqual(m1.abs_pos, m2.abs_pos)
+        self.assertEqual(m1.abs_range_min, m2.abs_range_min)
+        self.assertEqual(m1.abs_range_max, m2.abs_range_max)
+        self.assertEqual(str(m1.mode), str(m2.mode))
+
+    def test_run(self):
+        m1 = Machine()
+        for line_str in self.lines:
+            m1.process_block(Line(line_str).block)
+        for lines in [
+                self.lines,  # str
+                [Line(l) for l in self.lines],
+                [Line(l).block for l in self.lines]]:
+            m2 = Machine()
+            m2.run(lines)
+            self.assert_same_state(m1, m2)
+
+    def test_run_stepwise(self):
+        # state after each line matches process_block's
+        (m1, m2) = (Machine(), Machine())
+        for line_str in self.lines:
+            m1.process_block(Line(line_str).block)
+            m2.run([line_str])
+            self.assert_same_state(m1, m2)
+
+    def test_modal_gcode(self):
+        m = Machine()
+        m.process_str('G2 X1 Y1 I1 J0')
+        g1 = m.modal_gcode(Line('X2 Y2 R1').block.modal_params)
+        g2 = m.modal_gcode(Line('X3 Y3 R2').block.modal_params)  # same layout
+        self.assertEqual(str(g1), str(Line('G2 X2 Y2 R1').block.gcodes[0]))
+        self.assertEqual(str(g2), str(Line('G2 X3 Y3 R2').block.gcodes[0]))
+        g3 = m.modal_gcode(Line('X4 I1 J1').block.modal_params)
+        self.assertEqual(str(g3), str(Line('G2 X4 I1 J1').block.gcodes[0]))
+
+    def test_modal_gcode_validated(self):
+        # gcodes validating parameters' values are validated every time
+        def add_parameter(gcode, word):
+            if (word.letter == 'R') and (word.value <= 0):
+                raise GCodeParameterError("invalid radius: %s" % word)
+            GCode.add_parameter(gcode, word)
+        GCodeArcMoveCW.add_parameter = add_parameter
+        try:
+            m = Machine()
+            m.process_str('G2 X1 Y1 I1 J0')
+            m.modal_gcode(Line('X2 Y2 R1').block.modal_params)
+            with self.assertRaises(GCodeParameterError):
+                m.modal_gcode(Line('X3 Y3 R-1').block.modal_params)  # same layout
+        finally:
+            del GCodeArcMoveCW.add_parameter
+
+    def test_run_overridden(self):
+        # machines overriding block or gcode processing have it called by run()
+        class BlockMachine(Machine):
+            def process_block(self, block):
+                self.blocks.append(block)
+                super(BlockMachine, self).process_block(block)
+
+        class GCodesMachine(Machine):
+            def process_gcodes(self, *gcode_list, **kwargs):
+                self.gcodes += gcode_list
+                super(GCodesMachine, self).process_gcodes(*gcode_list, **kwargs)
+
+        m1 = Machine()
+        for line_str in self.lines:
+            m1.process_block(Line(line_str).block)
+
+        m2 = BlockMachine()
+        m2.blocks = []
+        m2.run(self.lines)
+        self.assertEqual(len(m2.blocks), len(self.lines))
+        self.assert_same_state(m1, m2)
+
+        m3 = GCodesMachine()
+        m3.gcodes = []
+        m3.run(self.lines)
+        self.assertEqual(
+            [str(g) for g in m3.gcodes],
+            [str(g) for l in self.lines for g in Line(l).block.gcodes],
+        )
+        self.assert_same_state(m1, m3)
+
+    def test_run_gcode_overridden(self):
+        # gcodes overriding GCode.process are processed with it
+        processed = []
+        def process(gcode, machine):
+            processed.append(str(gcode))
+            GCode.process(gcode, machine)
+        GCodeLinearMove.process = process
+        try:
+            m = Machine()
+            m.run(self.lines)
+        finally:
+            del GCodeLinearMove.process
+        self.assertEqual(processed, [
+            'G01 Z-1.000', 'G01 X10.000', 'G01 Y10.000 Z-2.000', 'G01 X1.000', 'G01 X1.000',
+        ])
+
+    def test_modal_gcode_invalid(self):
+        m = Machine()
+        m.process_str('G0 X1')
+        for i in range(2):
+            with self.assertRaises(MachineInvalidState):
+                m.run(['X2 I1'])  # I is not a G0 parameter
+
+
+class MachineCheckpointTests(unittest.TestCase):
+    def test_rollback(self):
+        m = Machine()
+        m.process_str('G90 G0 X1 Y2 Z3')
+        checkpoint = m.checkpoint()
+        (pos, mode) = (copy(m.pos), str(m.mode))
+        for line_str in ['G91 G1 X10 F100', 'G55 Z-5', 'G20 G3 X1 Y1 R2']:
+            m.process_str(line_str)
+        self.assertNotEqual(str(m.mode), mode)
+        m.rollback(checkpoint)
+        self.assertEqual(m.pos, pos)
+        self.assertEqual(str(m.mode), mode)
+        self.assertEqual(m.state.cur_coord_sys, 1)
+        self.assertEqual(m.abs_range_max, m.Position(X=1, Y=2, Z=3))
+
+    def test_rollback_repeated(self):
+        m = Machine()
+        checkpoint = m.checkpoint()
+        for i in range(2):
+            m.process_str('G91 G0 X1')
+            m.abs_pos.X = 100  # changed in place
+            m.rollback(checkpoint)
+            self.assertEqual(m.pos, m.Position())
+            self.assertEqual(m.abs_range_max, m.Position())
+
+    def test_mode_frozen(self):
+        # a mode's gcodes are shared with checkpoints, so can't change in place
+        m = Machine()
+        line = Line('G81 X1 Y1 Z-3 R1 F100')
+        m.process_block(line.block)
+        checkpoint = m.checkpoint()
+        mode = str(m.mode)
+        # changing processed gcodes doesn't change the machine's mode
+        for gcode in line.block.gcodes:
+            if gcode.word.letter == 'F':
+                gcode.word.value = 200
+            else:
+                gcode.R = 2
+        self.assertEqual((m.mode.motion.R, m.mode.feed_rate.word.value), (1, 100))
+        self.assertEqual(str(m.mode), mode)
+        # the mode's gcodes can't be changed
+        with self.assertRaises(AttributeError):
+            m.mode.motion.R = 2
+        with self.assertRaises(AttributeError):
+            m.mode.motion.L = 2  # (not yet a parameter)
+        with self.assertRaises(AttributeError):
+            m.mode.feed_rate.word.value = 200
+        m.process_str('G1 X2')
+        m.rollback(checkpoint)
+        self.assertEqual(str(m.mode), mode)
+
+    def test_matches_copy(self):
+        m = Machine()
+        m.process_str('G0 X5 Y5')
+        old_machine = copy(m)
+        checkpoint = m.checkpoint()
+        m.process_str('G1 X10 Y-2 F50')
+        m.rollback(checkpoint)
+        self.assertEqual(m.pos, old_machine.pos)
+        self.assertEqual(str(m.mode), str(old_machine.mode))
+        self.assertEqual(m.abs_range_min, old_machine.abs_range_min)
+        self.assertEqual(m.abs_range_max, old_machine.abs_range_max)
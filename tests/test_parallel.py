@@ -0,0 +1,68 @@
+import os
+import inspect
+import pickle
+import unittest
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path
+add_pygcode_to_path()
+
+# Units under test
+from pygcode import parallel
+from pygcode.reader import iter_lines
+from pygcode.line import Line
+
+# Local paths
+_this_path = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+_test_files_dir = os.path.join(_this_path, 'test-files')
+
+
+class PicklingTests(unittest.TestCase):
+    def test_line(self):
+        line = Line('N10 G1 X1.23456 Y2 F100 T01 M3 S100 (comment)', xy_decimals=5)
+        line2 = pickle.loads(pickle.dumps(line))
+        self.assertEqual(str(line2), str(line))
+        self.assertEqual(line2.comment.text, 'comment')
+        self.assertEqual(line2.block.gcodes, line.block.gcodes)
+        self.assertEqual(line2.block.T, line.block.T)
+
+
+class ParallelParseTests(unittest.TestCase):
+    filename = os.path.join(_test_files_dir, 'linuxcnc', 'Star Trek.tap')
+
+    def test_chunk_ranges(self):
+        with open(self.filename, 'rb') as fh:
+            content = fh.read()
+        ranges = list(parallel.chunk_ranges(self.filename, chunk_size=500))
+        self.assertGreater(len(ranges), 1)
+        # contiguous, covering the whole file, split after line endings
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(content))
+        for ((s1, e1), (s2, e2)) in zip(ranges[:-1], ranges[1:]):
+            self.assertEqual(e1, s2)
+            self.assertEqual(content[e1 - 1:e1], b'\n')
+
+    def test_parse_file(self):
+        expected = list(iter_lines(self.filename))
+        result = list(parallel.parse_file(self.filename, workers=2, chunk_size=500))
+        self.assertEqual(len(result), len(expected))
+        for (a, b) in zip(result, expected):
+            self.assertEqual((a.line_no, a.offset, str(a)), (b.line_no, b.offset, str(b)))
+
+    def test_lazy(self):
+        expected = list(iter_lines(self.filename))
+        result = list(parallel.parse_file(self.filename, workers=2, chunk_size=500, lazy=True))
+        self.assertEqual(len(result), len(expected))
+        self.assertTrue(all('block' not in l.__dict__ for l in result))  # not yet rebuilt
+        result[1] = pickle.loads(pickle.dumps(result[1]))  # (eg: sent to another process)
+        for (a, b) in zip(result, expected):
+            self.assertEqual((a.line_no, a.offset, a.text), (b.line_no, b.offset, b.text))
+            self.assertEqual(str(a), str(b))
+            self.assertEqual(a.block.gcodes, b.block.gcodes)
+
+    def test_encoding(self):
+        for line in iter_lines(self.filename):
+            line2 = parallel._decode_line(parallel._encode_line(line))
+            self.assertEqual(str(line2), str(line))
+            self.assertEqual(line2.block.gcodes, line.block.gcodes)
+            self.assertEqual(line2.block.modal_params, line.block.modal_params)
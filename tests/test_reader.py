@@ -0,0 +1,139 @@
+import io
+import os
+import inspect
+import shutil
+import tempfile
+import unittest
+import warnings
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path
+add_pygcode_to_path()
+
+# Units under test
+from pygcode.reader import parse_file, iter_lines, iter_raw_lines
+from pygcode.reader import map_file, iter_mapped_lines
+from pygcode.line import Line
+from pygcode.exceptions import GCodeWordStrError
+
+# Local paths
+_this_path = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+_test_files_dir = os.path.join(_this_path, 'test-files')
+
+
+class ReaderTests(unittest.TestCase):
+    content = b'G90 G21\r\nG0 X1 Y2 (rapid)\n\nG1 Z-1 F100\nM30'
+
+    def test_raw_lines(self):
+        # small chunks: lines span across multiple reads
+        result = list(iter_raw_lines(io.BytesIO(self.content), chunk_size=4))
+        self.assertEqual(result, [
+            (1, 0, 'G90 G21'),
+            (2, 9, 'G0 X1 Y2 (rapid)'),
+            (3, 26, ''),
+            (4, 27, 'G1 Z-1 F100'),
+            (5, 39, 'M30'),
+        ])
+        # offsets locate each line in the file
+        for (line_no, offset, text) in result:
+            self.assertEqual(self.content[offset:offset + len(text)].decode(), text)
+
+    def test_text_stream(self):
+        binary = list(iter_raw_lines(io.BytesIO(b'G0 X1\nG1 Y2\n')))
+        text = list(iter_raw_lines(io.StringIO(u'G0 X1\nG1 Y2\n')))
+        self.assertEqual(binary, text)
+
+    def test_line_endings(self):
+        # \n, \r\n & lone \r terminate lines (a \r\n split across reads is one)
+        content = b'G0 X1\rG1 Y2\r\nG1 Z3\n\rM30\r'
+        expected = [
+            (1, 0, 'G0 X1'),
+            (2, 6, 'G1 Y2'),
+            (3, 13, 'G1 Z3'),
+            (4, 19, ''),
+            (5, 20, 'M30'),
+        ]
+        for chunk_size in [1, 2, 3, 7, 100]:
+            self.assertEqual(list(iter_raw_lines(io.BytesIO(content), chunk_size=chunk_size)), expected)
+            self.assertEqual(
+                list(iter_raw_lines(io.StringIO(content.decode()), chunk_size=chunk_size)),
+                expected,
+            )
+
+    def test_parse_file(self):
+        lines = list(parse_file(io.BytesIO(self.content), chunk_size=4))
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(isinstance(l, Line) for l in lines))
+        self.assertEqual([l.line_no for l in lines], [1, 2, 3, 4, 5])
+        self.assertEqual(lines[1].comment.text, 'rapid')
+        self.assertEqual(len(lines[1].block.words), 3)
+        self.assertEqual(str(lines[3]), 'G01 Z-1.000 F100.000')
+
+    def test_iter_lines(self):
+        filename = os.path.join(_test_files_dir, 'linuxcnc', 'random-sample-1.gcode')
+        with open(filename, 'r') as fh:
+            expected = [str(Line(l)) for l in fh.readlines()]
+        self.assertEqual([str(l) for l in iter_lines(filename)], expected)
+
+
+class MappedReaderTests(unittest.TestCase):
+    content = ReaderTests.content
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_file(self, content):
+        filename = os.path.join(self.tmp_dir, 'part.gcode')
+        with open(filename, 'wb') as fh:
+            fh.write(content)
+        return filename
+
+    def assert_same_lines(self, lines, expected):
+        self.assertEqual(
+            [(l.line_no, l.offset, str(l)) for l in lines],
+            [(l.line_no, l.offset, str(l)) for l in expected],
+        )
+
+    def test_mapped_lines(self):
+        filename = self.write_file(self.content)
+        lines = list(iter_mapped_lines(filename))
+        self.assert_same_lines(lines, parse_file(io.BytesIO(self.content)))
+        self.assertEqual(lines[1].comment.text, 'rapid')
+
+    def test_line_endings(self):
+        content = b'G0 X1\rG1 Y2\r\nG1 Z3\n\rM30\r'
+        lines = list(iter_mapped_lines(self.write_file(content)))
+        self.assert_same_lines(lines, parse_file(io.BytesIO(content)))
+        self.assertEqual(len(lines), 5)
+
+    def test_files(self):
+        for name in ['random-sample-1.gcode', 'Star Trek.tap']:
+            filename = os.path.join(_test_files_dir, 'linuxcnc', name)
+            self.assert_same_lines(iter_mapped_lines(filename), iter_lines(filename))
+
+    def test_unmappable(self):
+        # not a file on disk: parsed by parse_file
+        self.assert_same_lines(
+            map_file(io.BytesIO(self.content)),
+            parse_file(io.BytesIO(self.content)),
+        )
+        # empty file
+        self.assertEqual(list(iter_mapped_lines(self.write_file(b''))), [])
+
+    def test_close(self):
+        # stopping part way through releases the file
+        lines = iter_mapped_lines(self.write_file(self.content))
+        next(lines)
+        lines.close()
+
+    def test_close_on_error(self):
+        # a line that fails to parse doesn't keep the file mapped
+        filename = self.write_file(b'G0 X1\nG0 X1 Q\x01\nM30\n')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with self.assertRaises(GCodeWordStrError):
+                list(iter_mapped_lines(filename))
+        self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [])
@@ -0,0 +1,84 @@
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path, str_lines
+add_pygcode_to_path()
+
+# Units under test
+from pygcode import stats
+from pygcode.line import Line
+from pygcode.machine import Machine
+
+
+class StatsTests(unittest.TestCase):
+    lines = list(str_lines('''
+        G90 G21 (setup)
+        G0 X1 Y2 Z3
+        G1 X4 F100
+        Y5
+    '''))
+
+    def setUp(self):
+        self.machine = Machine()  # (machine's default mode is parsed)
+        stats.reset()
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def process(self, run=False):
+        m = self.machine
+        lines = [Line(l) for l in self.lines]
+        if run:
+            m.run(lines)
+        else:
+            for line in lines:
+                m.process_block(line.block)
+        return m
+
+    def test_disabled(self):
+        self.assertFalse(stats.is_enabled())
+        self.process()
+        self.assertEqual(stats.get_stats(), {})
+
+    def test_stages(self):
+        stats.enable()
+        self.process()
+        info = stats.get_stats()
+        for stage in ['split_line', 'text2words', 'words2gcodes', 'Block._assert_gcodes']:
+            self.assertEqual(info[stage].calls, 4)
+        self.assertEqual(info['Machine.process_gcodes'].calls, 4)
+        self.assertEqual(info['GCodeLinearMove._process'].calls, 2)  # (including modal Y5)
+        self.assertEqual(info['GCodeRapidMove._process'].calls, 1)
+        self.assertEqual(info['GCodeFeedRate._process'].calls, 1)
+        self.assertTrue(all(i.seconds >= 0 for i in info.values()))
+
+    def test_run(self):
+        stats.enable()
+        m = self.process(run=True)
+        self.assertEqual(stats.get_stats()['Machine.process_gcodes'].calls, 4)
+        self.assertEqual(m.pos.values, dict(X=4, Y=5, Z=3))
+
+    def test_disable_retains(self):
+        stats.enable()
+        self.process()
+        stats.disable()
+        self.process()
+        self.assertEqual(stats.get_stats()['split_line'].calls, 4)
+        stats.reset()
+        self.assertEqual(stats.get_stats(), {})
+
+    def test_report(self):
+        stats.enable()
+        self.process()
+        fh = StringIO()
+        stats.report(fh)
+        lines = fh.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('stage'))
+        self.assertIn('Machine.process_gcodes', fh.getvalue())
+        self.assertEqual(len(lines), len(stats.get_stats()) + 1)
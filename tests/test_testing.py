@@ -0,0 +1,94 @@
+import unittest
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path
+add_pygcode_to_path()
+
+# Units under test
+from pygcode.testing import generate, ProgramGenerator, DEFAULT_MIX, PROFILES
+from pygcode.gcodes import GCodeArcMove, GCodeCannedCycle, GCodeSelectCoordinateSystem
+from pygcode.transform import linearize_arc, simplify_canned_cycle
+from pygcode.machine import Machine
+from pygcode.line import Line
+
+
+class GenerateTests(unittest.TestCase):
+    def test_deterministic(self):
+        self.assertEqual(list(generate(200, seed=1)), list(generate(200, seed=1)))
+        self.assertNotEqual(list(generate(200, seed=1)), list(generate(200, seed=2)))
+
+    def test_line_count(self):
+        for count in [0, 1, 2, 500]:
+            self.assertEqual(len(list(generate(count))), count)
+
+    def test_valid(self):
+        # every line is parsed, and processed by a machine, as generated
+        m = Machine()
+        (arcs, canned, coord_sys) = (0, 0, 0)
+        for line_str in generate(2000, seed=3):
+            line = Line(line_str)
+            self.assertEqual(str(line), line_str)
+            for gcode in m.block_modal_gcodes(line.block):
+                if isinstance(gcode, GCodeArcMove):
+                    arcs += 1
+                    list(linearize_arc(gcode, start_pos=m.pos, max_error=0.01))
+                elif isinstance(gcode, GCodeCannedCycle):
+                    canned += 1
+                elif isinstance(gcode, GCodeSelectCoordinateSystem):
+                    coord_sys += 1
+            m.process_block(line.block)
+        self.assertGreater(arcs, 0)
+        self.assertGreater(canned, 0)
+        self.assertGreater(coord_sys, 0)
+
+    def test_position(self):
+        # generator tracks the machine's position
+        generator = ProgramGenerator(seed=4)
+        m = Machine()
+        lines = generator.iter_lines(1000)
+        for line_str in lines:
+            m.process_block(Line(line_str).block)
+        self.assertEqual(m.pos.values, dict(zip('XYZ', generator.pos)))
+
+    def test_mix(self):
+        mix = dict((k, 0) for k in DEFAULT_MIX)
+        mix['arc_r'] = 1
+        lines = list(generate(100, mix=mix))
+        self.assertTrue(all(' R' in l for l in lines[1:]))
+
+        lines = list(generate(100, mix={'comment': 0, 'modal': 0}))
+        self.assertFalse(any(('(' in l) or (';' in l) for l in lines[1:]))
+        self.assertTrue(all(l.startswith('G') for l in lines))
+
+    def test_profiles(self):
+        class PrintingMachine(Machine):
+            ignore_invalid_modal = True  # extrusion (E) isn't modelled
+
+        for profile in sorted(PROFILES):
+            m = PrintingMachine()
+            gcode_classes = set()
+            for line_str in generate(1000, seed=5, profile=profile):
+                line = Line(line_str)
+                self.assertEqual(str(line), line_str)
+                for gcode in m.block_modal_gcodes(line.block):
+                    kwargs = dict(start_pos=m.pos, plane=m.mode.plane_selection)
+                    if isinstance(gcode, GCodeArcMove):
+                        list(linearize_arc(gcode, max_error=0.01, **kwargs))
+                    elif isinstance(gcode, GCodeCannedCycle):
+                        list(simplify_canned_cycle(gcode, **kwargs))
+                    gcode_classes.add(gcode.__class__)
+                    m.process_gcodes(gcode)  # (eg: a plane selection before an arc)
+            self.assertGreater(len(gcode_classes), 1, profile)
+
+        lines = list(generate(600, profile='laser'))
+        self.assertEqual(len([l for l in lines if l.startswith('G00')]), 2)  # 2 raster rows
+
+    def test_mix_invalid(self):
+        with self.assertRaises(ValueError):
+            ProgramGenerator(mix={'spline': 1})
+        with self.assertRaises(ValueError):
+            ProgramGenerator(mix={'linear': -1})
+        with self.assertRaises(ValueError):
+            ProgramGenerator(mix=dict((k, 0) for k in DEFAULT_MIX))
+        with self.assertRaises(ValueError):
+            ProgramGenerator(profile='welding')
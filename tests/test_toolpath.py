@@ -0,0 +1,125 @@
+import os
+import inspect
+import unittest
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path, str_lines
+add_pygcode_to_path()
+
+# Units under test
+from pygcode import toolpath
+from pygcode.machine import Machine
+from pygcode.reader import iter_lines
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Local paths
+_this_path = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+_test_files_dir = os.path.join(_this_path, 'test-files')
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class ToArraysTests(unittest.TestCase):
+    def test_moves(self):
+        path = toolpath.to_arrays(str_lines('''
+            G90 G21
+            G0 X1 Y2 Z3
+            F100
+            G1 X4
+            Y5 Z6 F200
+            G1 F300
+            G91 G1 X1
+        '''))
+        self.assertEqual(len(path), 4)  # F100 & G1 F300 are not moves
+        self.assertEqual(list(path['motion']), [0, 1, 1, 1])
+        self.assertTrue(numpy.isnan(path['feed'][0]))  # rapid
+        self.assertEqual(list(path['feed'][1:]), [100, 200, 300])
+        self.assertEqual(list(path['line_no']), [2, 4, 5, 7])
+        self.assertEqual(tuple(path[[k + '1' for k in 'xyz']][2]), (4, 5, 6))
+        self.assertEqual(tuple(path[[k + '0' for k in 'xyz']][3]), (4, 5, 6))
+        self.assertEqual(tuple(path[[k + '1' for k in 'xyz']][3]), (5, 5, 6))
+
+    def test_machine(self):
+        # given machine's state is used (& changed)
+        m = Machine()
+        m.process_str('G0 X10')
+        path = toolpath.to_arrays(['G1 X11 F10'], machine=m)
+        self.assertEqual((path['x0'][0], path['x1'][0]), (10, 11))
+        self.assertEqual(m.abs_pos.X, 11)
+
+    def test_arc_linearized(self):
+        # full circle: 2mm diameter, centered on X1 Y0
+        path = toolpath.to_arrays(
+            ['G90 G17 F100', 'G2 X0 Y0 I1 J0'],
+            linearize_arcs=True, max_error=0.01,
+        )
+        self.assertGreater(len(path), 10)
+        self.assertTrue((path['motion'] == 2).all())
+        # continuous
+        self.assertTrue((path['x0'][1:] == path['x1'][:-1]).all())
+        self.assertTrue((path['y0'][1:] == path['y1'][:-1]).all())
+        self.assertEqual((path['x1'][-1], path['y1'][-1]), (0, 0))
+        # within tolerance of the arc
+        radii = numpy.hypot(path['x1'] - 1, path['y1'])
+        self.assertTrue((abs(radii - 1) <= 0.01).all())
+        length = numpy.hypot(path['x1'] - path['x0'], path['y1'] - path['y0']).sum()
+        self.assertAlmostEqual(length, 2 * numpy.pi, places=1)
+
+    def test_file(self):
+        filename = os.path.join(_test_files_dir, 'linuxcnc', 'Star Trek.tap')
+        path = toolpath.to_arrays(iter_lines(filename))
+        arcs = toolpath.to_arrays(iter_lines(filename), linearize_arcs=True)
+        self.assertEqual(set(path['motion']), set([0, 1, 2, 3]))
+        self.assertGreater(len(arcs), len(path))
+        # linearizing arcs only changes the path between arc endpoints
+        for key in ['x1', 'y1', 'z1']:
+            self.assertEqual(path[key][-1], arcs[key][-1])
+        self.assertEqual(set(path['line_no']), set(arcs['line_no']))
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class LimitsTests(unittest.TestCase):
+    lines = list(str_lines('''
+        G90 G21 F100
+        G0 X1 Y2 Z3
+        G1 X-4
+        G1 X4 Y12 Z-1
+        G1 X0 Y0 Z0
+    '''))
+
+    def test_bounds(self):
+        path = toolpath.to_arrays(self.lines)
+        self.assertEqual(toolpath.bounds(path), ((-4, 0, -1), (4, 12, 3)))
+        self.assertIsNone(toolpath.bounds(toolpath.to_arrays(['G1 F100'])))
+
+    def test_bounds_matches_machine(self):
+        m = Machine()
+        path = toolpath.to_arrays(self.lines, machine=m)
+        self.assertEqual(
+            toolpath.bounds(path),
+            (m.abs_range_min.vector.xyz, m.abs_range_max.vector.xyz),
+        )
+
+    def test_check_limits(self):
+        path = toolpath.to_arrays(self.lines)
+        breaches = toolpath.check_limits(path, {'X': (-2, 5), 'Y': (None, 10), 'z': (0, None)})
+        self.assertEqual(
+            [tuple(b) for b in breaches.tolist()],
+            [(3, 'X', -4, -2), (4, 'Y', 12, 10), (4, 'Z', -1, 0)],  # (line 5 moves back within limits)
+        )
+        self.assertEqual(len(toolpath.check_limits(path, {'X': (-10, 10)})), 0)
+        with self.assertRaises(ValueError):
+            toolpath.check_limits(path, {'A': (0, 360)})
+
+    def test_check_limits_arc(self):
+        # semi-circle (radius 1) bulges beyond Y0.5, but its endpoints don't
+        lines = ['G90 G17 F100', 'G2 X2 Y0 I1 J0']
+        self.assertEqual(len(toolpath.check_limits(toolpath.to_arrays(lines), {'Y': (None, 0.5)})), 0)
+        breaches = toolpath.check_limits(
+            toolpath.to_arrays(lines, linearize_arcs=True), {'Y': (None, 0.5)},
+        )
+        self.assertEqual(list(breaches['line_no']), [2])  # once per line
+        self.assertAlmostEqual(breaches['value'][0], 1, places=1)
@@ -0,0 +1,171 @@
+import unittest
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path
+add_pygcode_to_path()
+
+# Units under test
+from pygcode.transform import linearize_arc, linearize_arc_vertices, simplify_canned_cycle
+from pygcode.transform import ArcLinearizeInside, ArcLinearizeOutside, ArcLinearizeMid
+from pygcode import transform
+from pygcode.gcodes import GCodeSelectXYPlane, GCodeSelectYZPlane, GCodeSelectZXPlane
+from pygcode.gcodes import GCodeAbsoluteDistanceMode, GCodeIncrementalDistanceMode
+from pygcode.gcodes import GCodeDwell
+from pygcode.machine import Position
+from pygcode.line import Line
+from pygcode.exceptions import GCodeParameterError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class ArcLinearizeVectorizedTests(unittest.TestCase):
+    # valid in every plane, & distance mode
+    arcs = [
+        'G2 X10 Y0 Z3 I5 J0 K0',
+        'G3 X0 Y-2 Z7 R5',
+        'G2 X0 Y0 Z-2 I3 J4 K5',  # full circle (helical)
+        'G3 X3 Y2 Z7 I1.5 J2 K2',
+    ]
+    invalid_arcs = [  # (XY plane, absolute distance mode)
+        'G2 X1 Y2 R5',  # R: starts & finishes in the same spot
+        'G2 X20 Y2 R1',  # R: radius can't reach endpoint
+    ]
+
+    def test_same_moves(self):
+        for method_class in [ArcLinearizeInside, ArcLinearizeOutside, ArcLinearizeMid]:
+            for plane in [GCodeSelectXYPlane(), GCodeSelectYZPlane(), GCodeSelectZXPlane()]:
+                for dist_mode in [GCodeAbsoluteDistanceMode(), GCodeIncrementalDistanceMode()]:
+                    for arc_str in self.arcs:
+                        kwargs = dict(
+                            arc_gcode=Line(arc_str).block.gcodes[0],
+                            start_pos=Position(axes='XYZ', X=1, Y=2, Z=3),
+                            plane=plane, method_class=method_class,
+                            dist_mode=dist_mode, max_error=0.01,
+                        )
+                        expected = list(linearize_arc(**kwargs))
+                        result = list(linearize_arc(vectorized=True, **kwargs))
+                        self.assertEqual(len(result), len(expected))
+                        for (g1, g2) in zip(result, expected):
+                            for axis in 'XYZ':
+                                self.assertAlmostEqual(getattr(g1, axis), getattr(g2, axis), places=9)
+
+    def test_invalid_arcs(self):
+        for method_class in [ArcLinearizeInside, ArcLinearizeOutside, ArcLinearizeMid]:
+            for arc_str in self.invalid_arcs:
+                for vectorized in [False, True]:
+                    with self.assertRaises(GCodeParameterError):
+                        list(linearize_arc(
+                            arc_gcode=Line(arc_str).block.gcodes[0],
+                            start_pos=Position(axes='XYZ', X=1, Y=2, Z=3),
+                            method_class=method_class, max_error=0.01,
+                            vectorized=vectorized,
+                        ))
+
+    def test_vertices(self):
+        # helical full circle: 2mm diameter, centered on X1 Y0
+        vertices = linearize_arc_vertices(
+            Line('G2 X0 Y0 Z-1 I1 J0').block.gcodes[0],
+            Position(axes='XYZ'),
+            max_error=0.001,
+        )
+        self.assertEqual(vertices.shape[1], 3)
+        self.assertGreater(len(vertices), 50)
+        self.assertEqual(tuple(vertices[0]), (0, 0, 0))
+        self.assertEqual(tuple(vertices[-1]), (0, 0, -1))
+        self.assertTrue((numpy.diff(vertices[:, 2]) <= 0).all())  # steady descent
+        radii = numpy.hypot(vertices[:, 0] - 1, vertices[:, 1])
+        self.assertTrue((abs(radii - 1) <= 0.001).all())
+
+
+class ArcLinearizeMemoTests(unittest.TestCase):
+    arcs = ArcLinearizeVectorizedTests.arcs
+
+    class UnmemoizedMid(ArcLinearizeMid):
+        memoize = False
+
+    def setUp(self):
+        transform.clear_geometry_memo()
+
+    def tearDown(self):
+        transform.clear_geometry_memo()
+
+    def linearize(self, arc_str, method_class, vectorized=False):
+        return [
+            str(g) for g in linearize_arc(
+                arc_gcode=Line(arc_str).block.gcodes[0],
+                start_pos=Position(axes='XYZ', X=1, Y=2, Z=3),
+                method_class=method_class, max_error=0.01,
+                vectorized=vectorized,
+            )
+        ]
+
+    def test_same_moves(self):
+        for arc_str in self.arcs:
+            expected = self.linearize(arc_str, self.UnmemoizedMid)
+            self.assertEqual(self.linearize(arc_str, ArcLinearizeMid), expected)
+            self.assertEqual(self.linearize(arc_str, ArcLinearizeMid), expected)  # memoized
+
+    def test_memoized(self):
+        self.linearize(self.arcs[0], self.UnmemoizedMid)
+        self.assertEqual(len(transform._geometry_memo), 0)
+        self.linearize(self.arcs[0], ArcLinearizeMid)
+        count = len(transform._geometry_memo)
+        self.assertGreater(count, 0)
+        self.linearize(self.arcs[0], ArcLinearizeMid)
+        self.assertEqual(len(transform._geometry_memo), count)  # all hits
+        self.linearize(self.arcs[0], ArcLinearizeInside)  # keyed by method
+        self.assertGreater(len(transform._geometry_memo), count)
+
+    def test_memo_max(self):
+        # least recently used values are discarded (each scalar's size is 1)
+        original = transform.GEOMETRY_MEMO_MAX
+        transform.GEOMETRY_MEMO_MAX = 4
+        try:
+            self.linearize(self.arcs[0], ArcLinearizeMid)
+            keys0 = set(transform._geometry_memo)
+            self.linearize(self.arcs[1], ArcLinearizeMid)
+            keys1 = set(transform._geometry_memo) - keys0
+            self.assertEqual(len(keys0), 2)
+            self.assertEqual(len(keys1), 2)
+
+            self.linearize(self.arcs[0], ArcLinearizeMid)  # (most recently used)
+            self.linearize(self.arcs[2], ArcLinearizeMid)
+            keys = set(transform._geometry_memo)
+            self.assertTrue(keys0.issubset(keys))
+            self.assertFalse(keys1 & keys)
+            self.assertEqual(transform._geometry_memo_size, 4)
+        finally:
+            transform.GEOMETRY_MEMO_MAX = original
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_memo_size(self):
+        # bounded by total elements memoized (arrays count as their size)
+        for arc_str in self.arcs:
+            self.linearize(arc_str, ArcLinearizeMid, vectorized=True)
+        sizes = [size for (value, size) in transform._geometry_memo.values()]
+        self.assertGreater(max(sizes), 1)
+        self.assertEqual(transform._geometry_memo_size, sum(sizes))
+
+        original = transform.GEOMETRY_MEMO_MAX
+        transform.GEOMETRY_MEMO_MAX = max(sizes)
+        try:
+            transform.clear_geometry_memo()
+            for arc_str in self.arcs:
+                self.linearize(arc_str, ArcLinearizeMid, vectorized=True)
+                self.assertLessEqual(transform._geometry_memo_size, max(sizes))
+        finally:
+            transform.GEOMETRY_MEMO_MAX = original
+
+
+class SimplifyCannedCycleTests(unittest.TestCase):
+    def test_dwell(self):
+        gcodes = list(simplify_canned_cycle(
+            Line('G82 X1 Y2 Z-3 R1 P0.5').block.gcodes[0],
+            start_pos=Position(axes='XYZ', Z=5),
+        ))
+        self.assertEqual(len([g for g in gcodes if isinstance(g, GCodeDwell)]), 1)
+        self.assertEqual(gcodes[-1].Z, 5)  # returned to the initial level
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path, str_lines
+add_pygcode_to_path()
+
+# Units under test
+from pygcode import validate
+from pygcode.validation import iter_violations
+from pygcode.line import Line
+from pygcode import cache
+
+
+class VerifyTests(unittest.TestCase):
+    def test_skip_verify(self):
+        with self.assertRaises(AssertionError):
+            Line('G0 G1 X1')
+        for lazy in (False, True):
+            line = Line('G0 G1 X1', verify=False, lazy=lazy)
+            self.assertEqual(len(line.block.gcodes), 2)
+            line = Line.from_bytes(b'G0 G1 X1', verify=False, lazy=lazy)
+            self.assertEqual(len(line.block.gcodes), 2)
+
+    def test_cached(self):
+        # unverified lines are cached separately from verified lines
+        cache.enable_cache()
+        try:
+            Line('G0 G1 X1', verify=False)
+            with self.assertRaises(AssertionError):
+                Line('G0 G1 X1')
+        finally:
+            cache.disable_cache()
+
+
+class ValidateTests(unittest.TestCase):
+    lines = list(str_lines('''
+        G90 G21 (valid)
+        G0 G1 X1
+        G1 X
+        G90 G91 G0 G1 X1 ; two conflicts
+        G1 X1 X2
+        %
+        G1 X3
+    '''))
+
+    def setUp(self):
+        (fd, self.filename) = tempfile.mkstemp(suffix='.ngc')
+        with os.fdopen(fd, 'w') as fh:
+            for i in range(20):
+                for line_str in self.lines:
+                    fh.write(line_str + '\n')
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_violations(self):
+        violations = list(iter_violations(
+            (i + 1, None, line_str) for (i, line_str) in enumerate(self.lines)
+        ))
+        self.assertEqual([v.line_no for v in violations], [2, 3, 4, 4, 5])
+        self.assertIn('GCodeRapidMove', violations[0].message)
+        self.assertEqual(violations[1].message, "word 'X' value invalid")
+        self.assertIn('GCodeAbsoluteDistanceMode', violations[2].message)
+        self.assertIn('GCodeRapidMove', violations[3].message)
+        self.assertEqual(violations[4].text, 'G1 X1 X2')
+
+    def test_non_modal_conflicts(self):
+        # separate conflicts of gcodes without a modal group are each reported
+        violations = list(iter_violations([(1, None, 'G4 P1 G4 P2 G28 G28 G4 P3')]))
+        self.assertEqual(len(violations), 2)
+        self.assertIn('G04{P3.000}', violations[0].message)
+        self.assertNotIn('G28', violations[0].message)
+        self.assertIn('GCodeGotoPredefinedPosition', violations[1].message)
+
+    def test_validate(self):
+        expected = validate(self.filename, workers=1, chunk_size=10 ** 6)
+        self.assertEqual(len(expected), 5 * 20)
+        self.assertEqual(expected[-1].line_no, 5 + (19 * len(self.lines)))
+        with open(self.filename, 'rb') as fh:
+            content = fh.read()
+        for v in expected:
+            self.assertTrue(content[v.offset:].startswith(v.text.encode('ascii')))
+
+        # in chunks, and in parallel
+        self.assertEqual(validate(self.filename, workers=1, chunk_size=100), expected)
+        self.assertEqual(validate(self.filename, workers=2, chunk_size=100), expected)
+
+    def test_undecodable(self):
+        # an invalid byte is a violation of its line, the rest are validated
+        with open(self.filename, 'wb') as fh:
+            fh.write(b'G90 G21\nG0 X1 (caf\xe9)\nG1 X\nG1 X\xff2\nG1 Z-1 F100\n')
+        violations = validate(self.filename, workers=1)
+        self.assertEqual([v.line_no for v in violations], [2, 3, 4, 4])
+        self.assertIn('utf-8', violations[0].message)
+        self.assertEqual(violations[0].text, u'G0 X1 (caf\ufffd)')
+        self.assertEqual(violations[0].offset, 8)
+        self.assertEqual(violations[1].message, "word 'X' value invalid")
+        self.assertIn('utf-8', violations[2].message)
+        # in chunks, and in parallel
+        self.assertEqual(validate(self.filename, workers=2, chunk_size=10), violations)
+        # decoded as given
+        violations = validate(self.filename, workers=1, encoding='latin-1')
+        self.assertEqual([v.line_no for v in violations], [3, 4])
+
+    def test_valid(self):
+        with open(self.filename, 'w') as fh:
+            fh.write('G90 G21\nG0 X1 Y2\nG1 Z-1 F100\n')
+        self.assertEqual(validate(self.filename, workers=1), [])
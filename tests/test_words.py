@@ -1,4 +1,7 @@
 import unittest
+import pickle
+from copy import copy
+from concurrent.futures import ThreadPoolExecutor
 
 # Add relative pygcode to path
 from .testutils import add_pygcode_to_path
@@ -7,6 +10,7 @@ add_pygcode_to_path()
 # Units under test
 from pygcode import words
 from pygcode import dialects
+from pygcode.exceptions import GCodeWordStrError
 
 
 class WordIterTests(unittest.TestCase):
@@ -22,11 +26,11 @@ class WordIterTests(unittest.TestCase):
         self.assertEqual(w[4].value_str, words.Word('F', 100).value_str)
         self.assertEqual(w[5].value_str, words.Word('Z', 1.5).value_str)
         self.assertEqual(w[6].value_str, words.Word('Z', -1).value_str)
-        self.assertEqual(w[7].value_str, words.Word('Y', -1.00000).value_str)
+        self.assertEqual(w[7].value_str, words.Word('Y', -1.00000, xy_decimals=5).value_str)
         # testing for scientific notation in non x and y letters
         self.assertEqual(w[8].value_str, words.Word('Z', .000).value_str)
         # testing for duplicate negative signs in X string
-        self.assertEqual(w[9].value_str, words.Word('Y', .000).value_str)
+        self.assertEqual(w[9].value_str, words.Word('Y', .000, xy_decimals=5).value_str)
 
     def test_iter2(self):
         block_str = 'G02 X10.75 Y47.44 I-0.11 J-1.26 F70'
@@ -41,6 +45,175 @@ class WordIterTests(unittest.TestCase):
         self.assertEqual([w[4].letter, w[4].value], ['J', -1.26])
         self.assertEqual([w[5].letter, w[5].value], ['F', 70])
 
+    def test_iter_value_formats(self):
+        block_str = 'G0 X.5 Y-.25 Z+1.5e-1 A 65.8393 M3 S12000 T01'
+        w = list(words.text2words(block_str))
+        self.assertEqual(
+            [(x.letter, x.value) for x in w],
+            [('G', 0), ('X', .5), ('Y', -.25), ('Z', .15), ('A', 65.8393),
+             ('M', 3), ('S', 12000), ('T', '01')],
+        )
+
+    def test_iter_signed_fraction(self):
+        # explicit sign, without a leading digit
+        for (block_str, expected) in [
+                ('X+.5', .5), ('X-.5', -.5), ('X +.5', .5), ('X .5', .5), ('X +1.5', 1.5)]:
+            w = list(words.text2words(block_str))
+            self.assertEqual([(x.letter, x.value) for x in w], [('X', expected)], block_str)
+            w = list(words.bytes2words(block_str.encode('ascii')))
+            self.assertEqual([(x.letter, x.value) for x in w], [('X', expected)], block_str)
+        for block_str in ['X+ .5', 'X-+.5']:
+            with self.assertRaises(GCodeWordStrError):
+                list(words.text2words(block_str))
+
+    def test_iter_no_whitespace(self):
+        w = list(words.text2words('N190G00X1.6219Y-1.847z0.2'))
+        self.assertEqual(
+            [(x.letter, x.value) for x in w],
+            [('N', 190), ('G', 0), ('X', 1.6219), ('Y', -1.847), ('Z', 0.2)],
+        )
+
+    def test_iter_errors(self):
+        with self.assertRaises(GCodeWordStrError):
+            list(words.text2words('G1 X'))  # letter without a value
+        with self.assertRaises(GCodeWordStrError):
+            list(words.text2words('G1 X1 5'))  # value without a letter
+
+    def test_tokenizer_reuse(self):
+        self.assertIs(words.get_tokenizer(), words.get_tokenizer())
+
+    def test_iter_bytes(self):
+        for block_str in [
+                'G02 X10.75 Y47.44 I-0.11 J-1.26 F70',
+                'G0 X.5 Y-.25 Z+1.5e-1 A 65.8393 M3 S12000 T01',
+                'N190G00X1.6219Y-1.847z0.2',
+                'O1000 L2 g38.2']:
+            expected = [(w.letter, w.value) for w in words.text2words(block_str)]
+            data = block_str.encode('ascii')
+            for block_bytes in (data, memoryview(data)):
+                w = list(words.bytes2words(block_bytes))
+                self.assertEqual([(x.letter, x.value) for x in w], expected)
+                self.assertEqual([type(x.value) for x in w], [type(v) for (l, v) in expected])
+
+    def test_iter_bytes_errors(self):
+        with self.assertRaises(GCodeWordStrError):
+            list(words.bytes2words(b'G1 X'))  # letter without a value
+        with self.assertRaises(GCodeWordStrError):
+            list(words.bytes2words(memoryview(b'G1 X1 5')))  # value without a letter
+
+
+class WordScanTests(unittest.TestCase):
+    def test_scan_float(self):
+        word_type = dialects.linuxcnc.WORD_MAP['X']
+        for (text, expected) in [
+                ('1', (1., 1)), ('-12', (-12., 3)), ('+1.5', (1.5, 4)),
+                ('1.', (1., 2)), ('.5', (.5, 2)), ('-.25', (-.25, 4)), ('+.5', (.5, 3)),
+                ('1.5e-3', (1.5e-3, 6)), ('-3.234E+4', (-32340., 9)),
+                (' 2.5', (2.5, 4)),  # leading whitespace
+                ('1e3', (1., 1)),  # exponent only follows a decimal point (E is a word)
+                ('2.5Y3', (2.5, 3))]:
+            (value, end) = word_type.scan(text)
+            self.assertEqual((value, end), expected, text)
+            self.assertIsInstance(value, float)
+        for text in ['', '.', '+-.5', 'Y1', '-']:
+            self.assertIsNone(word_type.scan(text), text)
+
+    def test_scan_pos(self):
+        word_type = dialects.linuxcnc.WORD_MAP['X']
+        self.assertEqual(word_type.scan('G1X-1.5Y2', 3), (-1.5, 7))
+        self.assertIsNone(word_type.scan('G1X-1.5Y2', 7))
+
+    def test_scan_code(self):
+        word_type = dialects.linuxcnc.WORD_MAP['G']
+        self.assertEqual(word_type.scan('38.2'), (38.2, 4))
+        self.assertEqual(word_type.scan('01 X1'), (1., 2))
+        self.assertIsNone(word_type.scan('-1'))
+
+    def test_value_pattern(self):
+        # letters sharing a value pattern are scanned by the same branch
+        word_map = dialects.linuxcnc.WORD_MAP
+        self.assertEqual(word_map['X'].value_pattern, word_map['F'].value_pattern)
+        self.assertNotEqual(word_map['X'].value_pattern, word_map['G'].value_pattern)
+        self.assertEqual(
+            [(w.letter, w.value) for w in words.text2words('X1E3 X1.E3')],
+            [('X', 1.), ('E', 3.), ('X', 1000.)],
+        )
+
+
+class WordCompactTests(unittest.TestCase):
+    def test_slots(self):
+        w = words.Word('X', 1.5)
+        self.assertFalse(hasattr(w, '__dict__'))
+        self.assertEqual(w.value_class, float)
+        self.assertIsNotNone(w.value_regex)
+        self.assertEqual(w.description, "X: Absolute or incremental position of X axis.")
+
+    def test_interned(self):
+        (g1, x1) = words.text2words('G1 X1')
+        (g1b, x1b) = words.text2words('G1 X1')
+        self.assertIs(g1, g1b)
+        self.assertIsNot(x1, x1b)
+
+    def test_interned_immutable(self):
+        # an interned word's value can't be changed (it'd change every block using it)
+        from pygcode.line import Line
+        (line1, line2) = (Line('G1 X1'), Line('G1 X2'))
+        with self.assertRaises(AttributeError):
+            line1.block.gcodes[0].word.value = 3
+        self.assertEqual(str(line2), 'G01 X2.000')
+        line1.block.gcodes[0].X = 5  # (parameters aren't interned)
+        self.assertEqual(str(line1), 'G01 X5.000')
+
+    def test_copy(self):
+        (g1,) = words.text2words('G1')
+        g2 = copy(g1)
+        g2.value = 2
+        self.assertIs(type(g2), words.Word)
+        self.assertIs(type(pickle.loads(pickle.dumps(g1))), words.Word)
+        self.assertEqual((g1.letter, g1.value), ('G', 1))
+        self.assertEqual(str(g2), 'G02')
+        w = pickle.loads(pickle.dumps(words.Word('X', 1.5)))
+        self.assertEqual(str(w), 'X1.500')
+
+
+class WordPrecisionTests(unittest.TestCase):
+    def test_word(self):
+        x5 = words.Word('X', 1.5, xy_decimals=5)
+        x3 = words.Word('X', 1.5)  # (doesn't change x5's precision)
+        self.assertEqual((str(x5), str(x3)), ('X1.50000', 'X1.500'))
+        self.assertEqual(str(words.Word('Z', 1.5, xy_decimals=5)), 'Z1.500')  # X & Y only
+        with self.assertRaises(ValueError):
+            words.Word('X', 1, xy_decimals=7)
+
+    def test_interleaved(self):
+        iter5 = words.text2words('X1 Y2 X3', xy_decimals=5)
+        iter1 = words.text2words('X1 Y2 X3', xy_decimals=1)
+        w = [next(i) for _ in range(3) for i in (iter5, iter1)]
+        self.assertEqual(
+            [str(x) for x in w],
+            ['X1.00000', 'X1.0', 'Y2.00000', 'Y2.0', 'X3.00000', 'X3.0'],
+        )
+        self.assertIs(w[0]._type, w[4]._type)  # word types are shared (per precision)
+        with self.assertRaises(ValueError):
+            list(words.text2words('X1', xy_decimals=-1))
+
+    def test_copy(self):
+        (x,) = words.text2words('X1', xy_decimals=5)
+        self.assertEqual(str(copy(x)), 'X1.00000')
+        self.assertEqual(str(pickle.loads(pickle.dumps(x))), 'X1.00000')
+
+    def test_threads(self):
+        block_str = 'G1 X1.123456 Y-2.5 Z0.25 F100'
+
+        def parse(xy_decimals):
+            return [' '.join(str(w) for w in words.text2words(block_str, xy_decimals=xy_decimals)) for _ in range(200)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(parse, [0, 1, 5, 6] * 4))
+        for (xy_decimals, result) in zip([0, 1, 5, 6] * 4, results):
+            expected = ' '.join(str(w) for w in words.text2words(block_str, xy_decimals=xy_decimals))
+            self.assertEqual(set(result), set([expected]))
+
 
 class WordValueMatchTest(unittest.TestCase):
     def regex_assertions(self, regex, positive_list, negative_list):
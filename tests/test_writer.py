@@ -0,0 +1,118 @@
+import os
+import inspect
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+# Add relative pygcode_mod to path
+from testutils import add_pygcode_to_path, str_lines
+add_pygcode_to_path()
+
+# Units under test
+from pygcode.writer import GCodeWriter
+from pygcode.gcodes import GCodeRapidMove, GCodeLinearMove
+from pygcode.line import Line
+from pygcode.reader import iter_lines
+from pygcode.words import Word
+
+# Local paths
+_this_path = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+_test_files_dir = os.path.join(_this_path, 'test-files')
+
+
+class WriterFormatTests(unittest.TestCase):
+    def setUp(self):
+        self.writer = GCodeWriter(StringIO())
+
+    def test_words(self):
+        for word in [
+                Word('G', 1), Word('G', 38.2), Word('M', 3), Word('S', 12000),
+                Word('X', 1.23456), Word('Y', -0.0001), Word('Z', -0.0001), Word('F', 0),
+                Word('R', 0.5), Word('N', 100), Word('T', '01'), Word('L', 2), Word('O', '1000')]:
+            self.assertEqual(self.writer.format_word(word), str(word))
+        self.assertEqual(self.writer.format_word(Word('Y', -0.0001)), 'Y.000')  # zero cleaned
+
+    def test_lines(self):
+        for line_str in str_lines('''
+                G90 G21 (setup)
+                N10 G0 X1.2345 Y-0.0001 Z5
+                G1 X4 F100 ; feed
+                G2 X10.75 Y47.44 I-0.11 J-1.26 F70
+                Y5 Z6
+                M3 S12000 T01
+                %macro%
+                (comment only)
+                '''):
+            line = Line(line_str)
+            self.assertEqual(self.writer.format(line), str(line))
+            self.assertEqual(self.writer.format(line.block), str(line.block))
+
+    def test_whitespace_prefix(self):
+        gcode = GCodeLinearMove(X=1)
+        gcode._whitespace_prefix = True
+        self.assertEqual(self.writer.format(gcode), str(gcode))
+
+    def test_str_override(self):
+        class MyRapidMove(GCodeRapidMove):
+            def __str__(self):
+                return 'rapid'
+        self.assertEqual(self.writer.format(MyRapidMove(X=1)), 'rapid')
+        self.assertEqual(self.writer.format('text'), 'text')
+
+    def test_precision(self):
+        writer = GCodeWriter(StringIO(), precision=5)
+        self.assertEqual(writer.format(GCodeRapidMove(X=1.5, Y=-2, Z=1.23456)), 'G00 X1.50000 Y-2.00000 Z1.235')
+        writer = GCodeWriter(StringIO(), precision=0)
+        self.assertEqual(writer.format(Word('X', -0.2)), 'X-0')
+        with self.assertRaises(ValueError):
+            GCodeWriter(StringIO(), precision=7)
+
+    def test_word_precision(self):
+        # each word's own precision, unless the writer is given one
+        line = Line('G1 X1.123456 Y2 Z3', xy_decimals=5)
+        self.assertEqual(self.writer.format(line), 'G01 X1.12346 Y2.00000 Z3.000')
+        self.assertEqual(self.writer.format(Line('G1 X1.123456')), 'G01 X1.123')
+        writer = GCodeWriter(StringIO(), precision=1)
+        self.assertEqual(writer.format(line), 'G01 X1.1 Y2.0 Z3.000')
+
+    def test_file(self):
+        filename = os.path.join(_test_files_dir, 'linuxcnc', 'Star Trek.tap')
+        for line in iter_lines(filename):
+            self.assertEqual(self.writer.format(line), str(line))
+
+
+class WriterOutputTests(unittest.TestCase):
+    lines = list(str_lines('''
+        G90 G21
+        G0 X1 Y2 Z3
+        G1 X4 F100
+    '''))
+
+    def test_write(self):
+        fh = StringIO()
+        with GCodeWriter(fh) as writer:
+            writer.writelines(Line(l) for l in self.lines)
+            writer.write('M2')
+        self.assertEqual(fh.getvalue(), '\n'.join(str(Line(l)) for l in self.lines) + '\nM2\n')
+
+    def test_buffered(self):
+        fh = StringIO()
+        writer = GCodeWriter(fh, buffer_lines=2, newline='\r\n')
+        writer.write(Line(self.lines[0]))
+        self.assertEqual(fh.getvalue(), '')
+        writer.write(Line(self.lines[1]))
+        self.assertEqual(fh.getvalue(), 'G90 G21\r\nG00 X1.000 Y2.000 Z3.000\r\n')
+        writer.write(Line(self.lines[2]))
+        writer.flush()
+        self.assertEqual(fh.getvalue().splitlines()[-1], 'G01 X4.000 F100.000')
+
+    def test_flushed_on_error(self):
+        fh = StringIO()
+        with self.assertRaises(ZeroDivisionError):
+            with GCodeWriter(fh) as writer:
+                writer.write('G0 X1')
+                1 / 0
+        self.assertEqual(fh.getvalue(), 'G0 X1\n')